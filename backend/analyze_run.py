@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Simulation Run Analytics
+Computes journey-level KPIs (waits per priority, breach rates, utilization, hourly throughput)
+from an exported simulation JSON file or a columnar .npz archive, and can convert JSON
+exports to archives for faster repeated analysis.
+
+    python analyze_run.py hospital_simulation_20250910_132622.json
+    python analyze_run.py run.json --archive run.npz
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from src.analytics.event_analytics import analyze_events, load_event_columns, save_event_columns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Analyze an exported hospital simulation run")
+    parser.add_argument("filename", help="exported simulation .json file or .npz archive")
+    parser.add_argument("--archive", help="also write the events as a columnar .npz archive")
+    parser.add_argument("--horizon", type=float, help="minutes to measure utilization over (default: run duration)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    columns = load_event_columns(args.filename)
+    loaded = time.perf_counter()
+    if args.archive:
+        print(f"Archive written to {save_event_columns(columns, args.archive)}", file=sys.stderr)
+
+    results = analyze_events(columns, args.horizon)
+    print(json.dumps(results, indent=2))
+    print(f"Loaded {len(columns)} events in {loaded - started:.2f}s, "
+          f"analyzed in {time.perf_counter() - loaded:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
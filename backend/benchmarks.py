@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Hospital Simulation Benchmarks
+Measures triage throughput, routing latency versus hospital size, resource queue operations
+versus queue depth, patient generation rate and end-to-end simulation speed and peak memory.
+Results can be saved as a baseline; later runs are compared against it and exit non-zero
+when any benchmark regresses by more than the threshold, or when the event-stream
+fingerprint of a seeded run changes. Timings are only compared against a baseline
+recorded in the same mode (--quick or full).
+
+    python benchmarks.py --save-baseline      # record benchmark_baseline.json
+    python benchmarks.py                      # compare against it
+    python benchmarks.py --quick              # smaller workloads for a fast check
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from src.entities.doctor.doctor import Doctor
+from src.entities.equipment.bed.bed import Bed
+from src.entities.hospital.hospital import Hospital
+from src.entities.patient.patient import Patient
+from src.entities.triage.triage import FuzzyManchesterTriage
+from src.enums.decision_retention import DecisionRetention
+from src.enums.priority import Priority
+from src.enums.simulation_engine import SimulationEngine
+from src.services.patient_factory import PatientFactory
+from src.services.routing_service import RoutingService
+from src.simulation.event_fingerprint import EventStreamFingerprint
+from src.simulation.simulation import HospitalSimulation
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+SEED = 42
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+def _best_time(operation: Callable[[], None], repeats: int) -> float:
+    """Best wall time of ``repeats`` runs, which is the least noisy estimate"""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _create_hospital(num_doctors: int, num_beds: int) -> Hospital:
+    hospital = Hospital(id=1, name=f"Benchmark Hospital {num_doctors}x{num_beds}")
+    specialties = ["Emergency Medicine", "Cardiology", "General Practice", "Surgery"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(num_doctors):
+            hospital.add_doctor(Doctor(id=1000 + i, name=f"Dr. {i}", specialty=specialties[i % len(specialties)]))
+        for i in range(num_beds):
+            hospital.add_bed(Bed(id=5000 + i, name=f"Bed-{i + 1}"))
+    return hospital
+
+
+def benchmark_triage(scale: int, repeats: int) -> List[BenchmarkResult]:
+    """FuzzyManchesterTriage.determine_priority throughput"""
+    patients = PatientFactory(SEED).create_patients(500 * scale)
+    triage = FuzzyManchesterTriage()
+
+    def triage_all() -> None:
+        for patient in patients:
+            triage.determine_priority(patient)
+
+    elapsed = _best_time(triage_all, repeats)
+    return [BenchmarkResult("triage.determine_priority", len(patients) / elapsed, "patients/s", True)]
+
+
+def benchmark_routing(scale: int, repeats: int) -> List[BenchmarkResult]:
+    """RoutingService.make_routing_decision latency versus hospital size"""
+    results: List[BenchmarkResult] = []
+    patients = PatientFactory(SEED).create_patients(200 * scale)
+    priorities = [Priority.RED, Priority.ORANGE, Priority.YELLOW, Priority.GREEN, Priority.BLUE]
+
+    for size in (4, 32, 256):
+        hospital = _create_hospital(num_doctors=size, num_beds=size)
+        router = RoutingService(hospital, retention=DecisionRetention.BOUNDED)  # Keep memory flat across repeats
+
+        def route_all() -> None:
+            for i, patient in enumerate(patients):
+                decision = router.make_routing_decision(patient, priorities[i % len(priorities)],
+                                                        include_explanation=False)
+                if decision["assigned_bed"]:  # Free the reserved bed so every call sees the same hospital
+                    hospital.bed_manager.release_bed(decision["assigned_bed"])
+
+        elapsed = _best_time(route_all, repeats)
+        results.append(BenchmarkResult(f"routing.make_routing_decision[{size} doctors/beds]",
+                                       elapsed / len(patients) * 1e6, "us/decision", False))
+    return results
+
+
+def benchmark_queue_ops(scale: int, repeats: int) -> List[BenchmarkResult]:
+    """Resource queue add/remove/next latency versus queue depth"""
+    results: List[BenchmarkResult] = []
+    priorities = ["red", "orange", "yellow", "green", "blue"]
+
+    for depth in (10, 100, 1000):
+        patients = [Patient(id=i, name=f"Patient {i}") for i in range(depth)]
+        doctor = Doctor(id=1, name="Dr. Queue")
+
+        def fill_and_drain() -> None:
+            for i, patient in enumerate(patients):
+                doctor.add_patient_to_queue(patient, priorities[i % len(priorities)])
+            # Remove every other patient by identity, then pop the rest in priority order
+            for patient in patients[::2]:
+                doctor.remove_patient_from_queue(patient)
+            while doctor.get_next_patient() is not None:
+                pass
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = _best_time(fill_and_drain, repeats)
+        operations = len(patients) * 2  # One add plus one remove or pop per patient
+        results.append(BenchmarkResult(f"resource.queue_ops[depth {depth}]",
+                                       elapsed / operations * 1e6, "us/op", False))
+    return results
+
+
+def benchmark_patient_factory(scale: int, repeats: int) -> List[BenchmarkResult]:
+    """PatientFactory.create_patients rate"""
+    count = 500 * scale
+    factory = PatientFactory(SEED)
+    elapsed = _best_time(lambda: factory.create_patients(count), repeats)
+    return [BenchmarkResult("patient_factory.create_patients", count / elapsed, "patients/s", True)]
+
+
+def _run_simulation(horizon: int, mean_inter_arrival_time: float) -> HospitalSimulation:
+    simulation = HospitalSimulation(_create_hospital(num_doctors=4, num_beds=5), horizon,
+                                    seed=SEED, mean_inter_arrival_time=mean_inter_arrival_time)
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.run_simulation()
+    return simulation
+
+
+def benchmark_simulation(scale: int, repeats: int) -> List[BenchmarkResult]:
+    """End-to-end HospitalSimulation events/sec and peak memory across arrival rates and horizons"""
+    results: List[BenchmarkResult] = []
+    # Workload sizes are fixed so result names match between quick and full runs
+    for horizon in (480, 2880):
+        for mean_inter_arrival_time in (15.0, 1.5):  # Baseline and 10x arrival rate
+            label = f"horizon {horizon}, mean inter-arrival {mean_inter_arrival_time}"
+            event_count = len(_run_simulation(horizon, mean_inter_arrival_time).events)
+            elapsed = _best_time(lambda: _run_simulation(horizon, mean_inter_arrival_time), repeats)
+            results.append(BenchmarkResult(f"simulation.events_per_second[{label}]",
+                                           event_count / elapsed, "events/s", True))
+
+            # Memory is measured in a separate run because tracing slows everything down
+            tracemalloc.start()
+            _run_simulation(horizon, mean_inter_arrival_time)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append(BenchmarkResult(f"simulation.peak_memory[{label}]", peak / 1024 / 1024, "MiB", False))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[int, int], List[BenchmarkResult]]] = {
+    "triage": benchmark_triage,
+    "routing": benchmark_routing,
+    "queue": benchmark_queue_ops,
+    "patient_factory": benchmark_patient_factory,
+    "simulation": benchmark_simulation
+}
+
+
+def run_benchmarks(selected: Optional[List[str]] = None, quick: bool = False) -> List[BenchmarkResult]:
+    """Run the selected benchmark groups (all by default)"""
+    scale, repeats = (1, 1) if quick else (2, 3)
+    results: List[BenchmarkResult] = []
+    for name in selected or list(BENCHMARKS):
+        print(f"Running {name} benchmarks...")
+        results.extend(BENCHMARKS[name](scale, repeats))
+    return results
+
+
+def collect_fingerprints() -> Dict[str, str]:
+    """Event-stream fingerprints of short seeded runs on every engine
+
+    Any change to these means simulation behaviour changed, not just its speed.
+    """
+    fingerprints: Dict[str, str] = {}
+    for mean_inter_arrival_time in (15.0, 1.5):
+        for engine in SimulationEngine:
+            simulation = HospitalSimulation(_create_hospital(num_doctors=4, num_beds=5), 480, engine=engine,
+                                            seed=SEED, retain_events=False,
+                                            mean_inter_arrival_time=mean_inter_arrival_time, fingerprint=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulation.run_simulation()
+            assert isinstance(simulation.fingerprint, EventStreamFingerprint)
+            fingerprints[f"{engine.value}[mean inter-arrival {mean_inter_arrival_time}]"] = simulation.fingerprint.hexdigest()
+    return fingerprints
+
+
+def check_fingerprints(fingerprints: Dict[str, str], baseline_fingerprints: Dict[str, str]) -> List[str]:
+    """Return a description of every behaviour change: engines disagreeing or drifting from the baseline"""
+    changes: List[str] = []
+    for name, digest in fingerprints.items():
+        previous = baseline_fingerprints.get(name)
+        if previous is not None and previous != digest:
+            changes.append(f"{name}: event stream differs from baseline")
+        equivalent = name.replace(SimulationEngine.EVENT_CALENDAR.value, SimulationEngine.SIMPY.value, 1)
+        if equivalent != name and fingerprints.get(equivalent) != digest:
+            changes.append(f"{name}: event stream differs from the SimPy engine")
+    return changes
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any],
+                        threshold: float) -> List[str]:
+    """Return a description of every result that is worse than its baseline by more than ``threshold``"""
+    regressions: List[str] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None or previous["value"] == 0:
+            continue
+        change = (result.value - previous["value"]) / previous["value"]
+        worse_by = -change if result.higher_is_better else change
+        if worse_by > threshold:
+            regressions.append(f"{result.name}: {previous['value']:.2f} -> {result.value:.2f} {result.unit} "
+                               f"({worse_by:.0%} worse)")
+    return regressions
+
+
+def print_results(results: List[BenchmarkResult], baseline: Dict[str, Any]) -> None:
+    print("\n" + "=" * 100)
+    print(f"{'benchmark':<64} {'value':>14} {'unit':<12} {'vs baseline':>8}")
+    print("=" * 100)
+    for result in results:
+        previous = baseline.get(result.name)
+        delta = f"{(result.value - previous['value']) / previous['value']:+.1%}" if previous and previous["value"] else ""
+        print(f"{result.name:<64} {result.value:>14.2f} {result.unit:<12} {delta:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run hospital simulation benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fail when a benchmark is worse than its baseline by more than this fraction")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads and a single repeat")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmark groups to run")
+    args = parser.parse_args()
+
+    baseline_data: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline_data = json.load(f)
+    baseline: Dict[str, Any] = baseline_data.get("results", {})
+
+    results = run_benchmarks(args.only, args.quick)
+    print_results(results, baseline)
+    fingerprints = collect_fingerprints()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "quick": args.quick,
+                "results": {result.name: asdict(result) for result in results},
+                "fingerprints": fingerprints
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    behaviour_changes = check_fingerprints(fingerprints, baseline_data.get("fingerprints", {}))
+    if behaviour_changes:
+        print(f"\n{len(behaviour_changes)} event stream fingerprint(s) changed (use compare_runs.py to locate the divergence):")
+        for change in behaviour_changes:
+            print(f"  - {change}")
+        return 1
+
+    if not baseline:
+        print("\nNo baseline found; run with --save-baseline to record one.")
+        return 0
+    if baseline_data.get("quick", False) != args.quick:
+        baseline_mode = "--quick" if baseline_data.get("quick") else "full"
+        print(f"\nBaseline was recorded in {baseline_mode} mode; refusing to compare timings from a "
+              f"{'--quick' if args.quick else 'full'} run. Rerun in the same mode or save a new baseline.")
+        return 1
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+FHIR Cohort Builder
+Streams FHIR R4 bundles or NDJSON exports (e.g. Synthea output) into a compact cohort
+file that simulations load instead of re-parsing the sources.
+
+    python build_fhir_cohort.py synthea/output/fhir --cache fhir_cohort.json
+    python build_fhir_cohort.py Patient.ndjson Condition.ndjson Observation.ndjson
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+from src.services.fhir_cohort import load_fhir_cohort
+
+DEFAULT_CACHE = "fhir_cohort.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parse FHIR sources into a cached simulation cohort")
+    parser.add_argument("sources", nargs="+", help="FHIR Bundle (.json) or NDJSON files, or directories of them")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help=f"cohort cache file (default: {DEFAULT_CACHE})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cohort = load_fhir_cohort(args.sources, args.cache)
+    print(f"{len(cohort)} patients in {args.cache} ({time.perf_counter() - started:.2f}s)")
+    symptoms = Counter(symptom for patient in cohort for symptom in patient.symptoms)
+    for symptom, count in symptoms.most_common(10):
+        print(f"  {symptom:<22} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Replication Set Comparison
+Compares KPIs between two sets of exported simulation runs (e.g. rule-based versus
+agent routing over 30 replications each) with bootstrap confidence intervals for the
+change in each KPI's mean. Per-run summaries are cached, so re-comparing the same
+runs does not reload their events.
+
+    python compare_replications.py --baseline rule_based/*.json --candidate agents/*.json
+    python compare_replications.py --baseline a/*.json --candidate b/*.json --paired
+"""
+
+import argparse
+import sys
+import time
+
+from src.analytics.run_comparison import DEFAULT_DRAWS, RunSummaryCache, compare_run_sets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare KPIs between two sets of simulation runs")
+    parser.add_argument("--baseline", nargs="+", required=True, help="exported runs (.json or .npz) of the baseline")
+    parser.add_argument("--candidate", nargs="+", required=True, help="exported runs of the candidate")
+    parser.add_argument("--paired", action="store_true",
+                        help="runs are matched by position, e.g. replications sharing seeds")
+    parser.add_argument("--draws", type=int, default=DEFAULT_DRAWS, help="bootstrap resamples")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, help="seed for the bootstrap resampling")
+    parser.add_argument("--cache", default=".run_summary_cache.json", help="per-run summary cache file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cache = RunSummaryCache(args.cache)
+    baseline = [cache.get_summary(filename) for filename in args.baseline]
+    candidate = [cache.get_summary(filename) for filename in args.candidate]
+    cache.save()
+    summarized = time.perf_counter()
+
+    comparisons = compare_run_sets(baseline, candidate, args.paired, args.draws, args.confidence, args.seed)
+
+    print(f"{'KPI':<32} {'baseline':>11} {'candidate':>11} {'delta':>11} "
+          f"{f'{args.confidence:.0%} CI':>25}")
+    print("-" * 94)
+    for comparison in comparisons:
+        marker = " *" if comparison.significant else ""
+        print(f"{comparison.kpi:<32} {comparison.baseline_mean:>11.3f} {comparison.candidate_mean:>11.3f} "
+              f"{comparison.delta:>+11.3f} [{comparison.ci_low:>+10.3f}, {comparison.ci_high:>+10.3f}]{marker}")
+    print(f"\n* interval excludes zero. {len(baseline)} vs {len(candidate)} runs, "
+          f"{'paired' if args.paired else 'independent'} bootstrap with {args.draws} draws.")
+    print(f"Summaries: {cache.hits} cached, {cache.misses} analyzed in {summarized - started:.2f}s; "
+          f"bootstrap took {time.perf_counter() - summarized:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
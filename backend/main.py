@@ -3,32 +3,49 @@
 Hospital Management System Demo
 This script provides a command-line interface to run either a hospital management demonstration
 or a SimPy-based hospital simulation.
+
+    python main.py
+    python main.py --profile --profile-folded simulation.folded
 """
 
+import argparse
 import sys
 import os
+from typing import Optional
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.services.hospital_factory import HospitalFactory
 from src.simulation.simulation import HospitalSimulation
+from src.monitoring.stage_profiler import StageProfiler
 from demonstration import run_demonstration
 
-def run_hospital_simulation(duration_minutes: int = 480) -> str:
+def run_hospital_simulation(duration_minutes: int = 480, profiler: Optional[StageProfiler] = None) -> str:
     """Run a complete hospital simulation and return JSON filename"""
     hospital = HospitalFactory.create_sample_hospital()
-    simulation = HospitalSimulation(hospital, duration_minutes)
+    simulation = HospitalSimulation(hospital, duration_minutes, profiler=profiler)
 
     # Run simulation
     simulation.run_simulation()
 
-    # Export to JSON
-    filename = simulation.export_events_to_json()
+    # Export to JSON and register the run for the Streamlit viewer
+    filename = simulation.export_events_to_json(catalog=True)
 
     return filename
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the hospital demo or simulation")
+    parser.add_argument("--profile", action="store_true", help="profile the simulation's pathway stages")
+    parser.add_argument("--profile-allocations", action="store_true",
+                        help="also track allocations per stage with tracemalloc (slow; implies --profile)")
+    parser.add_argument("--profile-folded", metavar="FILE",
+                        help="write the profile as folded stacks for flamegraph.pl or speedscope (implies --profile)")
+    args = parser.parse_args()
+    profiler = None
+    if args.profile or args.profile_allocations or args.profile_folded:
+        profiler = StageProfiler(track_allocations=args.profile_allocations, folded_file=args.profile_folded)
+
     print("\n" + "="*60)
     print("CHOOSE DEMONSTRATION MODE")
     print("="*60)
@@ -41,7 +58,7 @@ if __name__ == "__main__":
         run_demonstration()
     elif choice == "2":
         print("\n🏥 RUNNING SIMPY HOSPITAL SIMULATION")
-        json_file = run_hospital_simulation(120)  # 2-hour simulation
+        json_file = run_hospital_simulation(120, profiler)  # 2-hour simulation
         print(f"\nSimulation complete! Events saved to: {json_file}")
         print("This JSON file can be used for React visualization.")
     else:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Simulation Event Store Queries
+Loads exported simulation runs into a SQLite event store and finds patient journeys
+with long delays between two pathway stages across every stored run, without loading
+the runs into memory.
+
+    python query_events.py --load runs/*.json
+    python query_events.py --delays TRIAGE_COMPLETE CONSULTATION_START --priority red --min-delay 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from src.analytics.event_store import EventStore
+
+DEFAULT_STORE = "simulation_events.sqlite"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load runs into the event store and query delays across them")
+    parser.add_argument("--store", default=DEFAULT_STORE, help=f"SQLite event store (default: {DEFAULT_STORE})")
+    parser.add_argument("--load", nargs="+", metavar="FILE", help="exported simulation JSON files to add")
+    parser.add_argument("--delays", nargs=2, metavar=("FROM_EVENT", "TO_EVENT"),
+                        help="journeys where TO_EVENT came more than --min-delay minutes after FROM_EVENT")
+    parser.add_argument("--priority", help="only patients triaged at this priority (e.g. red)")
+    parser.add_argument("--min-delay", type=float, default=0.0, help="minutes (default: 0)")
+    parser.add_argument("--runs", nargs="+", type=int, metavar="RUN_ID", help="restrict the query to these runs")
+    args = parser.parse_args()
+    if not args.load and not args.delays:
+        parser.error("nothing to do: pass --load and/or --delays")
+
+    with EventStore(args.store) as store:
+        for filename in args.load or []:
+            started = time.perf_counter()
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            info = data.get("simulation_info", {})
+            run_id = store.add_run(data["events"], info.get("hospital_name"), info.get("start_time"),
+                                   label=os.path.basename(filename))
+            print(f"Stored {filename} as run {run_id} ({len(data['events'])} events, "
+                  f"{time.perf_counter() - started:.2f}s)", file=sys.stderr)
+
+        if args.delays:
+            started = time.perf_counter()
+            rows = store.find_stage_delays(args.delays[0], args.delays[1], args.priority, args.min_delay, args.runs)
+            print(json.dumps(rows, indent=2))
+            print(f"{len(rows)} journeys across {len({row['run_id'] for row in rows})} runs "
+                  f"({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Tuple
+from ..entities.patient.patient import Patient
+from ..enums.priority import Priority
+
+
+@dataclass(frozen=True)
+class RoutingVote:
+    """A specialist agent's routing recommendation for one patient"""
+    agent_name: str
+    assign_doctor: bool
+    assign_bed: bool
+    confidence: float  # 0.0 means the agent abstains
+    rationale: str = ""
+
+
+class SpecialistAgent(ABC):
+    """Interface for a specialist routing agent (e.g. an LLM behind a local model runtime)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    async def vote(self, patient: Patient, priority: Priority) -> RoutingVote:
+        """Return this agent's routing recommendation for the patient"""
+
+    async def vote_batch(self, requests: List[Tuple[Patient, Priority]]) -> List[RoutingVote]:
+        """Return recommendations for several patients
+
+        Agents backed by a model runtime should override this to send one batched
+        inference request; the default simply votes on each patient concurrently.
+        """
+        return list(await asyncio.gather(*(self.vote(patient, priority) for patient, priority in requests)))
+
+
+class KeywordSpecialistAgent(SpecialistAgent):
+    """Local stand-in for a model-backed specialist agent
+
+    Votes based on how many of the patient's symptoms fall within its specialty and
+    simulates inference time with a configurable latency, so fan-out and deadline
+    behaviour can be exercised without a model server.
+    """
+
+    def __init__(self, name: str, keywords: Iterable[str], latency: float = 0.0):
+        super().__init__(name)
+        self.keywords: FrozenSet[str] = frozenset(keyword.lower() for keyword in keywords)
+        self.latency = latency
+        self.inference_calls = 0
+
+    async def vote(self, patient: Patient, priority: Priority) -> RoutingVote:
+        await self._simulate_inference()
+        return self._score(patient, priority)
+
+    async def vote_batch(self, requests: List[Tuple[Patient, Priority]]) -> List[RoutingVote]:
+        # One simulated inference call serves the whole batch
+        await self._simulate_inference()
+        return [self._score(patient, priority) for patient, priority in requests]
+
+    async def _simulate_inference(self) -> None:
+        self.inference_calls += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def _score(self, patient: Patient, priority: Priority) -> RoutingVote:
+        symptoms = patient.symptoms.symptoms
+        matched = [symptom for symptom in symptoms
+                   if any(keyword in symptom.lower() for keyword in self.keywords)]
+        if not matched:
+            return RoutingVote(self.name, assign_doctor=True, assign_bed=False, confidence=0.0)
+
+        confidence = len(matched) / len(symptoms)
+        assign_bed = priority in [Priority.RED, Priority.ORANGE]
+        return RoutingVote(
+            self.name,
+            assign_doctor=True,
+            assign_bed=assign_bed,
+            confidence=confidence,
+            rationale=f"{self.name} findings: {', '.join(matched)}"
+        )
+
+
+def create_default_specialist_agents(latency: float = 0.0) -> List[SpecialistAgent]:
+    """Create the neurology, cardiology and abdominal specialist agents"""
+    return [
+        KeywordSpecialistAgent("neurology", [
+            "stroke symptoms", "unconscious", "seizure", "severe headache",
+            "headache", "dizziness"
+        ], latency),
+        KeywordSpecialistAgent("cardiology", [
+            "cardiac arrest", "chest pain", "difficulty breathing", "not breathing"
+        ], latency),
+        KeywordSpecialistAgent("abdominal", [
+            "abdominal pain", "severe vomiting", "nausea", "sepsis", "severe bleeding"
+        ], latency)
+    ]
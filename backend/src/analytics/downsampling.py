@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+DEFAULT_POINTS = 500
+DEFAULT_CACHE_SIZE = 256
+
+# Level changes per event type: (series kind, change), applied to the event's resource
+# (or to the whole hospital for the census)
+LEVEL_CHANGES: Dict[str, List[Tuple[str, int]]] = {
+    "QUEUE_JOIN": [("queue", 1)],
+    "CONSULTATION_START": [("queue", -1), ("occupancy", 1)],
+    "CONSULTATION_END": [("occupancy", -1)],
+    "BED_ASSIGNMENT": [("occupancy", 1)],
+    "BED_DISCHARGE": [("occupancy", -1)],
+    "PATIENT_ARRIVAL": [("census", 1)],
+    "PATIENT_DISCHARGE": [("census", -1)]
+}
+CENSUS = "Patients in hospital"
+
+Series = Tuple[np.ndarray, np.ndarray]  # (times, values)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> Series:
+    """Largest-Triangle-Three-Buckets: keep the points that best preserve the line's shape
+
+    The first and last points are kept; each bucket in between contributes the point
+    forming the largest triangle with the previously kept point and the next bucket's mean.
+    """
+    if points >= len(x) or points < 3:
+        return x, y
+    edges = np.linspace(1, len(x) - 1, points - 1).astype(np.int64)
+    kept = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, len(x) - 1
+    previous = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return x[kept], y[kept]
+
+
+def min_max(x: np.ndarray, y: np.ndarray, points: int) -> Series:
+    """Keep each bucket's lowest and highest point (in time order), so no peak is lost"""
+    if points >= len(x) or points < 2:
+        return x, y
+    edges = np.linspace(0, len(x), points // 2 + 1).astype(np.int64)
+    kept: List[int] = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            low, high = start + int(np.argmin(y[start:end])), start + int(np.argmax(y[start:end]))
+            kept.extend(sorted({low, high}))
+    return x[kept], y[kept]
+
+
+DOWNSAMPLERS: Dict[str, Callable[[np.ndarray, np.ndarray, int], Series]] = {"minmax": min_max, "lttb": lttb}
+
+
+def _step_points(times: np.ndarray, values: np.ndarray, start: float, end: float) -> Series:
+    """Points tracing a piecewise-constant level over [start, end], with a vertical segment at each change"""
+    first = int(np.searchsorted(times, start, side="right"))
+    last = int(np.searchsorted(times, end, side="right"))
+    initial = values[first - 1] if first > 0 else 0
+    change_times, change_values = times[first:last], values[first:last]
+    previous_values = np.concatenate(([initial], change_values[:-1]))
+
+    x = np.empty(2 * len(change_times) + 2)
+    y = np.empty(len(x))
+    x[0], y[0] = start, initial
+    x[1:-1:2], y[1:-1:2] = change_times, previous_values
+    x[2:-1:2], y[2:-1:2] = change_times, change_values
+    x[-1], y[-1] = end, change_values[-1] if len(change_values) else initial
+    return x, y
+
+
+class LevelSeries:
+    """Queue length and occupancy per resource, and the hospital census, over a run
+
+    Levels are rebuilt exactly from the events that change them, so they are correct
+    between the hourly HOSPITAL_STATUS snapshots too. ``downsample`` returns at most a
+    fixed number of points for any time window; results are cached per window, so
+    revisiting a zoom level is free.
+    """
+
+    def __init__(self, events: Iterable[Dict[str, Any]], cache_size: int = DEFAULT_CACHE_SIZE):
+        changes: Dict[Tuple[str, str], Tuple[List[float], List[int]]] = {}
+        levels: Dict[Tuple[str, str], int] = {}
+        for event in events:
+            for kind, change in LEVEL_CHANGES.get(event['event_type'], ()):
+                name = CENSUS if kind == "census" else event.get('resource_name')
+                if not name:
+                    continue
+                key = (kind, name)
+                level = levels[key] = max(levels.get(key, 0) + change, 0)
+                times, values = changes.setdefault(key, ([], []))
+                times.append(event['timestamp'])
+                values.append(level)
+
+        self.series: Dict[str, Dict[str, Series]] = {}
+        for (kind, name), (times, values) in sorted(changes.items()):
+            time_array, value_array = np.asarray(times, dtype=np.float64), np.asarray(values, dtype=np.float64)
+            # Several changes at one instant: keep the level after the last of them
+            last_at_time = np.r_[time_array[1:] != time_array[:-1], True]
+            self.series.setdefault(kind, {})[name] = (time_array[last_at_time], value_array[last_at_time])
+        self.duration = max((float(times[-1]) for by_name in self.series.values() for times, _ in by_name.values()),
+                            default=0.0)
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Any, ...], Series]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def names(self, kind: str) -> List[str]:
+        return list(self.series.get(kind, {}))
+
+    def downsample(self, kind: str, name: str, start: float = 0.0, end: Optional[float] = None,
+                   points: int = DEFAULT_POINTS, method: str = "minmax") -> Series:
+        """At most ``points`` points tracing the level over [start, end]"""
+        if method not in DOWNSAMPLERS:
+            raise ValueError(f"Unknown downsampling method {method!r}; expected one of {list(DOWNSAMPLERS)}")
+        end = self.duration if end is None else end
+        key = (kind, name, start, end, points, method)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        times, values = self.series[kind][name]
+        result = DOWNSAMPLERS[method](*_step_points(times, values, start, end), points)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
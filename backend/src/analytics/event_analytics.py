@@ -0,0 +1,262 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from ..enums.priority import Priority
+
+EVENT_TYPES: List[str] = [
+    "PATIENT_ARRIVAL", "TRIAGE_COMPLETE", "ROUTING_DECISION", "QUEUE_JOIN", "CONSULTATION_START",
+    "CONSULTATION_END", "BED_ASSIGNMENT", "BED_DISCHARGE", "PATIENT_DISCHARGE", "HOSPITAL_STATUS"
+]
+PRIORITIES: List[str] = [priority.value for priority in Priority.get_priority_order()]
+
+# Journey table columns, filled from the timestamp of the matching event type
+JOURNEY_STAGES: Dict[str, str] = {
+    "arrival": "PATIENT_ARRIVAL",
+    "triage": "TRIAGE_COMPLETE",
+    "queue_join": "QUEUE_JOIN",
+    "consultation_start": "CONSULTATION_START",
+    "consultation_end": "CONSULTATION_END",
+    "bed_assignment": "BED_ASSIGNMENT",
+    "bed_release": "BED_DISCHARGE",
+    "discharge": "PATIENT_DISCHARGE"
+}
+DEFAULT_PERCENTILES: Sequence[float] = (50, 90, 95, 99)
+
+
+@dataclass
+class EventColumns:
+    """An event log as parallel NumPy columns; strings are stored as codes into lookup lists"""
+    timestamp: np.ndarray  # float64 minutes
+    event_type: np.ndarray  # int16 code into EVENT_TYPES (-1 for unknown types)
+    patient: np.ndarray  # int32 code into patient_names
+    resource: np.ndarray  # int32 code into resource_names, -1 if none
+    priority: np.ndarray  # int8 code into PRIORITIES, -1 if none
+    patient_names: List[str]
+    resource_names: List[str]
+    simulation_info: Dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+
+def events_to_columns(events: Sequence[Dict[str, Any]], simulation_info: Optional[Dict[str, Any]] = None) -> EventColumns:
+    """Convert event dicts to columns in a single pass"""
+    event_codes = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+    priority_codes = {priority: code for code, priority in enumerate(PRIORITIES)}
+    patient_codes: Dict[str, int] = {}
+    resource_codes: Dict[str, int] = {}
+
+    count = len(events)
+    timestamp = np.empty(count, dtype=np.float64)
+    event_type = np.empty(count, dtype=np.int16)
+    patient = np.empty(count, dtype=np.int32)
+    resource = np.empty(count, dtype=np.int32)
+    priority = np.empty(count, dtype=np.int8)
+
+    for i, event in enumerate(events):
+        timestamp[i] = event["timestamp"]
+        event_type[i] = event_codes.get(event["event_type"], -1)
+        patient[i] = patient_codes.setdefault(event["patient_name"], len(patient_codes))
+        resource_name = event.get("resource_name")
+        resource[i] = -1 if resource_name is None else resource_codes.setdefault(resource_name, len(resource_codes))
+        priority[i] = priority_codes.get(event.get("priority") or "", -1)
+
+    return EventColumns(timestamp, event_type, patient, resource, priority,
+                        list(patient_codes), list(resource_codes), simulation_info or {})
+
+
+def load_event_columns(filename: str) -> EventColumns:
+    """Load an exported simulation JSON file or a columnar .npz archive"""
+    if filename.endswith(".npz"):
+        with np.load(filename, allow_pickle=False) as archive:
+            return EventColumns(
+                timestamp=archive["timestamp"],
+                event_type=archive["event_type"],
+                patient=archive["patient"],
+                resource=archive["resource"],
+                priority=archive["priority"],
+                patient_names=archive["patient_names"].tolist(),
+                resource_names=archive["resource_names"].tolist(),
+                simulation_info=json.loads(str(archive["simulation_info"]))
+            )
+    with open(filename, 'r') as f:
+        data = json.load(f)
+    return events_to_columns(data["events"], data.get("simulation_info"))
+
+
+def save_event_columns(columns: EventColumns, filename: str) -> str:
+    """Write columns to a compressed .npz archive, which loads much faster than JSON"""
+    np.savez_compressed(
+        filename,
+        timestamp=columns.timestamp,
+        event_type=columns.event_type,
+        patient=columns.patient,
+        resource=columns.resource,
+        priority=columns.priority,
+        patient_names=np.array(columns.patient_names, dtype=str),
+        resource_names=np.array(columns.resource_names, dtype=str),
+        simulation_info=np.array(json.dumps(columns.simulation_info, default=str))
+    )
+    return filename
+
+
+def _journey_ids(columns: EventColumns) -> np.ndarray:
+    """Number each patient journey and map every patient event to it
+
+    Events are matched to the most recent arrival under the same patient name,
+    so repeated names are separate journeys unless their stays overlap. System
+    events (and events before a patient's first arrival) get -1.
+    """
+    is_arrival = columns.event_type == EVENT_TYPES.index("PATIENT_ARRIVAL")
+    journey_numbers = np.cumsum(is_arrival) - 1  # Journey number of each arrival, in arrival order
+    order = np.lexsort((np.arange(len(columns)), columns.patient))  # By patient, then log order
+    positions = np.arange(len(order))
+
+    # Latest arrival at or before each event, and the start of that patient's run of events
+    patients_sorted = columns.patient[order]
+    group_start = np.maximum.accumulate(np.where(np.r_[True, patients_sorted[1:] != patients_sorted[:-1]], positions, 0))
+    latest_arrival = np.maximum.accumulate(np.where(is_arrival[order], positions, -1))
+
+    has_journey = latest_arrival >= group_start
+    journey_sorted = np.full(len(order), -1, dtype=np.int64)
+    journey_sorted[has_journey] = journey_numbers[order[latest_arrival[has_journey]]]
+
+    journeys = np.empty(len(order), dtype=np.int64)
+    journeys[order] = journey_sorted
+    return journeys
+
+
+def build_journey_table(columns: EventColumns) -> Dict[str, np.ndarray]:
+    """Per-patient journey table: one row per arrival, NaN for stages a patient never reached
+
+    Columns: the JOURNEY_STAGES timestamps plus priority, doctor and bed codes and patient code.
+    """
+    journeys = _journey_ids(columns)
+    journey_count = int(np.count_nonzero(columns.event_type == EVENT_TYPES.index("PATIENT_ARRIVAL")))
+    table: Dict[str, np.ndarray] = {}
+
+    for column, event_type in JOURNEY_STAGES.items():
+        mask = (columns.event_type == EVENT_TYPES.index(event_type)) & (journeys >= 0)
+        values = np.full(journey_count, np.nan)
+        values[journeys[mask]] = columns.timestamp[mask]
+        table[column] = values
+
+    def code_column(event_type: str, source: np.ndarray) -> np.ndarray:
+        mask = (columns.event_type == EVENT_TYPES.index(event_type)) & (journeys >= 0)
+        values = np.full(journey_count, -1, dtype=np.int32)
+        values[journeys[mask]] = source[mask]
+        return values
+
+    table["priority"] = code_column("TRIAGE_COMPLETE", columns.priority)
+    table["doctor"] = code_column("CONSULTATION_START", columns.resource)
+    table["bed"] = code_column("BED_ASSIGNMENT", columns.resource)
+    table["patient"] = code_column("PATIENT_ARRIVAL", columns.patient)
+    return table
+
+
+def _max_wait_minutes(priority: Priority) -> float:
+    """Parse the priority's target wait, e.g. "10 minutes" or "2 hours", into minutes"""
+    amount, unit = priority.max_wait_time.split()
+    return float(amount) * (60 if unit.startswith("hour") else 1)
+
+
+def _busy_minutes(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray, count: int, horizon: float) -> np.ndarray:
+    """Minutes each resource was busy: the length of the union of its [start, end) intervals
+
+    Overlapping stays on one resource are counted once, so busy time never exceeds
+    the horizon. Intervals are sorted by resource and start; shifting each resource's
+    times by its code keeps a running maximum of the end times within the resource.
+    """
+    if len(codes) == 0:
+        return np.zeros(count)
+    offset = codes.astype(np.float64) * (horizon + 1)
+    order = np.lexsort((starts, codes))
+    shifted_starts, shifted_ends = (starts + offset)[order], (ends + offset)[order]
+    covered_until = np.r_[-np.inf, np.maximum.accumulate(shifted_ends)[:-1]]
+    added = np.clip(shifted_ends - np.maximum(shifted_starts, covered_until), 0, None)
+    return np.bincount(codes[order], weights=added, minlength=count)
+
+
+def _distribution(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, Any]:
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"count": 0}
+    summary: Dict[str, Any] = {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max())
+    }
+    for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+        summary[f"p{percentile:g}"] = float(value)
+    return summary
+
+
+def analyze_events(columns: EventColumns, horizon: Optional[float] = None,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """Compute journey-level KPIs from an event log with vectorized NumPy operations
+
+    Returns wait distributions per priority, breach rates of the triage-to-doctor wait
+    against Priority.max_wait_time (the target clock starts at triage), resource
+    utilization (the busy share of the horizon) and hourly arrival/discharge throughput.
+    """
+    if horizon is None:
+        horizon = columns.simulation_info.get("duration_minutes") or (float(columns.timestamp.max()) if len(columns) else 0.0)
+    table = build_journey_table(columns)
+
+    waits = {
+        "arrival_to_triage": table["triage"] - table["arrival"],
+        "wait_for_doctor": table["consultation_start"] - table["arrival"],
+        "triage_to_doctor": table["consultation_start"] - table["triage"],
+        "consultation": table["consultation_end"] - table["consultation_start"],
+        "bed_stay": table["bed_release"] - table["bed_assignment"],
+        "time_in_hospital": table["discharge"] - table["arrival"]
+    }
+    max_wait = np.array([_max_wait_minutes(Priority(priority)) for priority in PRIORITIES], dtype=np.float64)
+
+    by_priority: Dict[str, Any] = {}
+    for code, priority in enumerate(PRIORITIES):
+        in_priority = table["priority"] == code
+        seen = in_priority & ~np.isnan(waits["triage_to_doctor"])
+        breaches = int(np.count_nonzero(waits["triage_to_doctor"][seen] > max_wait[code]))
+        seen_count = int(np.count_nonzero(seen))
+        by_priority[priority] = {
+            "patients": int(np.count_nonzero(in_priority)),
+            "waits": {name: _distribution(values[in_priority], percentiles) for name, values in waits.items()},
+            "max_wait_minutes": int(max_wait[code]),
+            "wait_breaches": breaches,
+            "wait_breach_rate": breaches / seen_count if seen_count else None
+        }
+
+    # Busy time per resource: consultations for doctors, stays for beds (clipped at the horizon)
+    codes, starts, ends = [], [], []
+    for start, end, resource in (("consultation_start", "consultation_end", "doctor"),
+                                 ("bed_assignment", "bed_release", "bed")):
+        started = (table[resource] >= 0) & ~np.isnan(table[start])
+        codes.append(table[resource][started])
+        starts.append(np.minimum(table[start][started], horizon))
+        ends.append(np.where(np.isnan(table[end][started]), horizon, np.minimum(table[end][started], horizon)))
+    busy = _busy_minutes(np.concatenate(codes), np.concatenate(starts), np.concatenate(ends),
+                         len(columns.resource_names), horizon)
+    utilization = {name: float(busy[code] / horizon) if horizon else 0.0
+                   for code, name in enumerate(columns.resource_names)}
+
+    hours = int(np.ceil(horizon / 60)) if horizon else 0
+    hourly: Dict[str, List[int]] = {}
+    for name, column in (("arrivals", "arrival"), ("discharges", "discharge")):
+        times = table[column][~np.isnan(table[column])]
+        hourly[name] = np.bincount((times // 60).astype(np.int64), minlength=hours).tolist()
+
+    return {
+        "horizon_minutes": horizon,
+        "events": len(columns),
+        "patients": len(table["arrival"]),
+        "discharged": int(np.count_nonzero(~np.isnan(table["discharge"]))),
+        "overall_waits": {name: _distribution(values, percentiles) for name, values in waits.items()},
+        "by_priority": by_priority,
+        "four_hour_breaches": int(np.count_nonzero(waits["time_in_hospital"] > 240)),
+        "utilization": utilization,
+        "hourly_throughput": hourly
+    }
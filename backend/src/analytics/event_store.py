@@ -0,0 +1,186 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    label TEXT,
+    hospital_name TEXT,
+    start_time TEXT,
+    config TEXT,
+    created_at REAL,
+    total_events INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    patient TEXT NOT NULL,
+    journey INTEGER,
+    priority TEXT,
+    resource TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS events_run_timestamp ON events (run_id, timestamp);
+CREATE INDEX IF NOT EXISTS events_run_patient ON events (run_id, patient);
+CREATE INDEX IF NOT EXISTS events_run_event_type ON events (run_id, event_type);
+"""
+
+_EVENT_COLUMNS = ["run_id", "seq", "timestamp", "event_type", "patient", "journey", "priority", "resource", "details"]
+
+
+class EventStore:
+    """Simulation events from many runs in one SQLite database, for queries across runs
+
+    Events are buffered and written ``batch_size`` at a time in a single transaction.
+    Each patient event carries a journey number (the sequence number of the patient's
+    latest arrival), so repeated patient names within a run are separate journeys unless
+    their stays overlap.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+        self.path = path
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._pending: List[Tuple[Any, ...]] = []
+        self._next_seq: Dict[int, int] = {}
+        self._journeys: Dict[int, Dict[str, int]] = {}  # Latest arrival per patient name, per open run
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def begin_run(self, hospital_name: Optional[str] = None, start_time: Optional[str] = None,
+                  config: Optional[Dict[str, Any]] = None, label: Optional[str] = None) -> int:
+        """Register a run and return its id for ``add``"""
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (label, hospital_name, start_time, config, created_at) VALUES (?, ?, ?, ?, ?)",
+                (label, hospital_name, start_time, json.dumps(config or {}, default=str), time.time())
+            )
+        run_id = cursor.lastrowid
+        assert run_id is not None
+        self._next_seq[run_id] = 0
+        self._journeys[run_id] = {}
+        return run_id
+
+    def add(self, run_id: int, event: Dict[str, Any]) -> None:
+        """Buffer one event, writing the buffer out once it holds ``batch_size`` events"""
+        seq = self._next_seq[run_id]
+        self._next_seq[run_id] = seq + 1
+        patient = event["patient_name"]
+        journeys = self._journeys[run_id]
+        if event["event_type"] == "PATIENT_ARRIVAL":
+            journeys[patient] = seq
+        self._pending.append((
+            run_id, seq, event["timestamp"], event["event_type"], patient, journeys.get(patient),
+            event.get("priority"), event.get("resource_name"), json.dumps(event.get("details") or {}, default=str)
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_run(self, events: Iterable[Dict[str, Any]], hospital_name: Optional[str] = None,
+                start_time: Optional[str] = None, config: Optional[Dict[str, Any]] = None,
+                label: Optional[str] = None) -> int:
+        """Store a complete run, e.g. an exported JSON file, and return its id"""
+        run_id = self.begin_run(hospital_name, start_time, config, label)
+        for event in events:
+            self.add(run_id, event)
+        self.end_run(run_id)
+        return run_id
+
+    def flush(self) -> None:
+        """Write buffered events in one transaction and update the runs' event counts"""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO events VALUES ({', '.join('?' * len(_EVENT_COLUMNS))})", self._pending
+            )
+            self._connection.executemany(
+                "UPDATE runs SET total_events = ? WHERE run_id = ?",
+                [(count, run_id) for run_id, count in self._next_seq.items()]
+            )
+        self._pending.clear()
+
+    def end_run(self, run_id: int) -> None:
+        """Flush and forget the run's per-patient bookkeeping"""
+        self.flush()
+        self._next_seq.pop(run_id, None)
+        self._journeys.pop(run_id, None)
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        rows = self._connection.execute("SELECT * FROM runs ORDER BY run_id")
+        return [dict(row, config=json.loads(row["config"])) for row in rows]
+
+    def _event(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "run_id": row["run_id"],
+            "timestamp": row["timestamp"],
+            "event_type": row["event_type"],
+            "patient_name": row["patient"],
+            "resource_name": row["resource"],
+            "priority": row["priority"],
+            "details": json.loads(row["details"])
+        }
+
+    def query_events(self, run_id: int, event_type: Optional[str] = None, patient_name: Optional[str] = None,
+                     start: Optional[float] = None, end: Optional[float] = None,
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """One run's events in log order, filtered by type, patient and time window [start, end)"""
+        conditions = ["run_id = ?"]
+        parameters: List[Any] = [run_id]
+        for condition, value in (("event_type = ?", event_type), ("patient = ?", patient_name),
+                                 ("timestamp >= ?", start), ("timestamp < ?", end)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        query = f"SELECT * FROM events WHERE {' AND '.join(conditions)} ORDER BY seq"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [self._event(row) for row in self._connection.execute(query, parameters)]
+
+    def find_stage_delays(self, from_event: str, to_event: str, priority: Optional[str] = None,
+                          min_delay: float = 0.0, run_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """Patient journeys whose ``to_event`` came more than ``min_delay`` minutes after ``from_event``
+
+        For example, RED patients whose consultation started over 10 minutes after triage:
+        ``find_stage_delays("TRIAGE_COMPLETE", "CONSULTATION_START", "red", 10)``.
+        """
+        # Pin the plan: scan ``from_event`` rows, then look up each journey's events by patient,
+        # rather than matching every ``to_event`` of the run (the planner's guess without ANALYZE)
+        query = """
+            SELECT f.run_id, f.patient, f.priority, f.timestamp AS from_time, t.timestamp AS to_time,
+                   t.timestamp - f.timestamp AS delay
+            FROM events AS f
+            CROSS JOIN events AS t INDEXED BY events_run_patient ON t.run_id = f.run_id AND t.patient = f.patient AND t.journey = f.journey
+                            AND t.event_type = ?
+            WHERE f.event_type = ? AND t.timestamp - f.timestamp > ?
+        """
+        parameters: List[Any] = [to_event, from_event, min_delay]
+        if priority is not None:
+            query += " AND f.priority = ?"
+            parameters.append(priority)
+        if run_ids is not None:
+            query += f" AND f.run_id IN ({', '.join('?' * len(run_ids))})"
+            parameters.extend(run_ids)
+        query += " ORDER BY f.run_id, f.seq"
+        return [dict(row) for row in self._connection.execute(query, parameters)]
@@ -0,0 +1,182 @@
+import json
+import math
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+RUN_CATALOG_FILE = "run_catalog.sqlite"
+RUN_FILE_PATTERN = "hospital_simulation"
+
+# Headline KPIs kept as columns so runs can be filtered and sorted in SQL
+HEADLINE_KPIS: List[str] = [
+    "patients", "discharged", "mean_time_in_hospital", "mean_wait_for_doctor", "four_hour_breach_rate"
+]
+SORT_COLUMNS: List[str] = ["created_at", "total_events", "duration_minutes", "seed"] + HEADLINE_KPIS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    file_name TEXT PRIMARY KEY,
+    hospital_name TEXT,
+    start_time TEXT,
+    duration_minutes REAL,
+    total_events INTEGER,
+    seed INTEGER,
+    engine TEXT,
+    created_at REAL,
+    config TEXT,
+    kpis TEXT,
+    {", ".join(f"{kpi} REAL" for kpi in HEADLINE_KPIS)},
+    file_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_hospital_name ON runs (hospital_name);
+CREATE TABLE IF NOT EXISTS failed_files (
+    file_name TEXT PRIMARY KEY,
+    file_mtime REAL,
+    error TEXT
+);
+"""
+_COLUMNS: List[str] = ["file_name", "hospital_name", "start_time", "duration_minutes", "total_events", "seed",
+                       "engine", "created_at", "config", "kpis"] + HEADLINE_KPIS + ["file_mtime"]
+
+
+@dataclass
+class RunRecord:
+    """Catalog entry for one exported run; enough to list and compare runs without opening them"""
+    file_name: str  # Relative to the catalog's directory
+    hospital_name: str
+    start_time: str
+    duration_minutes: float
+    total_events: int
+    seed: Optional[int]
+    engine: Optional[str]
+    created_at: float
+    config: Dict[str, Any]
+    kpis: Dict[str, Optional[float]]
+
+
+class RunCatalog:
+    """SQLite index of exported simulation runs, kept next to the exported JSON files
+
+    Simulations register runs when they export them; ``sync`` indexes files exported
+    before the catalog existed, re-indexes files modified since they were indexed and
+    forgets files that were deleted. Files that cannot be read as a run are recorded
+    in ``failed_files`` and only retried once they change.
+    """
+
+    def __init__(self, directory: str = "."):
+        self.directory = directory
+        self.path = os.path.join(directory, RUN_CATALOG_FILE)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(_SCHEMA)
+
+    def _file_mtime(self, file_name: str) -> Optional[float]:
+        path = os.path.join(self.directory, os.path.basename(file_name))
+        return os.path.getmtime(path) if os.path.exists(path) else None
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RunCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def record_run(self, file_name: str, simulation_info: Dict[str, Any], config: Optional[Dict[str, Any]] = None,
+                   kpis: Optional[Dict[str, float]] = None, created_at: Optional[float] = None) -> None:
+        """Add or replace a run's entry, noting the file's current modification time"""
+        config = config or {}
+        # NaN KPIs (undefined for this run) are stored as NULL
+        kpis = {name: None if isinstance(value, float) and math.isnan(value) else value
+                for name, value in (kpis or {}).items()}
+        with self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (os.path.basename(file_name), simulation_info.get("hospital_name"), simulation_info.get("start_time"),
+                 simulation_info.get("duration_minutes"), simulation_info.get("total_events"),
+                 config.get("seed"), config.get("engine"), time.time() if created_at is None else created_at,
+                 json.dumps(config), json.dumps(kpis), *(kpis.get(kpi) for kpi in HEADLINE_KPIS),
+                 self._file_mtime(file_name))
+            )
+            self._connection.execute("DELETE FROM failed_files WHERE file_name = ?", (os.path.basename(file_name),))
+
+    def _record(self, row: sqlite3.Row) -> RunRecord:
+        return RunRecord(row["file_name"], row["hospital_name"], row["start_time"], row["duration_minutes"],
+                         row["total_events"], row["seed"], row["engine"], row["created_at"],
+                         json.loads(row["config"]), json.loads(row["kpis"]))
+
+    def get_run(self, file_name: str) -> Optional[RunRecord]:
+        row = self._connection.execute("SELECT * FROM runs WHERE file_name = ?", (os.path.basename(file_name),)).fetchone()
+        return self._record(row) if row else None
+
+    def list_runs(self, hospital_name: Optional[str] = None, engine: Optional[str] = None,
+                  order_by: str = "created_at", descending: bool = True, limit: Optional[int] = None) -> List[RunRecord]:
+        """Runs matching the filters, sorted by a catalog column (runs missing a KPI sort last)"""
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort runs by {order_by!r}; expected one of {SORT_COLUMNS}")
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        for column, value in (("hospital_name", hospital_name), ("engine", engine)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        query = "SELECT * FROM runs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [self._record(row) for row in self._connection.execute(query, parameters)]
+
+    def distinct_values(self, column: str) -> List[str]:
+        """Distinct non-null values of ``hospital_name`` or ``engine``, for filter widgets"""
+        if column not in ("hospital_name", "engine"):
+            raise ValueError(f"Unsupported filter column {column!r}")
+        rows = self._connection.execute(f"SELECT DISTINCT {column} FROM runs WHERE {column} IS NOT NULL ORDER BY 1")
+        return [row[0] for row in rows]
+
+    def failed_files(self) -> Dict[str, str]:
+        """Error of each exported file that could not be indexed, by file name"""
+        rows = self._connection.execute("SELECT file_name, error FROM failed_files ORDER BY file_name")
+        return {row[0]: row[1] for row in rows}
+
+    def sync(self) -> Tuple[int, int]:
+        """Index new or modified exported runs and drop entries whose file is gone
+
+        Files are matched on their modification time, so only new or edited files are
+        parsed, to read their ``simulation_info``; their KPIs are left empty. Files
+        that fail to parse are recorded with the error. Returns (indexed, removed).
+        """
+        with os.scandir(self.directory) as entries:
+            on_disk = {entry.name: entry.stat().st_mtime for entry in entries
+                       if entry.name.endswith(".json") and RUN_FILE_PATTERN in entry.name}
+        indexed = {row[0]: row[1] for row in self._connection.execute("SELECT file_name, file_mtime FROM runs")}
+        failed = {row[0]: row[1] for row in self._connection.execute("SELECT file_name, file_mtime FROM failed_files")}
+
+        removed = indexed.keys() - on_disk.keys()
+        with self._connection:
+            self._connection.executemany("DELETE FROM runs WHERE file_name = ?", [(name,) for name in removed])
+            self._connection.executemany("DELETE FROM failed_files WHERE file_name = ?",
+                                         [(name,) for name in failed.keys() - on_disk.keys()])
+
+        updated = 0
+        for name, mtime in sorted(on_disk.items()):
+            if indexed.get(name) == mtime or failed.get(name) == mtime:
+                continue
+            try:
+                with open(os.path.join(self.directory, name), 'r') as f:
+                    simulation_info = json.load(f)["simulation_info"]
+            except (OSError, json.JSONDecodeError, KeyError, TypeError) as error:
+                with self._connection:
+                    self._connection.execute("DELETE FROM runs WHERE file_name = ?", (name,))
+                    self._connection.execute("INSERT OR REPLACE INTO failed_files VALUES (?, ?, ?)",
+                                             (name, mtime, f"{type(error).__name__}: {error}"))
+                continue
+            self.record_run(name, simulation_info, created_at=mtime)
+            updated += 1
+        return updated, len(removed)
@@ -0,0 +1,143 @@
+import json
+import os
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from .event_analytics import PRIORITIES, analyze_events, load_event_columns
+
+DEFAULT_DRAWS = 10000
+
+
+def summarize_run(analysis: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten one run's analytics into the scalar KPIs compared across runs (NaN if undefined)"""
+    def value(distribution: Dict[str, Any], key: str) -> float:
+        result = distribution.get(key)
+        return float("nan") if result is None else float(result)
+
+    overall = analysis["overall_waits"]
+    patients = analysis["patients"]
+    summary: Dict[str, float] = {
+        "patients": float(patients),
+        "discharged": float(analysis["discharged"]),
+        "mean_time_in_hospital": value(overall["time_in_hospital"], "mean"),
+        "p90_time_in_hospital": value(overall["time_in_hospital"], "p90"),
+        "mean_wait_for_doctor": value(overall["wait_for_doctor"], "mean"),
+        "p90_wait_for_doctor": value(overall["wait_for_doctor"], "p90"),
+        "four_hour_breach_rate": analysis["four_hour_breaches"] / patients if patients else float("nan")
+    }
+    for priority in PRIORITIES:
+        by_priority = analysis["by_priority"][priority]
+        summary[f"{priority}.mean_wait_for_doctor"] = value(by_priority["waits"]["wait_for_doctor"], "mean")
+        summary[f"{priority}.wait_breach_rate"] = value(by_priority, "wait_breach_rate")
+    utilization = list(analysis["utilization"].values())
+    summary["mean_utilization"] = float(np.mean(utilization)) if utilization else float("nan")
+    return summary
+
+
+class RunSummaryCache:
+    """Per-run KPI summaries cached in a JSON file, keyed by path, size and modification time
+
+    Re-comparing runs only re-analyzes files that changed since they were summarized.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None):
+        self.cache_file = cache_file
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if cache_file and os.path.exists(cache_file):
+            with open(cache_file, 'r') as f:
+                self._entries = json.load(f)
+        self.hits = 0
+        self.misses = 0
+
+    def get_summary(self, filename: str) -> Dict[str, float]:
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        entry = self._entries.get(path)
+        if entry is not None and entry["signature"] == signature:
+            self.hits += 1
+            return entry["summary"]
+
+        self.misses += 1
+        summary = summarize_run(analyze_events(load_event_columns(path)))
+        self._entries[path] = {"signature": signature, "summary": summary}
+        return summary
+
+    def save(self) -> None:
+        if self.cache_file:
+            with open(self.cache_file, 'w') as f:
+                json.dump(self._entries, f)
+
+
+@dataclass
+class KPIComparison:
+    """Difference in a KPI's mean between two sets of runs (candidate minus baseline)"""
+    kpi: str
+    baseline_mean: float
+    candidate_mean: float
+    delta: float
+    ci_low: float
+    ci_high: float
+    baseline_runs: int
+    candidate_runs: int
+
+    @property
+    def significant(self) -> bool:
+        """True if the confidence interval excludes zero"""
+        return self.ci_low > 0 or self.ci_high < 0
+
+
+def _bootstrap_means(values: np.ndarray, draws: int, rng: np.random.Generator) -> np.ndarray:
+    """Bootstrap means of every column at once, ignoring NaNs: returns (draws, kpis)
+
+    Each draw is a multinomial count vector over runs, so a draw costs one
+    (runs x kpis) matrix product instead of materializing resampled copies.
+    """
+    runs = values.shape[0]
+    counts = rng.multinomial(runs, np.full(runs, 1 / runs), size=draws).astype(np.float64)
+    present = ~np.isnan(values)
+    sums = counts @ np.where(present, values, 0.0)
+    totals = counts @ present.astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / totals
+
+
+def compare_run_sets(baseline: Sequence[Dict[str, float]], candidate: Sequence[Dict[str, float]],
+                     paired: bool = False, draws: int = DEFAULT_DRAWS, confidence: float = 0.95,
+                     seed: Optional[int] = None) -> List[KPIComparison]:
+    """Bootstrap confidence intervals for the change in each KPI's mean
+
+    With ``paired=True`` runs are matched by position (e.g. replications sharing a
+    seed), and the same resample is applied to both sets.
+    """
+    if not baseline or not candidate:
+        raise ValueError("Both run sets must contain at least one run")
+    if paired and len(baseline) != len(candidate):
+        raise ValueError(f"Paired comparison needs equal run counts, got {len(baseline)} and {len(candidate)}")
+
+    kpis = [kpi for kpi in baseline[0] if all(kpi in run for run in list(baseline) + list(candidate))]
+    baseline_values = np.array([[run[kpi] for kpi in kpis] for run in baseline], dtype=np.float64)
+    candidate_values = np.array([[run[kpi] for kpi in kpis] for run in candidate], dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    if paired:
+        differences = candidate_values - baseline_values
+        bootstrap_deltas = _bootstrap_means(differences, draws, rng)
+    else:
+        bootstrap_deltas = _bootstrap_means(candidate_values, draws, rng) - _bootstrap_means(baseline_values, draws, rng)
+
+    tail = (1 - confidence) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # KPIs undefined in every run stay NaN
+        baseline_means = np.nanmean(baseline_values, axis=0)
+        candidate_means = np.nanmean(candidate_values, axis=0)
+        ci_low, ci_high = np.nanpercentile(bootstrap_deltas, [tail, 100 - tail], axis=0)
+
+    return [
+        KPIComparison(kpi, float(baseline_means[i]), float(candidate_means[i]),
+                      float(candidate_means[i] - baseline_means[i]), float(ci_low[i]), float(ci_high[i]),
+                      int(np.count_nonzero(~np.isnan(baseline_values[:, i]))),
+                      int(np.count_nonzero(~np.isnan(candidate_values[:, i]))))
+        for i, kpi in enumerate(kpis)
+    ]
@@ -0,0 +1,174 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_KEYFRAME_INTERVAL = 1000
+
+# Resource kinds, inferred from the event types that mention each resource
+RESOURCE_KINDS: Dict[str, str] = {
+    "QUEUE_JOIN": "doctor",
+    "CONSULTATION_START": "doctor",
+    "CONSULTATION_END": "doctor",
+    "BED_ASSIGNMENT": "bed",
+    "BED_DISCHARGE": "bed"
+}
+
+# Equipment kinds, inferred from the "<prefix><name>" queue keys of HOSPITAL_STATUS
+# snapshots, which list every resource whether or not a patient has used it
+EQUIPMENT_KINDS: Dict[str, str] = {
+    "MRI_": "mri",
+    "Ultrasonic_": "ultrasonic"
+}
+
+
+def _event_resources(event: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(kind, name) of each resource an event mentions"""
+    kind = RESOURCE_KINDS.get(event['event_type'])
+    if kind and event.get('resource_name'):
+        yield kind, event['resource_name']
+    elif event['event_type'] == 'HOSPITAL_STATUS':
+        for key in event.get('details', {}).get('queue_summary', {}):
+            for prefix, equipment_kind in EQUIPMENT_KINDS.items():
+                if key.startswith(prefix):
+                    yield equipment_kind, key[len(prefix):]
+
+
+@dataclass
+class ReplayState:
+    """Hospital state after a prefix of an event log: who is where, and who has left
+
+    ``processed`` is append-only and may be shared with other states of the same
+    log; only its first ``processed_count`` entries belong to this state.
+    """
+    active_patients: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    resource_status: Dict[str, List[str]] = field(default_factory=dict)  # Patients occupying each resource
+    processed: List[Dict[str, Any]] = field(default_factory=list)
+    processed_count: int = 0
+    position: int = 0  # Number of events applied
+    timestamp: float = 0.0
+
+    @property
+    def processed_patients(self) -> List[Dict[str, Any]]:
+        return self.processed[:self.processed_count]
+
+    def copy(self) -> "ReplayState":
+        return ReplayState(
+            {name: dict(info) for name, info in self.active_patients.items()},
+            {resource: list(patients) for resource, patients in self.resource_status.items()},
+            self.processed, self.processed_count, self.position, self.timestamp
+        )
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """Advance the state by one event"""
+        patient_name = event['patient_name']
+        event_type = event['event_type']
+        resource_name = event.get('resource_name')
+        patient = self.active_patients.get(patient_name)
+
+        if event_type == 'PATIENT_ARRIVAL':
+            self.active_patients[patient_name] = {
+                'priority': 'pending',  # Until triage is complete
+                'status': 'Arrived',
+                'location': 'Entrance',
+                'symptoms': event.get('details', {}).get('symptoms', [])
+            }
+        elif event_type == 'TRIAGE_COMPLETE' and patient is not None:
+            patient['status'] = 'Triaged'
+            patient['priority'] = event.get('priority', 'green')
+        elif event_type == 'QUEUE_JOIN' and resource_name and patient is not None:
+            patient['status'] = f'Waiting for {resource_name}'
+            patient['location'] = f'{resource_name} Queue'
+        elif event_type in ('CONSULTATION_START', 'BED_ASSIGNMENT') and resource_name:
+            if patient is not None:
+                patient['status'] = f'With {resource_name}' if event_type == 'CONSULTATION_START' else f'In {resource_name}'
+                patient['location'] = resource_name
+                self.resource_status.setdefault(resource_name, []).append(patient_name)
+        elif event_type in ('CONSULTATION_END', 'BED_DISCHARGE') and resource_name:
+            occupants = self.resource_status.get(resource_name)
+            if occupants and patient_name in occupants:
+                occupants.remove(patient_name)
+        elif event_type == 'PATIENT_DISCHARGE':
+            if patient is not None:
+                if self.processed_count == len(self.processed):
+                    self.processed.append({
+                        'name': patient_name,
+                        'priority': patient.get('priority', 'green'),
+                        'final_status': 'Discharged',
+                        'total_time': event.get('details', {}).get('total_time_in_hospital', 'Unknown'),
+                        'discharge_timestamp': event['timestamp']
+                    })
+                self.processed_count += 1
+                del self.active_patients[patient_name]
+            for occupants in self.resource_status.values():
+                if patient_name in occupants:
+                    occupants.remove(patient_name)
+
+        self.position += 1
+        self.timestamp = event['timestamp']
+
+
+class StateReplayEngine:
+    """Random access to the hospital state at any point of an event log
+
+    A snapshot of the state is kept every ``keyframe_interval`` events, or less often
+    while the hospital holds more patients than that, so keyframe memory stays
+    proportional to the log. The state at a timestamp is found by binary search over
+    event times and keyframe positions, then rebuilt by copying the nearest earlier
+    keyframe and replaying the events since it, which costs no more than the copy.
+    Resources are discovered from the log, so any hospital configuration works.
+    """
+
+    def __init__(self, events: Sequence[Dict[str, Any]], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError(f"Keyframe interval must be at least 1, got {keyframe_interval}")
+        self.keyframe_interval = keyframe_interval
+        self.events = sorted(events, key=lambda event: event['timestamp'])
+        self.timestamps = [event['timestamp'] for event in self.events]
+
+        self.resources: Dict[str, List[str]] = {}  # Resource names by kind
+        seen = set()
+        for event in self.events:
+            for kind, resource_name in _event_resources(event):
+                if resource_name not in seen:
+                    seen.add(resource_name)
+                    self.resources.setdefault(kind, []).append(resource_name)
+        for names in self.resources.values():
+            names.sort()
+
+        state = ReplayState(resource_status={name: [] for names in self.resources.values() for name in names})
+        self.keyframes: List[ReplayState] = [state.copy()]
+        self.keyframe_positions: List[int] = [0]
+        for event in self.events:
+            state.apply(event)
+            if state.position - self.keyframe_positions[-1] >= max(keyframe_interval, len(state.active_patients)):
+                self.keyframes.append(state.copy())
+                self.keyframe_positions.append(state.position)
+        self.processed = state.processed  # Every discharge in the log, shared by all states
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def duration(self) -> float:
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def position_at(self, timestamp: float) -> int:
+        """Number of events at or before ``timestamp``"""
+        return bisect_right(self.timestamps, timestamp)
+
+    def state_at_position(self, position: int) -> ReplayState:
+        """Fresh state after the first ``position`` events, safe to advance with ``apply``"""
+        position = max(0, min(position, len(self.events)))
+        state = self.keyframes[bisect_right(self.keyframe_positions, position) - 1].copy()
+        for event in self.events[state.position:position]:
+            state.apply(event)
+        return state
+
+    def state_at(self, timestamp: float) -> ReplayState:
+        """Fresh state including every event at or before ``timestamp``"""
+        state = self.state_at_position(self.position_at(timestamp))
+        state.timestamp = timestamp
+        return state
+
+    def event_at(self, position: int) -> Optional[Dict[str, Any]]:
+        return self.events[position] if 0 <= position < len(self.events) else None
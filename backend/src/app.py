@@ -1,14 +1,110 @@
-from typing import Dict
-from fastapi import FastAPI
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from .enums.simulation_engine import SimulationEngine
+from .services.simulation_jobs import SimulationJob, SimulationJobManager
+
+job_manager: SimulationJobManager = SimulationJobManager()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await job_manager.shutdown()
+
 
 app: FastAPI = FastAPI(
     title="Dissertation API",
     description="A FastAPI application for dissertation project",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
+class HospitalConfig(BaseModel):
+    """Hospital to simulate: the sample hospital or a custom-sized one"""
+    sample: bool = True
+    name: str = "City General Hospital"
+    num_doctors: int = Field(4, ge=1, le=4)
+    num_beds: int = Field(5, ge=0)
+    num_mri: int = Field(2, ge=0)
+    num_ultrasonic: int = Field(2, ge=0)
+
+
+class SimulationJobRequest(BaseModel):
+    """Simulation job submitted by an analyst"""
+    hospital: HospitalConfig = Field(default_factory=HospitalConfig)
+    horizon_minutes: int = Field(480, gt=0)
+    seed: Optional[int] = None
+    replications: int = Field(1, ge=1, le=100)
+    engine: SimulationEngine = SimulationEngine.SIMPY
+    stream_events: bool = True  # False: only KPI summaries are sent back from the workers
+
+
+def _get_job_or_404(job_id: str) -> SimulationJob:
+    job = job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Simulation job {job_id} not found")
+    return job
+
+
 @app.get("/", response_model=Dict[str, str])
 async def root() -> Dict[str, str]:
     """Root endpoint that returns a welcome message."""
-    return {"message": "Hello World"}
\ No newline at end of file
+    return {"message": "Hello World"}
+
+
+@app.post("/simulations", status_code=202, response_model=Dict[str, Any])
+async def submit_simulation(request: SimulationJobRequest) -> Dict[str, Any]:
+    """Queue a simulation job on the worker pool and return its status."""
+    try:
+        job = job_manager.submit(request.model_dump(mode="json"))
+    except RuntimeError as error:
+        raise HTTPException(status_code=429, detail=str(error))
+    return job.to_status()
+
+
+@app.get("/simulations", response_model=List[Dict[str, Any]])
+async def list_simulations() -> List[Dict[str, Any]]:
+    """List all simulation jobs and their status."""
+    return [job.to_status() for job in job_manager.list_jobs()]
+
+
+@app.get("/simulations/{job_id}", response_model=Dict[str, Any])
+async def get_simulation(job_id: str) -> Dict[str, Any]:
+    """Get the status and KPIs of a simulation job."""
+    return _get_job_or_404(job_id).to_status()
+
+
+@app.get("/simulations/{job_id}/stream")
+async def stream_simulation(job_id: str, offset: int = 0) -> StreamingResponse:
+    """Stream a job's events and KPIs as Server-Sent Events.
+
+    Messages already produced are replayed first, starting at ``offset``; only the
+    latest messages of a job are kept, so older ones may be skipped.
+    """
+    job = _get_job_or_404(job_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        cursor = offset
+        while True:
+            start, messages = job.messages_since(cursor)
+            cursor = max(cursor, start)
+            for cursor, message in enumerate(messages, start=start + 1):
+                yield f"id: {cursor}\nevent: {message['type']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+            if job.is_finished and cursor >= job.message_count:
+                return
+            await job.wait_for_update(timeout=15)
+            if cursor >= job.message_count and not job.is_finished:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Expose simulation engine metrics in Prometheus text format."""
+    return PlainTextResponse(job_manager.render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 
 from ..equipment import Equipment
+from ....enums.bed_type import BedType
 
 @dataclass
 class Bed(Equipment):
-    pass
\ No newline at end of file
+    bed_type: BedType = BedType.WARD
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..entity import Entity
 from ..doctor.doctor import Doctor
 from ..patient.patient import Patient
@@ -8,13 +8,14 @@ from ..equipment.MRI.MRI import MRI
 from ..equipment.ultrasonic.ultrasonic import Ultrasonic
 from ..triage.triage import FuzzyManchesterTriage
 from ...enums.priority import Priority
+from ...enums.bed_type import BedType
 from ...managers.doctor_manager import DoctorManager
 from ...managers.bed_manager import BedManager
 from ...managers.equipment_manager import EquipmentManager
 
 @dataclass
 class Hospital(Entity):
-    patients: List[Patient] = field(default_factory=list)
+    patients: Dict[int, Patient] = field(default_factory=dict)  # Active patients keyed by patient id
     triage_system: FuzzyManchesterTriage = field(default_factory=FuzzyManchesterTriage)
     doctor_manager: DoctorManager = field(default_factory=DoctorManager)
     bed_manager: BedManager = field(default_factory=BedManager)
@@ -35,6 +36,10 @@ class Hospital(Entity):
         """Get list of available doctors"""
         return self.doctor_manager.get_available_doctors()
 
+    def get_least_loaded_doctor(self) -> Optional[Doctor]:
+        """Get the available doctor with the shortest queue"""
+        return self.doctor_manager.get_least_loaded_doctor()
+
     def get_doctors_by_specialty(self, specialty: str) -> List[Doctor]:
         """Get doctors by specialty"""
         return self.doctor_manager.get_doctors_by_specialty(specialty)
@@ -50,15 +55,18 @@ class Hospital(Entity):
     # Patient management
     def admit_patient(self, patient: Patient) -> None:
         """Admit a patient to the hospital with automatic triage"""
-        self.patients.append(patient)
+        registered = self.patients.get(patient.id)
+        if registered is not None and registered is not patient:
+            raise ValueError(f"Patient id {patient.id} is already registered to {registered.name}")
+        self.patients[patient.id] = patient
         print(f"Patient {patient.name} admitted to {self.name}")
 
         self._perform_triage(patient)
 
     def discharge_patient(self, patient: Patient) -> None:
         """Discharge a patient from the hospital"""
-        if patient in self.patients:
-            self.patients.remove(patient)
+        if self.patients.get(patient.id) is patient:
+            del self.patients[patient.id]
             # Remove from any resource queues
             if patient.resource_assigned:
                 patient.resource_assigned.remove_patient_from_queue(patient)
@@ -66,6 +74,14 @@ class Hospital(Entity):
         else:
             print(f"Patient {patient.name} not found in {self.name}")
 
+    def get_patient(self, patient_id: int) -> Optional[Patient]:
+        """Look up an active patient by id"""
+        return self.patients.get(patient_id)
+
+    def get_active_patient_count(self) -> int:
+        """Get number of patients currently admitted"""
+        return len(self.patients)
+
     # Equipment management
     def add_bed(self, bed: Bed) -> None:
         """Add a bed to the hospital"""
@@ -82,9 +98,13 @@ class Hospital(Entity):
         self.equipment_manager.add_ultrasonic_machine(ultrasonic)
         print(f"Ultrasonic {ultrasonic.name} added to {self.name}")
 
-    def get_available_beds(self) -> List[Bed]:
-        """Get list of available beds"""
-        return self.bed_manager.get_available_beds()
+    def get_available_beds(self, bed_type: Optional[BedType] = None) -> List[Bed]:
+        """Get list of available beds, optionally of a single ward type"""
+        return self.bed_manager.get_available_beds(bed_type)
+
+    def get_first_available_bed(self, bed_type: Optional[BedType] = None) -> Optional[Bed]:
+        """Get the first free bed, optionally of a single ward type"""
+        return self.bed_manager.get_first_available_bed(bed_type)
 
     def get_available_mri_machines(self) -> List[MRI]:
         """Get list of available MRI machines"""
@@ -99,14 +119,14 @@ class Hospital(Entity):
         """Get comprehensive hospital statistics"""
         return {
             "total_doctors": len(self.doctor_manager.get_all_doctors()),
-            "available_doctors": len(self.get_available_doctors()),
-            "total_patients": len(self.patients),
+            "available_doctors": self.doctor_manager.count_available_doctors(),
+            "total_patients": self.get_active_patient_count(),
             "total_beds": len(self.bed_manager.get_all_beds()),
-            "available_beds": len(self.get_available_beds()),
+            "available_beds": self.bed_manager.count_available_beds(),
             "total_mri_machines": len(self.equipment_manager.get_all_mri_machines()),
-            "available_mri_machines": len(self.get_available_mri_machines()),
+            "available_mri_machines": self.equipment_manager.count_available_mri_machines(),
             "total_ultrasonic_machines": len(self.equipment_manager.get_all_ultrasonic_machines()),
-            "available_ultrasonic_machines": len(self.get_available_ultrasonic_machines())
+            "available_ultrasonic_machines": self.equipment_manager.count_available_ultrasonic_machines()
         }
 
     def _add_resource_queues_to_summary(self, summary: Dict[str, Dict[str, int]],
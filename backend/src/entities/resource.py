@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
 from .entity import Entity
 
 if TYPE_CHECKING:
@@ -16,10 +16,42 @@ class Resource(Entity):
         "green": [],
         "blue": []
     })
+    _availability_listeners: List[Callable[["Resource", bool], None]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _queue_listeners: List[Callable[["Resource"], None]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
     
     def set_available(self, available: bool) -> None:
-        """Set resource availability status"""
+        """Set resource availability status and notify listeners when it changes"""
+        if self.available == available:
+            return
         self.available = available
+        for listener in self._availability_listeners:
+            listener(self, available)
+    
+    def add_availability_listener(self, listener: Callable[["Resource", bool], None]) -> None:
+        """Register a callback invoked whenever availability changes"""
+        self._availability_listeners.append(listener)
+    
+    def remove_availability_listener(self, listener: Callable[["Resource", bool], None]) -> None:
+        """Unregister an availability callback"""
+        if listener in self._availability_listeners:
+            self._availability_listeners.remove(listener)
+    
+    def add_queue_listener(self, listener: Callable[["Resource"], None]) -> None:
+        """Register a callback invoked whenever a patient joins or leaves the queue"""
+        self._queue_listeners.append(listener)
+    
+    def remove_queue_listener(self, listener: Callable[["Resource"], None]) -> None:
+        """Unregister a queue callback"""
+        if listener in self._queue_listeners:
+            self._queue_listeners.remove(listener)
+    
+    def _notify_queue_changed(self) -> None:
+        for listener in self._queue_listeners:
+            listener(self)
     
     def is_available(self) -> bool:
         """Check if resource is available"""
@@ -36,6 +68,7 @@ class Resource(Entity):
         
         self.patient_queue[priority].append(patient)
         patient.resource_assigned = self
+        self._notify_queue_changed()
         print(f"Patient {patient.name} added to {priority} priority queue for {self.name}")
     
     def remove_patient_from_queue(self, patient: "Patient") -> None:
@@ -44,6 +77,7 @@ class Resource(Entity):
             if patient in queue:
                 queue.remove(patient)
                 patient.resource_assigned = None
+                self._notify_queue_changed()
                 print(f"Patient {patient.name} removed from {priority} priority queue for {self.name}")
                 return
         print(f"Patient {patient.name} not found in any queue for {self.name}")
@@ -59,7 +93,9 @@ class Resource(Entity):
         """Get the next patient from the highest priority queue"""
         for priority in ["red", "orange", "yellow", "green", "blue"]:
             if self.patient_queue[priority]:
-                return self.patient_queue[priority].pop(0)
+                patient = self.patient_queue[priority].pop(0)
+                self._notify_queue_changed()
+                return patient
         return None
     
     def get_queue_status(self) -> Dict[str, int]:
@@ -1,7 +1,9 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
 from ..patient.patient import Patient
 from ...enums.priority import Priority
+from ...monitoring.engine_metrics import LatencyHistogram
 
 @dataclass
 class FuzzyManchesterTriage:
@@ -37,6 +39,9 @@ class FuzzyManchesterTriage:
         "mild nausea", "minor ache"
     }
     
+    # Optional latency instrumentation for determine_priority
+    latency_histogram: Optional[LatencyHistogram] = field(default=None, repr=False, compare=False)
+    
     def _normalize_scores(self, scores: Dict[Priority, float]) -> Dict[Priority, float]:
         """Normalize scores to sum to 1.0"""
         total_score = sum(scores.values())
@@ -109,6 +114,14 @@ class FuzzyManchesterTriage:
     
     def determine_priority(self, patient: Patient) -> Priority:
         """Determine triage priority for a patient using fuzzy Manchester Triage System"""
+        if self.latency_histogram is None:
+            return self._determine_priority(patient)
+        started = time.perf_counter()
+        priority = self._determine_priority(patient)
+        self.latency_histogram.observe(time.perf_counter() - started)
+        return priority
+    
+    def _determine_priority(self, patient: Patient) -> Priority:
         # Calculate initial symptom urgency scores
         symptom_scores = self.calculate_symptom_urgency_score(patient)
         
@@ -0,0 +1,17 @@
+from enum import Enum
+
+class BedType(Enum):
+    """Ward types a hospital bed can belong to"""
+    ICU = "ICU"
+    HDU = "HDU"
+    WARD = "Ward"
+
+    @property
+    def name_display(self) -> str:
+        """Get display name for bed type"""
+        names = {
+            BedType.ICU: "Intensive Care Unit",
+            BedType.HDU: "High Dependency Unit",
+            BedType.WARD: "General Ward"
+        }
+        return names[self]
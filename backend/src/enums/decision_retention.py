@@ -0,0 +1,7 @@
+from enum import Enum
+
+class DecisionRetention(Enum):
+    """How much routing decision history the routing service keeps"""
+    FULL = "full"            # Keep every decision
+    BOUNDED = "bounded"      # Keep only the most recent decisions in a ring buffer
+    AGGREGATE = "aggregate"  # Keep only counters by priority and resource type
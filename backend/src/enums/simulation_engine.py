@@ -0,0 +1,6 @@
+from enum import Enum
+
+class SimulationEngine(Enum):
+    """Event-scheduling engines available to HospitalSimulation"""
+    SIMPY = "simpy"                    # One SimPy generator process per patient
+    EVENT_CALENDAR = "event_calendar"  # heapq event calendar with typed event records
@@ -0,0 +1,49 @@
+from typing import Dict, Generic, List, Optional, TypeVar
+from ..entities.resource import Resource
+
+R = TypeVar("R", bound=Resource)
+
+class AvailabilityIndex(Generic[R]):
+    """Insertion-ordered set of available resources kept in sync via Resource.set_available
+
+    Resources are keyed by id, so membership updates, counts and first-free
+    lookups are O(1). A resource that becomes available again rejoins at the back.
+    Beds are marked occupied and free by BedManager as patients use them; doctors
+    and equipment stay available while on duty, with their load in their queues.
+    """
+
+    def __init__(self):
+        self._available: Dict[int, R] = {}
+        self._members: Dict[int, R] = {}
+
+    def add(self, resource: R) -> None:
+        self._members[resource.id] = resource
+        resource.add_availability_listener(self._on_availability_changed)
+        if resource.is_available():
+            self._available[resource.id] = resource
+
+    def remove(self, resource: R) -> None:
+        self._members.pop(resource.id, None)
+        self._available.pop(resource.id, None)
+        resource.remove_availability_listener(self._on_availability_changed)
+
+    def get_available(self) -> List[R]:
+        return list(self._available.values())
+
+    def first_available(self) -> Optional[R]:
+        return next(iter(self._available.values()), None)
+
+    def count_available(self) -> int:
+        return len(self._available)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _on_availability_changed(self, resource: Resource, available: bool) -> None:
+        member = self._members.get(resource.id)
+        if member is not resource:
+            return
+        if available:
+            self._available[member.id] = member
+        else:
+            self._available.pop(member.id, None)
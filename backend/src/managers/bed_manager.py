@@ -1,18 +1,54 @@
-from typing import List
+from typing import Dict, List, Optional
 from ..entities.equipment.bed.bed import Bed
+from ..enums.bed_type import BedType
+from .availability_index import AvailabilityIndex
 
 class BedManager:
     def __init__(self):
         self.beds: List[Bed] = []
+        # One free-list per ward type, updated through Resource.set_available; each bed is in exactly one
+        self._free_beds_by_type: Dict[BedType, AvailabilityIndex[Bed]] = {bed_type: AvailabilityIndex() for bed_type in BedType}
+        self._beds_by_type: Dict[BedType, List[Bed]] = {bed_type: [] for bed_type in BedType}
 
     def add_bed(self, bed: Bed):
         self.beds.append(bed)
+        self._beds_by_type[bed.bed_type].append(bed)
+        self._free_beds_by_type[bed.bed_type].add(bed)
 
     def remove_bed(self, bed: Bed):
         self.beds.remove(bed)
+        self._beds_by_type[bed.bed_type].remove(bed)
+        self._free_beds_by_type[bed.bed_type].remove(bed)
 
-    def get_available_beds(self) -> List[Bed]:
-        return [bed for bed in self.beds if bed.is_available()]
+    def occupy_bed(self, bed: Bed):
+        """Mark a bed as occupied, removing it from the free-lists"""
+        bed.set_available(False)
+
+    def release_bed(self, bed: Bed):
+        """Mark a bed as free, returning it to the back of its free-list"""
+        bed.set_available(True)
+
+    def get_available_beds(self, bed_type: Optional[BedType] = None) -> List[Bed]:
+        return [bed for free_beds in self._free_lists(bed_type) for bed in free_beds.get_available()]
+
+    def get_first_available_bed(self, bed_type: Optional[BedType] = None) -> Optional[Bed]:
+        """Get the first free bed, optionally restricted to a ward type (otherwise in BedType order)"""
+        for free_beds in self._free_lists(bed_type):
+            bed = free_beds.first_available()
+            if bed:
+                return bed
+        return None
+
+    def count_available_beds(self, bed_type: Optional[BedType] = None) -> int:
+        return sum(free_beds.count_available() for free_beds in self._free_lists(bed_type))
+
+    def get_beds_by_type(self, bed_type: BedType) -> List[Bed]:
+        return self._beds_by_type[bed_type]
 
     def get_all_beds(self) -> List[Bed]:
         return self.beds
+
+    def _free_lists(self, bed_type: Optional[BedType]) -> List[AvailabilityIndex[Bed]]:
+        if bed_type is None:
+            return list(self._free_beds_by_type.values())
+        return [self._free_beds_by_type[bed_type]]
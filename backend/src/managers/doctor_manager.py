@@ -1,21 +1,41 @@
-from typing import List
+from typing import Dict, List, Optional
 from ..entities.doctor.doctor import Doctor
+from .availability_index import AvailabilityIndex
+from .queue_length_index import QueueLengthIndex
 
 class DoctorManager:
     def __init__(self):
         self.doctors: List[Doctor] = []
+        self._available_doctors: AvailabilityIndex[Doctor] = AvailabilityIndex()
+        self._doctors_by_queue_length: QueueLengthIndex[Doctor] = QueueLengthIndex()
+        # Specialty index keyed by the lowercased specialty name
+        self._doctors_by_specialty: Dict[str, List[Doctor]] = {}
 
     def add_doctor(self, doctor: Doctor):
         self.doctors.append(doctor)
+        self._available_doctors.add(doctor)
+        self._doctors_by_queue_length.add(doctor)
+        self._doctors_by_specialty.setdefault(doctor.specialty.lower(), []).append(doctor)
 
     def remove_doctor(self, doctor: Doctor):
         self.doctors.remove(doctor)
+        self._available_doctors.remove(doctor)
+        self._doctors_by_queue_length.remove(doctor)
+        specialty_doctors = self._doctors_by_specialty.get(doctor.specialty.lower(), [])
+        if doctor in specialty_doctors:
+            specialty_doctors.remove(doctor)
 
     def get_available_doctors(self) -> List[Doctor]:
-        return [doctor for doctor in self.doctors if doctor.is_available()]
+        return self._available_doctors.get_available()
+
+    def count_available_doctors(self) -> int:
+        return self._available_doctors.count_available()
+
+    def get_least_loaded_doctor(self) -> Optional[Doctor]:
+        return self._doctors_by_queue_length.least_loaded()
 
     def get_doctors_by_specialty(self, specialty: str) -> List[Doctor]:
-        return [doctor for doctor in self.doctors if doctor.specialty.lower() == specialty.lower()]
+        return list(self._doctors_by_specialty.get(specialty.lower(), []))
 
     def get_all_doctors(self) -> List[Doctor]:
         return self.doctors
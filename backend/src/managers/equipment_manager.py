@@ -1,32 +1,45 @@
 from typing import List
 from ..entities.equipment.MRI.MRI import MRI
 from ..entities.equipment.ultrasonic.ultrasonic import Ultrasonic
+from .availability_index import AvailabilityIndex
 
 class EquipmentManager:
     def __init__(self):
         self.mri_machines: List[MRI] = []
         self.ultrasonic_machines: List[Ultrasonic] = []
+        self._available_mri_machines: AvailabilityIndex[MRI] = AvailabilityIndex()
+        self._available_ultrasonic_machines: AvailabilityIndex[Ultrasonic] = AvailabilityIndex()
 
     def add_mri_machine(self, mri: MRI):
         self.mri_machines.append(mri)
+        self._available_mri_machines.add(mri)
 
     def remove_mri_machine(self, mri: MRI):
         self.mri_machines.remove(mri)
+        self._available_mri_machines.remove(mri)
 
     def get_available_mri_machines(self) -> List[MRI]:
-        return [mri for mri in self.mri_machines if mri.is_available()]
+        return self._available_mri_machines.get_available()
+
+    def count_available_mri_machines(self) -> int:
+        return self._available_mri_machines.count_available()
 
     def get_all_mri_machines(self) -> List[MRI]:
         return self.mri_machines
 
     def add_ultrasonic_machine(self, ultrasonic: Ultrasonic):
         self.ultrasonic_machines.append(ultrasonic)
+        self._available_ultrasonic_machines.add(ultrasonic)
 
     def remove_ultrasonic_machine(self, ultrasonic: Ultrasonic):
         self.ultrasonic_machines.remove(ultrasonic)
+        self._available_ultrasonic_machines.remove(ultrasonic)
 
     def get_available_ultrasonic_machines(self) -> List[Ultrasonic]:
-        return [ultrasonic for ultrasonic in self.ultrasonic_machines if ultrasonic.is_available()]
+        return self._available_ultrasonic_machines.get_available()
+
+    def count_available_ultrasonic_machines(self) -> int:
+        return self._available_ultrasonic_machines.count_available()
 
     def get_all_ultrasonic_machines(self) -> List[Ultrasonic]:
         return self.ultrasonic_machines
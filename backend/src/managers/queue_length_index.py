@@ -0,0 +1,69 @@
+import heapq
+import itertools
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+from ..entities.resource import Resource
+
+R = TypeVar("R", bound=Resource)
+
+class QueueLengthIndex(Generic[R]):
+    """Min-heap of available resources ordered by queue length, kept in sync via Resource listeners
+
+    Ties go to the resource that became available first, the same order
+    AvailabilityIndex lists them in. Stale heap entries are skipped lazily,
+    so queue changes and least-loaded lookups are O(log n) amortised.
+    """
+
+    def __init__(self):
+        self._members: Dict[int, R] = {}
+        # Current (queue length, availability rank) of each available member
+        self._entries: Dict[int, Tuple[int, int]] = {}
+        self._heap: List[Tuple[int, int, int]] = []
+        self._ranks = itertools.count()
+
+    def add(self, resource: R) -> None:
+        self._members[resource.id] = resource
+        resource.add_availability_listener(self._on_availability_changed)
+        resource.add_queue_listener(self._on_queue_changed)
+        if resource.is_available():
+            self._push(resource, next(self._ranks))
+
+    def remove(self, resource: R) -> None:
+        self._members.pop(resource.id, None)
+        self._entries.pop(resource.id, None)
+        resource.remove_availability_listener(self._on_availability_changed)
+        resource.remove_queue_listener(self._on_queue_changed)
+
+    def least_loaded(self) -> Optional[R]:
+        heap = self._heap
+        while heap:
+            length, rank, resource_id = heap[0]
+            if self._entries.get(resource_id) == (length, rank):
+                return self._members[resource_id]
+            heapq.heappop(heap)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _push(self, resource: Resource, rank: int) -> None:
+        entry = (resource.get_total_patients_in_queue(), rank)
+        self._entries[resource.id] = entry
+        heapq.heappush(self._heap, (entry[0], rank, resource.id))
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [(length, rank, resource_id) for resource_id, (length, rank) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _on_availability_changed(self, resource: Resource, available: bool) -> None:
+        if self._members.get(resource.id) is not resource:
+            return
+        if available:
+            self._push(resource, next(self._ranks))
+        else:
+            self._entries.pop(resource.id, None)
+
+    def _on_queue_changed(self, resource: Resource) -> None:
+        if self._members.get(resource.id) is not resource:
+            return
+        entry = self._entries.get(resource.id)
+        if entry is not None:
+            self._push(resource, entry[1])
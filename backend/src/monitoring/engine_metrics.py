@@ -0,0 +1,168 @@
+import sys
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Latency buckets in seconds, from 1 microsecond to 1 second
+DEFAULT_LATENCY_BUCKETS: Sequence[float] = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001,
+    0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram with O(log buckets) observations"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets: List[float] = list(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.total, "count": self.count}
+
+
+class EngineMetrics:
+    """Low-overhead engine instrumentation for one simulation run
+
+    Counters are updated inline by HospitalSimulation, FuzzyManchesterTriage and
+    RoutingService; gauges are refreshed by the simulation when a snapshot is taken.
+    Snapshots are plain dicts so they can be sent between processes and merged.
+    """
+
+    def __init__(self):
+        self.events_total: Counter[str] = Counter()
+        self.simulated_minutes = 0.0
+        self.wall_seconds = 0.0
+        self.active_processes = 0
+        self.queue_depths: Dict[str, int] = {}
+        # Events held for streaming clients; set by SimulationJobManager from its job message logs
+        self.event_store_events = 0
+        self.event_store_bytes = 0
+        self.triage_latency = LatencyHistogram()
+        self.routing_latency = LatencyHistogram()
+
+    def record_event(self, event_type: str) -> None:
+        self.events_total[event_type] += 1
+
+    def record_advance(self, simulated_minutes: float, wall_seconds: float) -> None:
+        self.simulated_minutes += simulated_minutes
+        self.wall_seconds += wall_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "events_total": dict(self.events_total),
+            "simulated_minutes": self.simulated_minutes,
+            "wall_seconds": self.wall_seconds,
+            "active_processes": self.active_processes,
+            "queue_depths": dict(self.queue_depths),
+            "event_store_events": self.event_store_events,
+            "event_store_bytes": self.event_store_bytes,
+            "triage_latency": self.triage_latency.snapshot(),
+            "routing_latency": self.routing_latency.snapshot()
+        }
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate deep size of a JSON-like value"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def _merge_histograms(target: Optional[Dict[str, Any]], source: Dict[str, Any]) -> Dict[str, Any]:
+    if target is None:
+        return {"buckets": list(source["buckets"]), "counts": list(source["counts"]),
+                "sum": source["sum"], "count": source["count"]}
+    target["counts"] = [a + b for a, b in zip(target["counts"], source["counts"])]
+    target["sum"] += source["sum"]
+    target["count"] += source["count"]
+    return target
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum counters, gauges and histograms across several runs"""
+    merged: Dict[str, Any] = EngineMetrics().snapshot()
+    events_total: Counter[str] = Counter()
+    queue_depths: Counter[str] = Counter()
+    triage: Optional[Dict[str, Any]] = None
+    routing: Optional[Dict[str, Any]] = None
+    for snapshot in snapshots:
+        events_total.update(snapshot["events_total"])
+        queue_depths.update(snapshot["queue_depths"])
+        for key in ("simulated_minutes", "wall_seconds", "active_processes", "event_store_events", "event_store_bytes"):
+            merged[key] += snapshot[key]
+        triage = _merge_histograms(triage, snapshot["triage_latency"])
+        routing = _merge_histograms(routing, snapshot["routing_latency"])
+    merged["events_total"] = dict(events_total)
+    merged["queue_depths"] = dict(queue_depths)
+    if triage is not None:
+        merged["triage_latency"] = triage
+    if routing is not None:
+        merged["routing_latency"] = routing
+    return merged
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, histogram: Dict[str, Any]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    cumulative = 0
+    for bound, count in zip(histogram["buckets"], histogram["counts"]):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {histogram["count"]}')
+    lines.append(f"{name}_sum {histogram['sum']}")
+    lines.append(f"{name}_count {histogram['count']}")
+
+
+def render_prometheus(totals: Dict[str, Any], live: Dict[str, Any]) -> str:
+    """Render metrics in the Prometheus text exposition format
+
+    Args:
+        totals: merged snapshot of every run, used for counters and histograms
+        live: merged snapshot of currently running runs, used for gauges
+    """
+    lines: List[str] = []
+
+    lines.append("# HELP simulation_events_total Simulation events logged, by event type")
+    lines.append("# TYPE simulation_events_total counter")
+    for event_type, count in sorted(totals["events_total"].items()):
+        lines.append(f'simulation_events_total{{event_type="{event_type}"}} {count}')
+
+    lines.append("# HELP simulation_simulated_minutes_total Simulated minutes advanced")
+    lines.append("# TYPE simulation_simulated_minutes_total counter")
+    lines.append(f"simulation_simulated_minutes_total {totals['simulated_minutes']}")
+    lines.append("# HELP simulation_wall_seconds_total Wall-clock seconds spent advancing simulations")
+    lines.append("# TYPE simulation_wall_seconds_total counter")
+    lines.append(f"simulation_wall_seconds_total {totals['wall_seconds']}")
+    # Throughput is left to the scraper, e.g. rate(simulation_events_total[5m]) /
+    # rate(simulation_wall_seconds_total[5m]); a lifetime average here would never move
+
+    lines.append("# HELP simulation_active_processes Patient journeys in progress in running simulations")
+    lines.append("# TYPE simulation_active_processes gauge")
+    lines.append(f"simulation_active_processes {live['active_processes']}")
+    lines.append("# HELP simulation_queue_depth Patients queued per resource in running simulations")
+    lines.append("# TYPE simulation_queue_depth gauge")
+    for resource_name, depth in sorted(live["queue_depths"].items()):
+        lines.append(f'simulation_queue_depth{{resource="{resource_name}"}} {depth}')
+    lines.append("# HELP simulation_event_store_events Events held in job message logs for streaming clients")
+    lines.append("# TYPE simulation_event_store_events gauge")
+    lines.append(f"simulation_event_store_events {live['event_store_events']}")
+    lines.append("# HELP simulation_event_store_bytes Estimated memory of the events held in job message logs")
+    lines.append("# TYPE simulation_event_store_bytes gauge")
+    lines.append(f"simulation_event_store_bytes {live['event_store_bytes']}")
+
+    _render_histogram(lines, "simulation_triage_latency_seconds", "FuzzyManchesterTriage.determine_priority latency",
+                      totals["triage_latency"])
+    _render_histogram(lines, "simulation_routing_latency_seconds", "RoutingService.make_routing_decision latency",
+                      totals["routing_latency"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,235 @@
+import math
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Sequence
+
+FOUR_HOUR_TARGET_MINUTES = 240  # NHS four-hour emergency department standard
+DEFAULT_QUANTILES: Sequence[float] = (0.5, 0.9, 0.99)
+
+
+class WelfordAccumulator:
+    """Running count, mean, variance, min and max in O(1) memory (Welford's algorithm)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "WelfordAccumulator") -> None:
+        """Combine with another accumulator (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": math.sqrt(self.variance),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+
+class P2Quantile:
+    """Streaming quantile estimate in O(1) memory (Jain & Chlamtac P-squared algorithm)"""
+
+    def __init__(self, quantile: float):
+        if not 0 < quantile < 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {quantile}")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []  # Marker heights; the first five observations until initialised
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4.0]
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights, positions = self._heights, self._positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # Exact quantile of the few observations seen so far
+            return self._heights[min(int(self.quantile * self.count), self.count - 1)]
+        return self._heights[2]
+
+
+class TimeWeightedValue:
+    """Time integral of a piecewise-constant level, e.g. a queue length"""
+
+    def __init__(self, start_time: float = 0.0):
+        self.start_time = start_time
+        self.value = 0
+        self.max = 0
+        self._last_time = start_time
+        self._integral = 0.0
+
+    def update(self, now: float, value: int) -> None:
+        self._integral += self.value * (now - self._last_time)
+        self._last_time = now
+        self.value = value
+        self.max = max(self.max, value)
+
+    def mean(self, now: float) -> float:
+        elapsed = now - self.start_time
+        if elapsed <= 0:
+            return float(self.value)
+        return (self._integral + self.value * (now - self._last_time)) / elapsed
+
+
+class SimulationKPIs:
+    """Online KPIs maintained while a HospitalSimulation runs
+
+    Per priority: waits for a doctor and total time in hospital (mean/variance and
+    streaming quantiles) and four-hour breaches. Per resource: time-weighted queue
+    length and occupancy. Memory is O(priorities + resources + patients in the system).
+    """
+
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 breach_minutes: float = FOUR_HOUR_TARGET_MINUTES):
+        self.quantiles = list(quantiles)
+        self.breach_minutes = breach_minutes
+        self.waits: DefaultDict[str, WelfordAccumulator] = defaultdict(WelfordAccumulator)
+        self.wait_quantiles: DefaultDict[str, List[P2Quantile]] = defaultdict(self._new_sketches)
+        self.times_in_hospital: DefaultDict[str, WelfordAccumulator] = defaultdict(WelfordAccumulator)
+        self.time_in_hospital_quantiles: DefaultDict[str, List[P2Quantile]] = defaultdict(self._new_sketches)
+        self.breaches: DefaultDict[str, int] = defaultdict(int)
+        self.queue_lengths: Dict[str, TimeWeightedValue] = {}
+        self.occupancy: Dict[str, TimeWeightedValue] = {}
+        self.arrivals = 0
+        self._arrival_times: Dict[int, float] = {}  # Patients currently in the hospital
+
+    def _new_sketches(self) -> List[P2Quantile]:
+        return [P2Quantile(quantile) for quantile in self.quantiles]
+
+    def _level(self, levels: Dict[str, TimeWeightedValue], resource_name: str) -> TimeWeightedValue:
+        level = levels.get(resource_name)
+        if level is None:
+            level = levels[resource_name] = TimeWeightedValue()
+        return level
+
+    def record_arrival(self, patient_id: int, now: float) -> None:
+        self.arrivals += 1
+        self._arrival_times[patient_id] = now
+
+    def record_queue_length(self, resource_name: str, queue_length: int, now: float) -> None:
+        self._level(self.queue_lengths, resource_name).update(now, queue_length)
+
+    def record_service_start(self, resource_name: str, now: float) -> None:
+        occupancy = self._level(self.occupancy, resource_name)
+        occupancy.update(now, occupancy.value + 1)
+
+    def record_service_end(self, resource_name: str, now: float) -> None:
+        occupancy = self._level(self.occupancy, resource_name)
+        occupancy.update(now, occupancy.value - 1)
+
+    def record_consultation_start(self, patient_id: int, priority: str, resource_name: str, now: float) -> None:
+        wait = now - self._arrival_times[patient_id]
+        self.waits[priority].add(wait)
+        for sketch in self.wait_quantiles[priority]:
+            sketch.add(wait)
+        self.record_service_start(resource_name, now)
+
+    def record_discharge(self, patient_id: int, priority: str, now: float) -> None:
+        time_in_hospital = now - self._arrival_times.pop(patient_id)
+        self.times_in_hospital[priority].add(time_in_hospital)
+        for sketch in self.time_in_hospital_quantiles[priority]:
+            sketch.add(time_in_hospital)
+        if time_in_hospital > self.breach_minutes:
+            self.breaches[priority] += 1
+
+    def _distribution(self, accumulator: WelfordAccumulator, sketches: List[P2Quantile]) -> Dict[str, Any]:
+        summary = accumulator.summary()
+        for sketch in sketches:
+            summary[f"p{sketch.quantile * 100:g}"] = sketch.value()
+        return summary
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        """Compact, JSON-serializable KPI summary as of simulation time ``now``"""
+        priorities = sorted(set(self.waits) | set(self.times_in_hospital))
+        return {
+            "simulation_time": now,
+            "arrivals": self.arrivals,
+            "patients_in_hospital": len(self._arrival_times),
+            "by_priority": {
+                priority: {
+                    "wait_for_doctor": self._distribution(self.waits[priority], self.wait_quantiles[priority]),
+                    "time_in_hospital": self._distribution(self.times_in_hospital[priority],
+                                                           self.time_in_hospital_quantiles[priority]),
+                    "four_hour_breaches": self.breaches[priority]
+                }
+                for priority in priorities
+            },
+            "resources": {
+                resource_name: {
+                    "mean_queue_length": self.queue_lengths[resource_name].mean(now)
+                    if resource_name in self.queue_lengths else 0.0,
+                    "max_queue_length": self.queue_lengths[resource_name].max
+                    if resource_name in self.queue_lengths else 0,
+                    "mean_occupancy": self.occupancy[resource_name].mean(now)
+                    if resource_name in self.occupancy else 0.0
+                }
+                for resource_name in sorted(set(self.queue_lengths) | set(self.occupancy))
+            }
+        }
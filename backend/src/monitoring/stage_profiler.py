@@ -0,0 +1,126 @@
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class StageStats:
+    """Accumulated cost of one call path, e.g. ("simulation", "triage", "determine_priority")"""
+    calls: int = 0
+    total_seconds: float = 0.0
+    self_seconds: float = 0.0  # Excluding nested stages
+    self_net_bytes: int = 0  # Net traced memory change excluding nested stages
+
+
+class StageProfiler:
+    """Opt-in wall-time and allocation profiler for simulation pathway stages
+
+    Stages nest, so time and memory are attributed to call paths rather than
+    flat names: the profile can be printed as a compact report or written in
+    the folded-stack format read by flamegraph.pl and speedscope.
+    Allocation tracking uses tracemalloc and is much slower, so it is off by default.
+    With ``folded_file`` the folded stacks are written by ``finish`` at the end of a run.
+    """
+
+    def __init__(self, track_allocations: bool = False, folded_file: Optional[str] = None):
+        self.track_allocations = track_allocations
+        self.folded_file = folded_file
+        self.stats: Dict[Tuple[str, ...], StageStats] = {}
+        # Open frames: [path, start time, nested seconds, start bytes, nested bytes]
+        self._stack: List[List[Any]] = []
+        self._started_tracemalloc = False
+
+    def _traced_bytes(self) -> int:
+        if not self.track_allocations:
+            return 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return tracemalloc.get_traced_memory()[0]
+
+    def enter(self, stage: str) -> None:
+        parent: Tuple[str, ...] = self._stack[-1][0] if self._stack else ()
+        self._stack.append([parent + (stage,), time.perf_counter(), 0.0, self._traced_bytes(), 0])
+
+    def exit(self) -> None:
+        path, started, nested_seconds, start_bytes, nested_bytes = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        net_bytes = self._traced_bytes() - start_bytes
+
+        stats = self.stats.get(path)
+        if stats is None:
+            stats = self.stats[path] = StageStats()
+        stats.calls += 1
+        stats.total_seconds += elapsed
+        stats.self_seconds += elapsed - nested_seconds
+        stats.self_net_bytes += net_bytes - nested_bytes
+
+        if self._stack:
+            self._stack[-1][2] += elapsed
+            self._stack[-1][4] += net_bytes
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        self.enter(stage)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def wrap(self, target: Any, method_name: str, stage: Optional[str] = None) -> None:
+        """Profile calls to ``target.method_name`` by shadowing it on the instance"""
+        method: Callable[..., Any] = getattr(target, method_name)
+        stage_name = stage or method_name
+
+        @functools.wraps(method)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            self.enter(stage_name)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.exit()
+
+        setattr(target, method_name, profiled)
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def finish(self) -> Optional[str]:
+        """End profiling: stop tracemalloc and write ``folded_file`` if set, returning its name"""
+        self.close()
+        return self.write_folded(self.folded_file) if self.folded_file else None
+
+    def format_report(self, limit: Optional[int] = None) -> str:
+        """Per-stage table sorted by self time, with shares of the profiled wall time"""
+        profiled_seconds = sum(stats.self_seconds for stats in self.stats.values()) or 1.0
+        rows = sorted(self.stats.items(), key=lambda item: item[1].self_seconds, reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+
+        header = f"{'stage':<52} {'calls':>8} {'total ms':>10} {'self ms':>10} {'self %':>7} {'us/call':>9}"
+        if self.track_allocations:
+            header += f" {'net KiB':>9}"
+        lines = [header, "-" * len(header)]
+        for path, stats in rows:
+            line = (f"{'/'.join(path):<52} {stats.calls:>8} {stats.total_seconds * 1000:>10.2f} "
+                    f"{stats.self_seconds * 1000:>10.2f} {stats.self_seconds / profiled_seconds * 100:>6.1f}% "
+                    f"{stats.total_seconds / stats.calls * 1e6:>9.1f}")
+            if self.track_allocations:
+                line += f" {stats.self_net_bytes / 1024:>9.1f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def write_folded(self, filename: str) -> str:
+        """Write self time in microseconds as folded stacks (``a;b;c 1234`` per line)"""
+        with open(filename, 'w') as f:
+            for path, stats in sorted(self.stats.items()):
+                microseconds = round(stats.self_seconds * 1e6)
+                if microseconds > 0:
+                    f.write(f"{';'.join(path)} {microseconds}\n")
+        return filename
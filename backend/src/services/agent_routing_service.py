@@ -0,0 +1,186 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, List, Dict, Any, Optional, Tuple, TypeVar
+from ..agents.specialist_agent import RoutingVote, SpecialistAgent
+from ..entities.patient.patient import Patient
+from ..enums.priority import Priority
+from .routing_cache import (
+    CachedRoutingDecision, RoutingDecisionCache, RoutingSignature, resource_state_bucket, routing_signature
+)
+from .routing_service import RoutingService
+
+T = TypeVar("T")
+
+
+def _run_sync(awaitable: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code
+
+    asyncio.run cannot be nested, so when the caller is already inside a running event
+    loop (e.g. a FastAPI handler) the coroutine runs on its own loop in a worker thread.
+    That blocks the caller until the decision is made; async callers should await the
+    *_async methods instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)  # type: ignore[arg-type]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, awaitable).result()  # type: ignore[arg-type]
+
+
+class AgentRoutingService:
+    """Mixture-of-agents router that fans out to specialist agents concurrently
+
+    All agents are queried at once, so routing latency is bounded by the per-decision
+    deadline rather than the sum of all agents. Agents that miss the deadline or fail
+    are left out; if no agent votes in time, the rule-based RoutingService decision
+    is used instead.
+    Decisions can be cached by canonical request signature and requests can be
+    batched so one agent call serves many patients.
+    """
+
+    def __init__(self, rule_router: RoutingService, agents: List[SpecialistAgent],
+                 decision_deadline: float = 2.0, cache: Optional[RoutingDecisionCache] = None):
+        self.rule_router = rule_router
+        self.agents = agents
+        self.decision_deadline = decision_deadline
+        self.cache = cache
+        self.fallback_count = 0
+        self.agent_batches = 0
+
+    async def make_routing_decision_async(self, patient: Patient, priority: Priority,
+                                          include_explanation: bool = True) -> Dict[str, Any]:
+        """Make a routing decision from aggregated specialist votes
+
+        Returns:
+            Dict in the same shape as RoutingService.make_routing_decision, plus
+            "routing_source" and "agent_votes"
+        """
+        decisions = await self.make_routing_decisions_batch_async([(patient, priority)], include_explanation)
+        return decisions[0]
+
+    async def make_routing_decisions_batch_async(self, requests: List[Tuple[Patient, Priority]],
+                                                 include_explanation: bool = True) -> List[Dict[str, Any]]:
+        """Route several patients with at most one batched call per agent
+
+        Agents only see the patient and priority, so identical signatures within the
+        batch are sent to the agents once, and signatures already cached for the
+        current resource state are not sent at all. Each request's cache key is taken
+        when its decision is applied, after the earlier decisions in the batch have
+        reserved their beds, so later patients never reuse a stale free-bed bucket.
+        """
+        hospital = self.rule_router.hospital
+        signatures = [routing_signature(patient, priority) for patient, priority in requests]
+
+        start_bucket = resource_state_bucket(hospital)
+        to_vote: Dict[RoutingSignature, Tuple[Patient, Priority]] = {}
+        for request, signature in zip(requests, signatures):
+            if self.cache is None or signature + (start_bucket,) not in self.cache:
+                to_vote.setdefault(signature, request)
+        outcomes = await self._vote_outcomes(to_vote, include_explanation)
+
+        decisions: List[Dict[str, Any]] = []
+        for (patient, priority), signature in zip(requests, signatures):
+            key = signature + (resource_state_bucket(hospital),)
+            outcome = self.cache.get(key) if self.cache is not None else None
+            source = "cache"
+            if outcome is None:
+                source = "agents"
+                if signature not in outcomes:
+                    # Cached when the batch started, but earlier decisions moved the resource state
+                    outcomes.update(await self._vote_outcomes({signature: (patient, priority)}, include_explanation))
+                outcome = outcomes[signature]
+                if outcome is not None and self.cache is not None:
+                    self.cache.put(key, outcome)
+            if outcome is None:
+                decisions.append(self._fallback(patient, priority, include_explanation))
+                continue
+            decision = self.rule_router.apply_routing_decision(
+                patient, priority, outcome.assign_doctor, outcome.assign_bed, outcome.routing_logic
+            )
+            decision["routing_source"] = source
+            decision["agent_votes"] = list(outcome.agent_votes)
+            decisions.append(decision)
+        return decisions
+
+    def make_routing_decision(self, patient: Patient, priority: Priority,
+                              include_explanation: bool = True) -> Dict[str, Any]:
+        """Synchronous wrapper, e.g. for the SimPy simulation"""
+        return _run_sync(self.make_routing_decision_async(patient, priority, include_explanation))
+
+    def make_routing_decisions_batch(self, requests: List[Tuple[Patient, Priority]],
+                                     include_explanation: bool = True) -> List[Dict[str, Any]]:
+        """Synchronous wrapper for make_routing_decisions_batch_async"""
+        return _run_sync(self.make_routing_decisions_batch_async(requests, include_explanation))
+
+    async def _vote_outcomes(self, requests: Dict[RoutingSignature, Tuple[Patient, Priority]],
+                             include_explanation: bool) -> Dict[RoutingSignature, Optional[CachedRoutingDecision]]:
+        """Aggregated agent decision per signature, or None where no agent voted in time"""
+        if not requests:
+            return {}
+        outcomes: Dict[RoutingSignature, Optional[CachedRoutingDecision]] = {}
+        votes_per_request = await self._collect_votes(list(requests.values()))
+        for signature, votes in zip(requests, votes_per_request):
+            if votes and any(vote.confidence > 0 for vote in votes):
+                outcomes[signature] = self._aggregate_votes(votes, include_explanation)
+            else:
+                outcomes[signature] = None
+        return outcomes
+
+    async def _collect_votes(self, batch: List[Tuple[Patient, Priority]]) -> List[List[RoutingVote]]:
+        """Send the batch to every agent concurrently
+
+        Returns the votes for each request. Agents that miss the deadline are cancelled
+        and failed agents are ignored; the votes of the agents that finished in time
+        still count, so the lists are only empty if none did.
+        """
+        self.agent_batches += 1
+        tasks = [asyncio.ensure_future(agent.vote_batch(batch)) for agent in self.agents]
+        votes_per_request: List[List[RoutingVote]] = [[] for _ in batch]
+        if not tasks:
+            return votes_per_request
+
+        done, pending = await asyncio.wait(tasks, timeout=self.decision_deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in tasks:
+            if task in done and task.exception() is None:
+                for request_votes, vote in zip(votes_per_request, task.result()):
+                    request_votes.append(vote)
+        return votes_per_request
+
+    def _aggregate_votes(self, votes: List[RoutingVote], include_explanation: bool) -> CachedRoutingDecision:
+        """Confidence-weighted majority over the non-abstaining votes"""
+        total_confidence = sum(vote.confidence for vote in votes)
+        doctor_weight = sum(vote.confidence for vote in votes if vote.assign_doctor)
+        bed_weight = sum(vote.confidence for vote in votes if vote.assign_bed)
+        assign_doctor = doctor_weight * 2 >= total_confidence
+        assign_bed = bed_weight * 2 > total_confidence
+
+        routing_logic = None
+        if include_explanation:
+            routing_logic = self._get_agent_explanation(votes, assign_doctor, assign_bed)
+        return CachedRoutingDecision(
+            assign_doctor=assign_doctor,
+            assign_bed=assign_bed,
+            routing_logic=routing_logic,
+            agent_votes=tuple(vote.agent_name for vote in votes if vote.confidence > 0)
+        )
+
+    def _fallback(self, patient: Patient, priority: Priority, include_explanation: bool) -> Dict[str, Any]:
+        """Use the rule-based routing decision"""
+        self.fallback_count += 1
+        decision = self.rule_router.make_routing_decision(patient, priority, include_explanation)
+        decision["routing_source"] = "rule_based_fallback"
+        decision["agent_votes"] = []
+        return decision
+
+    def _get_agent_explanation(self, votes: List[RoutingVote], assign_doctor: bool, assign_bed: bool) -> str:
+        """Generate human-readable explanation of the aggregated decision"""
+        explanations = [vote.rationale for vote in votes if vote.confidence > 0 and vote.rationale]
+        explanations.append(f"Agents recommend doctor: {'yes' if assign_doctor else 'no'}, "
+                            f"bed: {'yes' if assign_bed else 'no'}")
+        return "; ".join(explanations)
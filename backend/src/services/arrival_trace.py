@@ -0,0 +1,148 @@
+import csv
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+from ..entities.patient.patient import Patient
+from ..entities.patient.symptoms import Symptoms
+from ..enums.priority import Priority
+from .patient_factory import PatientFactory
+
+CHUNK_SIZE = 10000
+SYMPTOM_SEPARATOR = ";"
+
+# Trace fields and the log columns they are read from by default
+DEFAULT_COLUMNS: Dict[str, str] = {
+    "arrival_time": "arrival_time",  # ISO datetime, or minutes since the simulation start
+    "priority": "priority",          # Optional triage colour, e.g. "red"
+    "symptoms": "symptoms",          # Optional, separated by SYMPTOM_SEPARATOR
+    "name": "name",                  # Optional
+    "history": "history"             # Optional
+}
+
+
+@dataclass
+class TraceArrival:
+    """One recorded attendance: when the patient arrived and what is known about them"""
+    time: float  # Minutes since the simulation start
+    priority: Optional[Priority] = None
+    symptoms: List[str] = field(default_factory=list)
+    name: Optional[str] = None
+    history: Optional[str] = None
+
+    def to_patient(self, patient_factory: PatientFactory) -> Patient:
+        """Patient for this arrival; fields the log does not record come from ``patient_factory``
+
+        Triage still assigns the priority from the symptoms, so a recorded priority only
+        steers the symptoms generated for attendances logged without any.
+        """
+        patient = patient_factory.create_patient(None if self.symptoms else self.priority)
+        if self.symptoms:
+            patient.symptoms = Symptoms(list(self.symptoms))
+        if self.name:
+            patient.name = self.name
+        if self.history:
+            patient.history = self.history
+        return patient
+
+
+def _parse_time(value: Any) -> Union[datetime, float]:
+    if isinstance(value, (datetime, int, float)):
+        return value
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+def _minutes_between(start: datetime, time: datetime) -> float:
+    """Minutes from ``start`` to ``time``; both must be timezone-aware or both naive"""
+    if (start.tzinfo is None) != (time.tzinfo is None):
+        raise ValueError(f"Cannot compare {'naive' if time.tzinfo is None else 'timezone-aware'} arrival time "
+                         f"{time.isoformat()} with {'naive' if start.tzinfo is None else 'timezone-aware'} "
+                         f"start {start.isoformat()}; give both a UTC offset or neither")
+    return (time - start).total_seconds() / 60
+
+
+def _parse_priority(value: Any) -> Optional[Priority]:
+    text = str(value or "").strip().lower()
+    if not text:
+        return None
+    try:
+        return Priority(text)
+    except ValueError:
+        raise ValueError(f"Unknown priority {value!r}; expected one of {[p.value for p in Priority]}") from None
+
+
+class ArrivalTrace:
+    """Arrivals replayed from a local ED attendance log (CSV, or Parquet with pyarrow installed)
+
+    The log is read a row (CSV) or a record batch (Parquet) at a time while the
+    simulation advances, so a year of attendances never sits in memory at once.
+    Rows must be in arrival order. Arrival times are ISO datetimes, replayed
+    relative to ``start`` (default: the first arrival), or minutes since the
+    simulation start; rows before ``start`` are skipped. Datetimes with a UTC
+    offset (e.g. "Z") are compared across timezones, but cannot be mixed with
+    naive ones: that raises ValueError.
+    """
+
+    def __init__(self, path: str, start: Optional[datetime] = None,
+                 columns: Optional[Dict[str, str]] = None, chunk_size: int = CHUNK_SIZE):
+        if not os.path.exists(path):
+            raise ValueError(f"Arrival trace {path!r} does not exist")
+        self.path = path
+        self.columns = {**DEFAULT_COLUMNS, **(columns or {})}
+        self.chunk_size = chunk_size
+        self.is_parquet = path.endswith((".parquet", ".pq"))
+        self.start = start
+        if start is None:
+            first = next(self._rows(), None)
+            first_time = _parse_time(first[self.columns["arrival_time"]]) if first else None
+            self.start = first_time if isinstance(first_time, datetime) else None
+
+    def _rows(self) -> Iterator[Dict[str, Any]]:
+        if not self.is_parquet:
+            with open(self.path, 'r', newline='', encoding='utf-8') as f:
+                yield from csv.DictReader(f)
+            return
+
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(f"Reading Parquet arrival traces requires pyarrow: {e}") from e
+        parquet_file = pq.ParquetFile(self.path)
+        present = [column for column in self.columns.values() if column in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=present):
+            yield from batch.to_pylist()
+
+    def arrivals(self, start: Optional[datetime] = None) -> Iterator[TraceArrival]:
+        """Arrivals in log order; each call replays the log from the beginning
+
+        ``start`` overrides the trace's start, e.g. with the simulation's start time.
+        """
+        start = start or self.start
+        columns = self.columns
+        previous = 0.0
+        for row_number, row in enumerate(self._rows(), start=1):
+            value = row.get(columns["arrival_time"])
+            if value is None or value == "":
+                raise ValueError(f"Arrival trace row {row_number} has no {columns['arrival_time']!r}")
+            arrival_time = _parse_time(value)
+            if isinstance(arrival_time, datetime):
+                if start is None:
+                    raise ValueError("Arrival trace mixes datetimes with minute offsets")
+                minutes = _minutes_between(start, arrival_time)
+            else:
+                minutes = float(arrival_time)
+            if minutes < 0:
+                continue
+            if minutes < previous:
+                raise ValueError(f"Arrival trace row {row_number} is out of order ({minutes:.1f} < {previous:.1f} minutes)")
+            previous = minutes
+
+            symptoms = row.get(columns["symptoms"]) or ""
+            if isinstance(symptoms, str):
+                symptoms = [symptom.strip() for symptom in symptoms.split(SYMPTOM_SEPARATOR) if symptom.strip()]
+            yield TraceArrival(minutes, _parse_priority(row.get(columns["priority"])), list(symptoms),
+                               row.get(columns["name"]) or None, row.get(columns["history"]) or None)
@@ -0,0 +1,302 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..entities.patient.patient import Patient
+from ..entities.patient.symptoms import Symptoms
+from ..entities.triage.triage import FuzzyManchesterTriage
+from ..enums.priority import Priority
+from .patient_factory import PatientFactory
+
+CHUNK_SIZE = 1 << 20
+MAX_ENTRY_SIZE = 1 << 26  # Characters; a larger Bundle entry is taken to be malformed
+MAX_SYMPTOMS = 3
+
+# Condition text keywords mapped onto the triage symptom vocabulary, most specific first
+CONDITION_SYMPTOMS: List[Tuple[str, str]] = [
+    ("cardiac arrest", "cardiac arrest"), ("myocardial infarction", "chest pain"), ("angina", "chest pain"),
+    ("stroke", "stroke symptoms"), ("sepsis", "sepsis"), ("anaphylaxis", "anaphylaxis"),
+    ("seizure", "seizure"), ("gunshot", "severe bleeding"), ("hemorrhage", "severe bleeding"),
+    ("third degree burn", "severe burns"), ("second degree burn", "severe burns"), ("burn", "minor burn"),
+    ("fracture", "severe pain"), ("concussion", "severe headache"), ("pneumonia", "difficulty breathing"),
+    ("bronchitis", "cough"), ("covid", "cough"), ("appendicitis", "abdominal pain"),
+    ("gastroenteritis", "nausea"), ("migraine", "headache"), ("headache", "headache"),
+    ("vertigo", "dizziness"), ("dizziness", "dizziness"), ("dermatitis", "rash"), ("pharyngitis", "sore throat"),
+    ("sinusitis", "cold symptoms"), ("common cold", "cold symptoms"), ("otitis", "mild pain"),
+    ("sprain", "sprain"), ("laceration", "minor cut"), ("contusion", "bruise"), ("abrasion", "minor scrape"),
+    ("fatigue", "fatigue")
+]
+
+# Condition text keywords mapped onto the medical history vocabulary used by PatientFactory
+HISTORY_CONDITIONS: List[Tuple[str, str]] = [
+    ("diabetes", "diabetes"), ("hypertension", "hypertension"), ("coronary", "heart disease"),
+    ("heart failure", "heart disease"), ("atrial fibrillation", "heart disease"), ("asthma", "asthma"),
+    ("arthritis", "arthritis"), ("neoplasm", "cancer history"), ("carcinoma", "cancer history"),
+    ("cancer", "cancer history"), ("chronic pain", "chronic pain"), ("allergy", "allergies"),
+    ("depressi", "depression"), ("anxiety", "anxiety"), ("migraine", "migraine"), ("kidney disease", "kidney disease")
+]
+
+# LOINC codes of the vital signs read from Observations
+BODY_TEMPERATURE = "8310-5"
+PAIN_SEVERITY = "72514-3"
+OXYGEN_SATURATION = ("2708-6", "59408-5")
+RESPIRATORY_RATE = "9279-1"
+
+_ENTRY_ARRAY = re.compile(r'"entry"\s*:\s*\[')
+_SEPARATORS = " \t\r\n,"
+
+
+def _iter_bundle_entries(path: str, chunk_size: int = CHUNK_SIZE,
+                         max_entry_size: int = MAX_ENTRY_SIZE) -> Iterator[Dict[str, Any]]:
+    """Resources of a Bundle JSON file, decoded one entry at a time from a rolling buffer
+
+    Only the current entry is held in memory, so bundles larger than RAM can be read.
+    An entry that still does not decode once ``max_entry_size`` characters of it are
+    buffered, or at the end of the file, raises ValueError with its character offset.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        read = 0  # Characters read so far; the buffer always holds the last of them
+        while True:  # Find the entry array
+            chunk = f.read(chunk_size)
+            read += len(chunk)
+            if not chunk:
+                return
+            buffer += chunk
+            match = _ENTRY_ARRAY.search(buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            buffer = buffer[-32:]  # The key may straddle two chunks
+
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _SEPARATORS:
+                position += 1
+            if position == len(buffer):
+                chunk = f.read(chunk_size)
+                read += len(chunk)
+                if not chunk:
+                    return
+                buffer, position = chunk, 0
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                entry, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                # The entry continues in the next chunk, unless it is malformed
+                offset = read - len(buffer) + position
+                if len(buffer) - position >= max_entry_size:
+                    raise ValueError(f"{path}: Bundle entry at character {offset} is malformed or larger "
+                                     f"than {max_entry_size} characters") from error
+                chunk = f.read(chunk_size)
+                read += len(chunk)
+                if not chunk:
+                    raise ValueError(f"{path}: malformed Bundle entry at character {offset}: {error.msg}") from error
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            yield entry.get("resource", {})
+            if position > chunk_size:
+                buffer, position = buffer[position:], 0
+
+
+def iter_fhir_resources(path: str) -> Iterator[Dict[str, Any]]:
+    """FHIR resources from a Bundle (.json), an NDJSON export (.ndjson) or a directory of either"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith((".json", ".ndjson")):
+                yield from iter_fhir_resources(os.path.join(path, name))
+        return
+    if path.endswith(".ndjson"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    resource = json.loads(line)
+                    if resource.get("resourceType") == "Bundle":
+                        yield from (entry.get("resource", {}) for entry in resource.get("entry", []))
+                    else:
+                        yield resource
+        return
+    yield from _iter_bundle_entries(path)
+
+
+@dataclass
+class CohortPatient:
+    """What the simulation needs of a FHIR patient: a name, presenting symptoms and history"""
+    name: str
+    symptoms: List[str]
+    history: str
+
+    def to_patient(self, patient_id: int) -> Patient:
+        return Patient(id=patient_id, name=self.name, symptoms=Symptoms(list(self.symptoms)), history=self.history)
+
+
+@dataclass
+class _PatientAccumulator:
+    name: str = "Unknown Patient"
+    conditions: List[Tuple[str, str]] = field(default_factory=list)  # (onset, symptom)
+    history: List[str] = field(default_factory=list)
+    vitals: Dict[str, Tuple[str, float]] = field(default_factory=dict)  # LOINC -> (effective time, value)
+
+
+def _subject_id(resource: Dict[str, Any]) -> Optional[str]:
+    reference = resource.get("subject", {}).get("reference", "")
+    return reference.rsplit(":", 1)[-1].rsplit("/", 1)[-1] or None
+
+
+def _concept_text(concept: Dict[str, Any]) -> str:
+    texts = [concept.get("text", "")] + [coding.get("display", "") for coding in concept.get("coding", [])]
+    return " ".join(text for text in texts if text).lower()
+
+
+def _patient_name(resource: Dict[str, Any]) -> str:
+    for name in resource.get("name", []):
+        given = " ".join(name.get("given", [])[:1])
+        # Synthea appends digits to generated names (e.g. "Jane123 Doe456")
+        full_name = re.sub(r"\d+", "", f"{given} {name.get('family', '')}").strip()
+        if full_name:
+            return full_name
+    return "Unknown Patient"
+
+
+def _vital_symptoms(vitals: Dict[str, Tuple[str, float]]) -> List[str]:
+    """Symptoms implied by the latest vital signs"""
+    symptoms: List[str] = []
+    temperature = vitals.get(BODY_TEMPERATURE)
+    if temperature and temperature[1] >= 39.0:
+        symptoms.append("high fever")
+    elif temperature and temperature[1] >= 37.8:
+        symptoms.append("fever")
+    pain = vitals.get(PAIN_SEVERITY)
+    if pain and pain[1] >= 8:
+        symptoms.append("severe pain")
+    elif pain and pain[1] >= 5:
+        symptoms.append("moderate pain")
+    saturation = [vitals[code][1] for code in OXYGEN_SATURATION if code in vitals]
+    respiratory_rate = vitals.get(RESPIRATORY_RATE)
+    if (saturation and min(saturation) < 92) or (respiratory_rate and respiratory_rate[1] > 24):
+        symptoms.append("difficulty breathing")
+    return symptoms
+
+
+def parse_fhir_cohort(sources: Sequence[str]) -> List[CohortPatient]:
+    """Stream FHIR resources and reduce each patient to a CohortPatient
+
+    Symptoms come from the most recently started conditions that map onto the triage
+    vocabulary plus the latest vital signs; history from chronic conditions. Patient,
+    Condition and Observation resources may be spread over any number of files.
+    """
+    patients: Dict[str, _PatientAccumulator] = {}
+    for source in sources:
+        for resource in iter_fhir_resources(source):
+            resource_type = resource.get("resourceType")
+            if resource_type == "Patient":
+                patients.setdefault(resource.get("id", ""), _PatientAccumulator()).name = _patient_name(resource)
+                continue
+            if resource_type not in ("Condition", "Observation"):
+                continue
+            subject = _subject_id(resource)
+            if subject is None:
+                continue
+            patient = patients.setdefault(subject, _PatientAccumulator())
+
+            if resource_type == "Condition":
+                text = _concept_text(resource.get("code", {}))
+                symptom = next((symptom for keyword, symptom in CONDITION_SYMPTOMS if keyword in text), None)
+                if symptom:
+                    patient.conditions.append((resource.get("onsetDateTime", ""), symptom))
+                condition = next((condition for keyword, condition in HISTORY_CONDITIONS if keyword in text), None)
+                if condition and condition not in patient.history:
+                    patient.history.append(condition)
+            else:
+                value = resource.get("valueQuantity", {}).get("value")
+                effective = resource.get("effectiveDateTime", "")
+                for coding in resource.get("code", {}).get("coding", []):
+                    code = coding.get("code")
+                    if value is not None and code and effective >= patient.vitals.get(code, ("", 0.0))[0]:
+                        patient.vitals[code] = (effective, float(value))
+
+    cohort: List[CohortPatient] = []
+    for patient in patients.values():
+        symptoms = _vital_symptoms(patient.vitals)
+        for _, symptom in sorted(patient.conditions, reverse=True):
+            if len(symptoms) >= MAX_SYMPTOMS:
+                break
+            if symptom not in symptoms:
+                symptoms.append(symptom)
+        history = (f"Patient has history of {', '.join(patient.history)}. " if patient.history
+                   else "No significant medical history.")
+        cohort.append(CohortPatient(patient.name, symptoms[:MAX_SYMPTOMS], history))
+    return cohort
+
+
+def _source_signature(sources: Sequence[str]) -> List[List[Any]]:
+    """Path, size and modification time of every source file, to detect a stale cache"""
+    signature: List[List[Any]] = []
+    for source in sources:
+        paths = ([os.path.join(source, name) for name in sorted(os.listdir(source))
+                  if name.endswith((".json", ".ndjson"))] if os.path.isdir(source) else [source])
+        for path in paths:
+            stat = os.stat(path)
+            signature.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def load_fhir_cohort(sources: Sequence[str], cache_file: Optional[str] = None) -> List[CohortPatient]:
+    """Parse a FHIR cohort, or load it from ``cache_file`` if the sources are unchanged since it was written"""
+    signature = _source_signature(sources)
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+        if cached.get("sources") == signature:
+            return [CohortPatient(*patient) for patient in cached["patients"]]
+
+    cohort = parse_fhir_cohort(sources)
+    if cache_file:
+        with open(cache_file, 'w') as f:
+            json.dump({"sources": signature,
+                       "patients": [[patient.name, patient.symptoms, patient.history] for patient in cohort]}, f)
+    return cohort
+
+
+class FHIRCohortFactory(PatientFactory):
+    """Patient factory that draws arriving patients from a FHIR cohort instead of Faker
+
+    Patients are handed out in a seeded random order; once every patient has arrived
+    the cohort is reshuffled and reused. A ``target_priority`` (e.g. recorded in an
+    arrival trace) restricts the draw to cohort patients that triage to it.
+    """
+
+    def __init__(self, cohort: Sequence[CohortPatient], seed: Optional[int] = None) -> None:
+        if not cohort:
+            raise ValueError("FHIR cohort is empty")
+        super().__init__(seed)
+        self.cohort = list(cohort)
+        self._by_priority: Optional[Dict[Priority, List[int]]] = None  # Triaged on first use
+        self._orders: Dict[Optional[Priority], List[int]] = {}
+
+    def _candidates(self, target_priority: Optional[Priority]) -> List[int]:
+        """Cohort indexes a patient of ``target_priority`` (any priority if None) can be drawn from"""
+        if target_priority is None:
+            return list(range(len(self.cohort)))
+        if self._by_priority is None:
+            triage = FuzzyManchesterTriage()
+            self._by_priority = {}
+            for index, patient in enumerate(self.cohort):
+                priority = triage.determine_priority(patient.to_patient(index))
+                self._by_priority.setdefault(priority, []).append(index)
+        candidates = self._by_priority.get(target_priority)
+        if not candidates:
+            raise ValueError(f"FHIR cohort has no patient that triages to {target_priority.value}")
+        return list(candidates)
+
+    def create_patient(self, target_priority: Optional[Priority] = None) -> Patient:
+        """Next cohort patient, triaging to ``target_priority`` if given"""
+        order = self._orders.get(target_priority)
+        if not order:
+            order = self._orders[target_priority] = self._candidates(target_priority)
+            self.random.shuffle(order)
+        return self.cohort[order.pop()].to_patient(self.next_patient_id())
@@ -4,6 +4,7 @@ from ..entities.doctor.doctor import Doctor
 from ..entities.equipment.bed.bed import Bed
 from ..entities.equipment.MRI.MRI import MRI
 from ..entities.equipment.ultrasonic.ultrasonic import Ultrasonic
+from ..enums.bed_type import BedType
 
 class HospitalFactory:
     @staticmethod
@@ -20,9 +21,11 @@ class HospitalFactory:
         for i in range(num_doctors):
             hospital.add_doctor(doctors[i])
 
-        # Add beds
+        # Add beds: one ICU and one HDU bed, the rest on general wards
+        bed_types = [BedType.ICU, BedType.HDU]
         for i in range(num_beds):
-            hospital.add_bed(Bed(id=201 + i, name=f"Bed-{i+1}"))
+            bed_type = bed_types[i] if i < len(bed_types) else BedType.WARD
+            hospital.add_bed(Bed(id=201 + i, name=f"Bed-{i+1}", bed_type=bed_type))
 
         # Add MRI machines
         for i in range(num_mri):
@@ -51,9 +54,9 @@ class HospitalFactory:
 
         # Add beds
         beds = [
-            Bed(id=201, name="ICU-1"),
-            Bed(id=202, name="Ward-A1"),
-            Bed(id=203, name="Ward-A2")
+            Bed(id=201, name="ICU-1", bed_type=BedType.ICU),
+            Bed(id=202, name="Ward-A1", bed_type=BedType.WARD),
+            Bed(id=203, name="Ward-A2", bed_type=BedType.WARD)
         ]
 
         for bed in beds:
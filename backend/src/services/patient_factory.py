@@ -8,8 +8,13 @@ from ..enums.priority import Priority
 class PatientFactory:
     """Factory service for generating realistic patient data using Faker"""
     
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = None) -> None:
         self.fake: Faker = Faker()
+        # Private RNGs so a seeded factory is reproducible regardless of other random users
+        self.random: random.Random = random.Random(seed)
+        if seed is not None:
+            self.fake.seed_instance(seed)
+        self._next_patient_id = 1  # Sequential, so a factory never hands out the same id twice
         
         # Predefined symptom categories for realistic generation
         self.critical_symptoms = [
@@ -47,15 +52,15 @@ class PatientFactory:
     def generate_symptoms_by_priority(self, target_priority: Priority) -> List[str]:
         """Generate symptoms that would likely result in the target priority"""
         if target_priority == Priority.RED:
-            return random.sample(self.critical_symptoms, random.randint(1, 2))
+            return self.random.sample(self.critical_symptoms, self.random.randint(1, 2))
         elif target_priority == Priority.ORANGE:
-            return random.sample(self.very_urgent_symptoms, random.randint(1, 3))
+            return self.random.sample(self.very_urgent_symptoms, self.random.randint(1, 3))
         elif target_priority == Priority.YELLOW:
-            return random.sample(self.urgent_symptoms, random.randint(1, 2))
+            return self.random.sample(self.urgent_symptoms, self.random.randint(1, 2))
         elif target_priority == Priority.GREEN:
-            return random.sample(self.standard_symptoms, random.randint(1, 2))
+            return self.random.sample(self.standard_symptoms, self.random.randint(1, 2))
         else:  # BLUE
-            return random.sample(self.non_urgent_symptoms, random.randint(1, 2))
+            return self.random.sample(self.non_urgent_symptoms, self.random.randint(1, 2))
     
     def generate_random_symptoms(self) -> List[str]:
         """Generate random symptoms from any category"""
@@ -63,15 +68,21 @@ class PatientFactory:
             self.critical_symptoms + self.very_urgent_symptoms + 
             self.urgent_symptoms + self.standard_symptoms + self.non_urgent_symptoms
         )
-        return random.sample(all_symptoms, random.randint(1, 3))
+        return self.random.sample(all_symptoms, self.random.randint(1, 3))
     
     def generate_medical_history(self) -> str:
         """Generate realistic medical history"""
-        if random.choice([True, False]):  # 50% chance of having medical history
-            conditions = random.sample(self.medical_conditions, random.randint(1, 3))
+        if self.random.choice([True, False]):  # 50% chance of having medical history
+            conditions = self.random.sample(self.medical_conditions, self.random.randint(1, 3))
             return f"Patient has history of {', '.join(conditions)}. "
         return "No significant medical history."
     
+    def next_patient_id(self) -> int:
+        """Next unused patient id of this factory"""
+        patient_id = self._next_patient_id
+        self._next_patient_id += 1
+        return patient_id
+
     def create_patient(self, target_priority: Optional[Priority] = None) -> Patient:
         """Create a single patient with optional target priority"""
         # Generate basic patient info - use first_name + last_name to avoid titles like "Dr."
@@ -89,7 +100,7 @@ class PatientFactory:
         history: str = self.generate_medical_history()
         
         return Patient(
-            id=random.randint(1000, 9999),
+            id=self.next_patient_id(),
             name=name,
             symptoms=symptoms,
             history=history
@@ -117,7 +128,7 @@ class PatientFactory:
         priorities: List[Priority] = [Priority.RED, Priority.ORANGE, Priority.YELLOW, Priority.GREEN, Priority.BLUE]
         
         for _ in range(count):
-            priority: Priority = random.choice(priorities)
+            priority: Priority = self.random.choice(priorities)
             patients.append(self.create_patient(priority))
         
         return patients
@@ -134,5 +145,5 @@ class PatientFactory:
         patients.extend(self.create_patients(blue, Priority.BLUE))
         
         # Shuffle to randomize order
-        random.shuffle(patients)
+        self.random.shuffle(patients)
         return patients
\ No newline at end of file
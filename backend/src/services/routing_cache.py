@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Any
+from ..entities.hospital.hospital import Hospital
+from ..entities.patient.patient import Patient
+from ..enums.priority import Priority
+
+RoutingSignature = Tuple[str, Tuple[str, ...]]
+RoutingKey = Tuple[str, Tuple[str, ...], Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class CachedRoutingDecision:
+    """What a patient needs, without the concrete resources chosen for them"""
+    assign_doctor: bool
+    assign_bed: bool
+    routing_logic: Optional[str]
+    agent_votes: Tuple[str, ...]
+
+
+def _capacity_bucket(count: int) -> int:
+    """Coarse level of a count: none, few (1-2) or many (3+)"""
+    if count == 0:
+        return 0
+    return 1 if count <= 2 else 2
+
+
+def routing_signature(patient: Patient, priority: Priority) -> RoutingSignature:
+    """The part of a routing request the agents see: priority and normalised symptom codes"""
+    symptom_codes = tuple(sorted({symptom.lower().strip() for symptom in patient.symptoms.symptoms}))
+    return priority.value, symptom_codes
+
+
+def resource_state_bucket(hospital: Hospital) -> Tuple[int, int]:
+    """Capacity buckets of the shortest available doctor queue and the number of free beds
+
+    Both come from the managers' indexes, so this is O(1) however big the hospital is.
+    """
+    least_loaded = hospital.get_least_loaded_doctor()
+    shortest_queue = least_loaded.get_total_patients_in_queue() if least_loaded is not None else 0
+    return _capacity_bucket(shortest_queue), _capacity_bucket(hospital.bed_manager.count_available_beds())
+
+
+def canonical_routing_key(patient: Patient, priority: Priority, hospital: Hospital) -> RoutingKey:
+    """Canonical signature of a routing request: priority, symptom codes and resource-state bucket
+
+    Symptoms are normalised and sorted so the same presentation in a different order
+    or casing shares a cache entry. The resource state is what changes during a run:
+    the shortest doctor queue and the number of free beds, so cached decisions are
+    not reused once doctors get busy or beds fill up.
+    """
+    return routing_signature(patient, priority) + (resource_state_bucket(hospital),)
+
+
+class RoutingDecisionCache:
+    """LRU cache of agent routing decisions keyed by canonical_routing_key"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[RoutingKey, CachedRoutingDecision]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: RoutingKey) -> Optional[CachedRoutingDecision]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: RoutingKey, decision: CachedRoutingDecision) -> None:
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key: RoutingKey) -> bool:
+        """Membership test that leaves the LRU order and statistics untouched"""
+        return key in self._entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
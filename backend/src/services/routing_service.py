@@ -1,48 +1,114 @@
-from typing import List, Optional, Tuple, Dict, Any
+import time
+from collections import Counter, deque
+from typing import Deque, List, Optional, Tuple, Dict, Any
 from ..entities.patient.patient import Patient
 from ..entities.doctor.doctor import Doctor
 from ..entities.equipment.bed.bed import Bed
 from ..entities.hospital.hospital import Hospital
 from ..enums.priority import Priority
+from ..enums.bed_type import BedType
+from ..enums.decision_retention import DecisionRetention
+from ..monitoring.engine_metrics import LatencyHistogram
 
 
 class RoutingService:
     """Centralized routing service for managing all patient routing decisions and resource assignments"""
 
-    def __init__(self, hospital: Hospital):
+    def __init__(self, hospital: Hospital, retention: DecisionRetention = DecisionRetention.FULL,
+                 max_retained_decisions: int = 1000):
         self.hospital = hospital
-        self.routing_decisions: List[Dict[str, Any]] = []
-
-    def make_routing_decision(self, patient: Patient, priority: Priority) -> Dict[str, Any]:
+        self.retention = retention
+        # FULL keeps everything, BOUNDED is a ring buffer, AGGREGATE keeps no decision dicts
+        maxlen = {
+            DecisionRetention.FULL: None,
+            DecisionRetention.BOUNDED: max_retained_decisions,
+            DecisionRetention.AGGREGATE: 0
+        }[retention]
+        self.routing_decisions: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self.decision_counts: Counter[Tuple[str, str]] = Counter()
+        # Optional latency instrumentation for make_routing_decision
+        self.latency_histogram: Optional[LatencyHistogram] = None
+
+    def make_routing_decision(self, patient: Patient, priority: Priority,
+                              include_explanation: bool = True) -> Dict[str, Any]:
         """Make comprehensive routing decision for a patient
 
+        Args:
+            include_explanation: Build the human-readable "routing_logic" string.
+                Skip it when nothing will read the explanation.
+
         Returns:
             Dict containing routing decisions and assignments
         """
+        if self.latency_histogram is None:
+            return self._make_routing_decision(patient, priority, include_explanation)
+        started = time.perf_counter()
+        decision = self._make_routing_decision(patient, priority, include_explanation)
+        self.latency_histogram.observe(time.perf_counter() - started)
+        return decision
+
+    def _make_routing_decision(self, patient: Patient, priority: Priority,
+                               include_explanation: bool) -> Dict[str, Any]:
         # Basic routing decisions
         should_assign_doctor = self._should_assign_to_doctor(patient, priority)
         should_assign_bed = self._should_assign_urgent_bed(patient, priority)
 
+        routing_logic = None
+        if include_explanation:
+            routing_logic = self._get_routing_explanation(patient, priority, should_assign_doctor, should_assign_bed)
+
+        return self.apply_routing_decision(patient, priority, should_assign_doctor, should_assign_bed, routing_logic)
+
+    def apply_routing_decision(self, patient: Patient, priority: Priority, assign_doctor: bool,
+                               assign_bed: bool, routing_logic: Optional[str] = None) -> Dict[str, Any]:
+        """Select resources for an already-made routing decision and record it
+
+        Used by make_routing_decision and by alternative routers (e.g. agent-based)
+        that decide what a patient needs but share the resource selection logic.
+        """
         # Resource assignments
         assigned_doctor = None
         assigned_bed = None
 
-        if should_assign_doctor:
+        if assign_doctor:
             assigned_doctor = self._select_optimal_doctor(patient, priority)
 
-        if should_assign_bed:
+        if assign_bed:
             assigned_bed = self._select_optimal_bed(patient, priority)
+            if assigned_bed:
+                # Reserve the bed now so patients routed during this one's consultation get another
+                self.hospital.bed_manager.occupy_bed(assigned_bed)
 
-        decision = {
-            "assign_doctor": should_assign_doctor,
-            "assign_bed": should_assign_bed,
+        decision: Dict[str, Any] = {
+            "assign_doctor": assign_doctor,
+            "assign_bed": assign_bed,
             "assigned_doctor": assigned_doctor,
-            "assigned_bed": assigned_bed,
-            "routing_logic": self._get_routing_explanation(patient, priority, should_assign_doctor, should_assign_bed)
+            "assigned_bed": assigned_bed
         }
+        if routing_logic is not None:
+            decision["routing_logic"] = routing_logic
+
+        self._record_decision(priority, assigned_doctor, assigned_bed)
         self.routing_decisions.append(decision)
         return decision
 
+    def _record_decision(self, priority: Priority, assigned_doctor: Optional[Doctor],
+                         assigned_bed: Optional[Bed]) -> None:
+        """Update aggregate decision counters by priority and resource type"""
+        if assigned_doctor:
+            self.decision_counts[(priority.value, "doctor")] += 1
+        if assigned_bed:
+            self.decision_counts[(priority.value, "bed")] += 1
+        if not assigned_doctor and not assigned_bed:
+            self.decision_counts[(priority.value, "unassigned")] += 1
+
+    def get_decision_summary(self) -> Dict[str, Dict[str, int]]:
+        """Get decision counts grouped by priority, then by resource type"""
+        summary: Dict[str, Dict[str, int]] = {priority.value: {} for priority in Priority.get_priority_order()}
+        for (priority_value, resource_type), count in self.decision_counts.items():
+            summary[priority_value][resource_type] = count
+        return summary
+
     def _should_assign_to_doctor(self, patient: Patient, priority: Priority) -> bool:
         """Determine if patient should be assigned to doctor"""
         # All patients need doctor consultation
@@ -61,37 +127,23 @@ class RoutingService:
         2. Queue length (load balancing)
         3. Priority-based specialization (future enhancement)
         """
-        available_doctors = self.hospital.get_available_doctors()
-
-        if not available_doctors:
-            return None
-
-        # For now, use simple load balancing - choose doctor with least patients
-        optimal_doctor = min(available_doctors, key=lambda d: d.get_total_patients_in_queue())
-
-        return optimal_doctor
+        # For now, use simple load balancing - choose doctor with least patients,
+        # kept ordered by the doctor manager as queues change
+        return self.hospital.get_least_loaded_doctor()
 
     def _select_optimal_bed(self, patient: Patient, priority: Priority) -> Optional[Bed]:
-        """Select the best available bed for the patient
+        """Select the best free bed for the patient, or None if every bed is occupied
 
-        Selection criteria:
-        1. Bed availability
-        2. Priority-based bed type (ICU for critical patients)
-        3. Bed capacity
+        Critical patients (RED) prefer ICU beds, then HDU, then a general ward; everyone
+        else prefers a general ward, so critical care beds stay free as long as possible.
         """
-        available_beds = self.hospital.get_available_beds()
-
-        if not available_beds:
-            return None
-
-        # For critical patients (RED), prefer ICU beds
-        if priority == Priority.RED:
-            icu_beds = [bed for bed in available_beds if "ICU" in bed.name]
-            if icu_beds:
-                return icu_beds[0]
-
-        # Otherwise, return first available bed
-        return available_beds[0]
+        preference = ((BedType.ICU, BedType.HDU, BedType.WARD) if priority == Priority.RED
+                      else (BedType.WARD, BedType.HDU, BedType.ICU))
+        for bed_type in preference:
+            bed = self.hospital.get_first_available_bed(bed_type)
+            if bed:
+                return bed
+        return None
 
     def assign_patient_to_doctor(self, patient: Patient, doctor: Doctor, priority: Priority) -> Dict[str, Any]:
         """Assign patient to doctor and manage queue
@@ -121,12 +173,17 @@ class RoutingService:
 
         bed_info = {
             "bed_name": bed.name,
-            "bed_type": "ICU" if "ICU" in bed.name else "Ward",
+            "bed_type": bed.bed_type.value,
             "priority": priority.value
         }
 
         return bed_info
 
+    def release_patient_from_bed(self, patient: Patient, bed: Bed) -> None:
+        """Take the patient out of the bed and return the bed to its free-list"""
+        bed.remove_patient_from_queue(patient)
+        self.hospital.bed_manager.release_bed(bed)
+
     def calculate_wait_time(self, priority: Priority, doctor: Doctor) -> float:
         """Calculate expected wait time for patient based on priority and doctor queue"""
         base_wait_times = {
@@ -189,7 +246,7 @@ class RoutingService:
 
         doctor_stats = {
             "total_doctors": len(doctors),
-            "available_doctors": len(self.hospital.get_available_doctors()),
+            "available_doctors": self.hospital.doctor_manager.count_available_doctors(),
             "doctor_utilization": {}
         }
 
@@ -201,7 +258,7 @@ class RoutingService:
 
         bed_stats = {
             "total_beds": len(beds),
-            "available_beds": len(self.hospital.get_available_beds()),
+            "available_beds": self.hospital.bed_manager.count_available_beds(),
             "bed_utilization": {}
         }
 
@@ -0,0 +1,371 @@
+import asyncio
+import contextlib
+import io
+import itertools
+import multiprocessing
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ..enums.simulation_engine import SimulationEngine
+from ..monitoring.engine_metrics import EngineMetrics, estimate_size, merge_snapshots, render_prometheus
+from ..monitoring.kpi_accumulators import SimulationKPIs
+from .hospital_factory import HospitalFactory
+
+# Messages sent from replication workers back to the API process
+EVENTS_MESSAGE = "events"
+METRICS_MESSAGE = "metrics"
+DONE_MESSAGE = "done"
+FAILED_MESSAGE = "failed"
+
+# Streaming messages kept per job; slow or late clients skip what has been dropped
+MAX_JOB_MESSAGES = 1000
+# Seconds to wait for messages still in transit once every worker of a job has exited
+DRAIN_TIMEOUT = 1.0
+
+
+def _build_hospital(hospital_config: Dict[str, Any]):
+    if hospital_config.get("sample", True):
+        return HospitalFactory.create_sample_hospital()
+    return HospitalFactory.create_hospital(
+        name=hospital_config.get("name", "City General Hospital"),
+        num_doctors=hospital_config.get("num_doctors", 4),
+        num_beds=hospital_config.get("num_beds", 5),
+        num_mri=hospital_config.get("num_mri", 2),
+        num_ultrasonic=hospital_config.get("num_ultrasonic", 2)
+    )
+
+
+def _summarize_events(events: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+    """Fold a batch of events into running replication KPIs"""
+    for event in events:
+        summary["total_events"] += 1
+        if event["event_type"] == "PATIENT_ARRIVAL":
+            summary["arrivals"] += 1
+        elif event["event_type"] == "PATIENT_DISCHARGE":
+            summary["discharges"] += 1
+            summary["total_time_in_hospital"] += event["details"]["total_time_in_hospital"]
+    discharges = summary["discharges"]
+    summary["mean_time_in_hospital"] = summary["total_time_in_hospital"] / discharges if discharges else 0.0
+
+
+def run_simulation_replication(job_id: str, config: Dict[str, Any], replication: int, seed: Optional[int],
+                               message_queue: Any, chunk_minutes: int = 60) -> Dict[str, Any]:
+    """Run one replication in a worker process, streaming events back in chunks
+
+    Runs with retain_events=False so the worker holds at most one chunk of events.
+    KPIs are accumulated online, so with stream_events disabled only the compact
+    summary is sent back. Messages are tagged with ``job_id``, as every job shares
+    one message queue.
+    """
+    # Imported here so the API process does not need SimPy loaded to accept jobs
+    from ..simulation.simulation import HospitalSimulation
+
+    summary: Dict[str, Any] = {
+        "replication": replication,
+        "seed": seed,
+        "total_events": 0,
+        "arrivals": 0,
+        "discharges": 0,
+        "total_time_in_hospital": 0.0,
+        "mean_time_in_hospital": 0.0
+    }
+    try:
+        # The simulation logs every event to stdout; keep worker output quiet
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation = HospitalSimulation(
+                _build_hospital(config["hospital"]),
+                config["horizon_minutes"],
+                engine=SimulationEngine(config["engine"]),
+                seed=seed,
+                retain_events=False,
+                metrics=EngineMetrics(),
+                kpis=SimulationKPIs()
+            )
+            for until in range(chunk_minutes, config["horizon_minutes"] + chunk_minutes, chunk_minutes):
+                events = simulation.run_until(until)
+                if events:
+                    _summarize_events(events, summary)
+                    if config.get("stream_events", True):
+                        message_queue.put((job_id, EVENTS_MESSAGE, replication, events))
+                message_queue.put((job_id, METRICS_MESSAGE, replication, simulation.get_metrics_snapshot()))
+    except Exception as error:
+        message_queue.put((job_id, FAILED_MESSAGE, replication, repr(error)))
+        raise
+    summary["online_kpis"] = simulation.get_kpi_summary()
+    message_queue.put((job_id, DONE_MESSAGE, replication, summary))
+    return summary
+
+
+@dataclass
+class SimulationJob:
+    """State of a submitted simulation job, shared by the status and streaming endpoints"""
+    job_id: str
+    config: Dict[str, Any]
+    status: str = "queued"
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    replications_completed: int = 0
+    replications_failed: int = 0
+    kpis: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    event_count: int = 0
+    # Latest {"type": ..., "data": ...} messages for streaming clients; message_count
+    # counts every message published, so cursors stay valid as old ones are dropped
+    messages: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_JOB_MESSAGES))
+    message_count: int = 0
+    # Events and estimated bytes held in ``messages``, for the event store gauges
+    retained_events: int = 0
+    retained_bytes: int = 0
+    _message_sizes: Deque[Tuple[int, int]] = field(default_factory=lambda: deque(maxlen=MAX_JOB_MESSAGES), repr=False)
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def publish(self, message_type: str, data: Any) -> None:
+        message = {"type": message_type, "data": data}
+        if len(self._message_sizes) == self._message_sizes.maxlen:  # The oldest message is about to be dropped
+            dropped_events, dropped_bytes = self._message_sizes[0]
+            self.retained_events -= dropped_events
+            self.retained_bytes -= dropped_bytes
+        size = (len(data["events"]) if message_type == "events" else 0, estimate_size(message))
+        self._message_sizes.append(size)
+        self.retained_events += size[0]
+        self.retained_bytes += size[1]
+        self.messages.append(message)
+        self.message_count += 1
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def messages_since(self, cursor: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Sequence number of the first message at or after ``cursor`` still kept, and the messages from it on"""
+        first_kept = self.message_count - len(self.messages)
+        start = max(cursor, first_kept)
+        return start, list(itertools.islice(self.messages, start - first_kept, None))
+
+    async def wait_for_update(self, timeout: float) -> None:
+        """Wait until a new message is published or ``timeout`` seconds pass"""
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._updated.wait(), timeout)
+
+    def to_status(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "config": self.config,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "replications_total": self.config["replications"],
+            "replications_completed": self.replications_completed,
+            "replications_failed": self.replications_failed,
+            "event_count": self.event_count,
+            "kpis": self.kpis,
+            "errors": self.errors
+        }
+
+
+class SimulationJobManager:
+    """Runs simulation jobs on a bounded process pool so the event loop never blocks
+
+    Replications from all jobs share ``max_workers`` processes; at most
+    ``max_active_jobs`` jobs may be queued or running at once. Workers send their
+    messages to one shared queue, which a single reader thread hands to the jobs'
+    asyncio queues. Finished jobs are forgotten ``finished_job_ttl`` seconds after
+    they finish, and a pool broken by a crashed worker is replaced.
+    """
+
+    def __init__(self, max_workers: int = 2, max_active_jobs: int = 8, finished_job_ttl: float = 3600.0):
+        self.max_workers = max_workers
+        self.max_active_jobs = max_active_jobs
+        self.finished_job_ttl = finished_job_ttl
+        self.jobs: Dict[str, SimulationJob] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue_manager: Optional[Any] = None
+        self._message_queue: Optional[Any] = None
+        self._job_queues: Dict[str, "asyncio.Queue[Tuple[str, int, Any]]"] = {}
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        # Engine metrics: latest snapshot of each running replication, plus a
+        # merged snapshot of every finished replication
+        self._live_metrics: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._finished_metrics: Dict[str, Any] = EngineMetrics().snapshot()
+
+    def _ensure_pool(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+        if self._queue_manager is None:
+            self._queue_manager = self._context.Manager()
+            self._message_queue = self._queue_manager.Queue()
+            threading.Thread(target=self._read_messages, args=(self._message_queue, asyncio.get_running_loop()),
+                             name="simulation-job-messages", daemon=True).start()
+
+    def _reset_pool(self) -> None:
+        """Drop a pool broken by a crashed worker; the next job starts a fresh one"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _read_messages(self, message_queue: Any, loop: asyncio.AbstractEventLoop) -> None:
+        """Reader thread: block on the shared worker queue and hand messages to the event loop"""
+        while True:
+            try:
+                message = message_queue.get()
+            except (EOFError, OSError):
+                return  # The queue manager was shut down
+            if message is None:
+                return
+            loop.call_soon_threadsafe(self._dispatch_message, message)
+
+    def _dispatch_message(self, message: Tuple[Any, ...]) -> None:
+        job_id, kind, replication, payload = message
+        job_queue = self._job_queues.get(job_id)
+        if job_queue is not None:
+            job_queue.put_nowait((kind, replication, payload))
+
+    def _expire_jobs(self) -> None:
+        """Forget jobs that finished more than ``finished_job_ttl`` seconds ago"""
+        cutoff = datetime.now() - timedelta(seconds=self.finished_job_ttl)
+        for job_id in [job_id for job_id, job in self.jobs.items()
+                       if job.finished_at is not None and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+            self._tasks.pop(job_id, None)
+
+    def active_job_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.is_finished)
+
+    def list_jobs(self) -> List[SimulationJob]:
+        self._expire_jobs()
+        return list(self.jobs.values())
+
+    def submit(self, config: Dict[str, Any]) -> SimulationJob:
+        """Queue a job; raises RuntimeError if too many jobs are already active"""
+        self._expire_jobs()
+        if self.active_job_count() >= self.max_active_jobs:
+            raise RuntimeError(f"Too many active simulation jobs (limit {self.max_active_jobs})")
+        self._ensure_pool()
+
+        job = SimulationJob(job_id=uuid.uuid4().hex, config=config)
+        self.jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.get_running_loop().create_task(self._run_job(job))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[SimulationJob]:
+        self._expire_jobs()
+        return self.jobs.get(job_id)
+
+    def _start_replications(self, job: SimulationJob) -> "List[asyncio.Future[Dict[str, Any]]]":
+        loop = asyncio.get_running_loop()
+        base_seed: Optional[int] = job.config.get("seed")
+        for attempt in range(2):
+            self._ensure_pool()
+            try:
+                return [
+                    loop.run_in_executor(
+                        self._executor, run_simulation_replication, job.job_id, job.config, replication,
+                        None if base_seed is None else base_seed + replication, self._message_queue
+                    )
+                    for replication in range(job.config["replications"])
+                ]
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+                self._reset_pool()
+        raise AssertionError("unreachable")
+
+    async def _run_job(self, job: SimulationJob) -> None:
+        job_queue: "asyncio.Queue[Tuple[str, int, Any]]" = asyncio.Queue()
+        self._job_queues[job.job_id] = job_queue
+        try:
+            await self._collect_job(job, job_queue)
+        finally:
+            del self._job_queues[job.job_id]
+
+    async def _collect_job(self, job: SimulationJob, job_queue: "asyncio.Queue[Tuple[str, int, Any]]") -> None:
+        replications: int = job.config["replications"]
+        job.status = "running"
+        job.started_at = datetime.now()
+        futures = self._start_replications(job)
+        results = asyncio.gather(*futures, return_exceptions=True)
+
+        finished = 0
+        getter: "Optional[asyncio.Future[Tuple[str, int, Any]]]" = None
+        try:
+            while finished < replications:
+                getter = asyncio.ensure_future(job_queue.get())
+                await asyncio.wait([getter, results], return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    # Every worker has exited; one that died without reporting is picked up from its future
+                    try:
+                        await asyncio.wait_for(getter, DRAIN_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        getter.cancel()
+                        break
+                kind, replication, payload = getter.result()
+                if kind == EVENTS_MESSAGE:
+                    job.event_count += len(payload)
+                    job.publish("events", {"replication": replication, "events": payload})
+                elif kind == METRICS_MESSAGE:
+                    self._live_metrics[(job.job_id, replication)] = payload
+                elif kind == DONE_MESSAGE:
+                    self._retire_metrics(job.job_id, replication)
+                    finished += 1
+                    job.replications_completed += 1
+                    job.kpis.append(payload)
+                    job.publish("kpis", payload)
+                elif kind == FAILED_MESSAGE:
+                    self._retire_metrics(job.job_id, replication)
+                    finished += 1
+                    job.replications_failed += 1
+                    job.errors.append(f"replication {replication}: {payload}")
+        finally:
+            # Never leave a getter waiting on the job queue once collection stops
+            if getter is not None and not getter.done():
+                getter.cancel()
+
+        for replication, result in enumerate(await results):
+            if isinstance(result, BrokenProcessPool):
+                self._reset_pool()
+            if isinstance(result, BaseException) and not any(error.startswith(f"replication {replication}:") for error in job.errors):
+                job.replications_failed += 1
+                job.errors.append(f"replication {replication}: {result!r}")
+
+        job.status = "failed" if job.replications_failed else "completed"
+        job.finished_at = datetime.now()
+        job.publish("status", job.to_status())
+
+    def _retire_metrics(self, job_id: str, replication: int) -> None:
+        """Fold a finished replication's counters into the totals; its gauges drop out"""
+        snapshot = self._live_metrics.pop((job_id, replication), None)
+        if snapshot is None:
+            return
+        snapshot = dict(snapshot, active_processes=0, queue_depths={}, event_store_events=0, event_store_bytes=0)
+        self._finished_metrics = merge_snapshots([self._finished_metrics, snapshot])
+
+    def render_metrics(self) -> str:
+        """Engine metrics across all jobs in Prometheus text format"""
+        live = merge_snapshots(list(self._live_metrics.values()))
+        live["event_store_events"] = sum(job.retained_events for job in self.jobs.values())
+        live["event_store_bytes"] = sum(job.retained_bytes for job in self.jobs.values())
+        totals = merge_snapshots([self._finished_metrics, live])
+        return render_prometheus(totals, live)
+
+    async def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._queue_manager is not None:
+            with contextlib.suppress(Exception):
+                self._message_queue.put(None)  # Stop the reader thread
+            self._queue_manager.shutdown()
+            self._queue_manager = None
+            self._message_queue = None
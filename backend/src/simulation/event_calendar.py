@@ -0,0 +1,82 @@
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ..entities.patient.patient import Patient
+from ..enums.priority import Priority
+
+# Same tie-breaking as SimPy: at equal times urgent events (process starts) run
+# before normal ones (timeouts), then in scheduling order
+URGENT = 0
+NORMAL = 1
+
+
+class CalendarEventType(Enum):
+    """Steps of the patient pathway scheduled on the event calendar"""
+    PATIENT_ARRIVAL = "patient_arrival"          # Next arrival from the arrival stream
+    JOURNEY_START = "journey_start"              # Arrived patient enters the hospital
+    TRIAGE_COMPLETE = "triage_complete"          # Triage done, routing happens immediately
+    CONSULTATION_START = "consultation_start"
+    CONSULTATION_END = "consultation_end"
+    BED_RELEASE = "bed_release"
+    STATUS_MONITOR_START = "status_monitor_start"
+    STATUS_CHECK = "status_check"
+
+
+@dataclass
+class PatientJourneyState:
+    """Everything a patient's pathway needs to carry between calendar events"""
+    patient: Patient
+    arrival_time: float = 0
+    priority: Priority = Priority.GREEN
+    routing_decision: Dict[str, Any] = field(default_factory=dict)
+    consultation_time: float = 0
+    bed_time: float = 0
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    """A typed event record on the calendar"""
+    time: float
+    event_type: CalendarEventType
+    journey: Optional[PatientJourneyState] = None
+
+
+class EventCalendar:
+    """Minimal heapq-based event calendar used instead of per-patient SimPy processes
+
+    Exposes ``now`` like a SimPy environment so the hospital and routing code can
+    read the current simulation time from either engine.
+    """
+
+    def __init__(self):
+        self.now: float = 0
+        self._queue: List[Tuple[float, int, int, CalendarEvent]] = []
+        self._sequence: Iterator[int] = itertools.count()
+
+    def schedule(self, event_type: CalendarEventType, delay: float = 0,
+                 journey: Optional[PatientJourneyState] = None, urgent: bool = False) -> None:
+        """Schedule an event ``delay`` minutes from now"""
+        time = self.now + delay
+        heapq.heappush(self._queue, (time, URGENT if urgent else NORMAL, next(self._sequence),
+                                     CalendarEvent(time, event_type, journey)))
+
+    def peek(self) -> float:
+        """Time of the next event, or infinity if the calendar is empty"""
+        return self._queue[0][0] if self._queue else float("inf")
+
+    def pop(self) -> CalendarEvent:
+        """Remove the next event and advance the clock to it"""
+        time, _, _, event = heapq.heappop(self._queue)
+        self.now = time
+        return event
+
+    def run(self, until: float, handler: Callable[[CalendarEvent], None]) -> None:
+        """Process events strictly before ``until``, then advance the clock to it"""
+        while self._queue and self._queue[0][0] < until:
+            handler(self.pop())
+        self.now = until
+
+    def __len__(self) -> int:
+        return len(self._queue)
@@ -0,0 +1,99 @@
+import contextlib
+import hashlib
+import io
+import json
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .simulation import HospitalSimulation
+
+# Wall-clock field that differs between otherwise identical runs
+NON_DETERMINISTIC_FIELDS = ("real_time",)
+
+
+def canonical_event(event: Dict[str, Any]) -> str:
+    """Serialize an event deterministically, without wall-clock fields"""
+    return json.dumps(
+        {key: value for key, value in event.items() if key not in NON_DETERMINISTIC_FIELDS},
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class EventStreamFingerprint:
+    """Rolling SHA-256 over the canonical event stream
+
+    Each event is chained onto the previous digest, so two runs have the same
+    fingerprint only if they log the same events in the same order.
+    """
+
+    def __init__(self):
+        self._digest = hashlib.sha256().digest()
+        self.event_count = 0
+
+    def update(self, event: Dict[str, Any]) -> None:
+        self._digest = hashlib.sha256(self._digest + canonical_event(event).encode()).digest()
+        self.event_count += 1
+
+    def hexdigest(self) -> str:
+        return self._digest.hex()
+
+
+@dataclass
+class EventDivergence:
+    """First position at which two event streams differ"""
+    index: int
+    left: Optional[Dict[str, Any]]  # None if the left stream ended first
+    right: Optional[Dict[str, Any]]
+
+    def describe(self) -> str:
+        if self.left is None or self.right is None:
+            shorter = "first" if self.left is None else "second"
+            return f"Event {self.index}: the {shorter} stream ended early"
+        fields = sorted(key for key in set(self.left) | set(self.right)
+                        if key not in NON_DETERMINISTIC_FIELDS and self.left.get(key) != self.right.get(key))
+        lines = [f"Event {self.index} differs in: {', '.join(fields)}"]
+        for key in fields:
+            lines.append(f"  {key}: {self.left.get(key)!r} != {self.right.get(key)!r}")
+        return "\n".join(lines)
+
+
+def find_first_divergence(left: Iterable[Dict[str, Any]],
+                          right: Iterable[Dict[str, Any]]) -> Optional[EventDivergence]:
+    """Compare two event streams lazily; returns None if they are identical"""
+    for index, (left_event, right_event) in enumerate(zip_longest(left, right)):
+        if left_event is None or right_event is None:
+            return EventDivergence(index, left_event, right_event)
+        if canonical_event(left_event) != canonical_event(right_event):
+            return EventDivergence(index, left_event, right_event)
+    return None
+
+
+def _quiet_events(simulation: "HospitalSimulation") -> Iterator[Dict[str, Any]]:
+    """Stream a simulation's events without its per-event console output"""
+    events = simulation.iter_events()
+    while True:
+        with contextlib.redirect_stdout(io.StringIO()):
+            event = next(events, None)
+        if event is None:
+            return
+        yield event
+
+
+def compare_variants(left: "HospitalSimulation", right: "HospitalSimulation") -> Optional[EventDivergence]:
+    """Run two fresh simulation variants side by side and return their first divergence
+
+    The runs advance in lockstep, so comparison stops at the first difference;
+    with retain_events=False memory stays constant however long the horizon.
+    """
+    return find_first_divergence(_quiet_events(left), _quiet_events(right))
+
+
+def fingerprint_events(events: Iterable[Dict[str, Any]]) -> EventStreamFingerprint:
+    """Fingerprint an already recorded event stream, e.g. one loaded from JSON"""
+    fingerprint = EventStreamFingerprint()
+    for event in events:
+        fingerprint.update(event)
+    return fingerprint
+
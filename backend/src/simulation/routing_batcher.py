@@ -0,0 +1,44 @@
+import simpy
+from typing import List, Tuple
+from ..entities.patient.patient import Patient
+from ..enums.priority import Priority
+from ..services.agent_routing_service import AgentRoutingService
+
+
+class RoutingBatcher:
+    """Micro-batches agent routing requests within a short simulated time window
+
+    The first request in an empty batch opens a window; every patient that asks for
+    routing before it closes is sent to the agents in a single batched call. Each
+    request returns a SimPy event that succeeds with that patient's decision.
+    """
+
+    def __init__(self, env: simpy.Environment, agent_router: AgentRoutingService,
+                 window: float = 1.0, include_explanation: bool = True):
+        self.env = env
+        self.agent_router = agent_router
+        self.window = window
+        self.include_explanation = include_explanation
+        self._pending: List[Tuple[Patient, Priority, simpy.Event]] = []
+        self.batches_sent = 0
+        self.requests_routed = 0
+
+    def request(self, patient: Patient, priority: Priority) -> simpy.Event:
+        """Queue a routing request; yield the returned event to get the decision"""
+        decision_event = self.env.event()
+        self._pending.append((patient, priority, decision_event))
+        if len(self._pending) == 1:
+            self.env.process(self._flush_after_window())
+        return decision_event
+
+    def _flush_after_window(self):
+        yield self.env.timeout(self.window)
+        batch, self._pending = self._pending, []
+
+        decisions = self.agent_router.make_routing_decisions_batch(
+            [(patient, priority) for patient, priority, _ in batch], self.include_explanation
+        )
+        self.batches_sent += 1
+        self.requests_routed += len(batch)
+        for (_, _, decision_event), decision in zip(batch, decisions):
+            decision_event.succeed(decision)
@@ -1,26 +1,137 @@
 import simpy
 import json
+import os
 import random
-from typing import List, Dict, Any, Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 from ..entities.hospital.hospital import Hospital
 from ..entities.patient.patient import Patient
+from ..entities.doctor.doctor import Doctor
+from ..entities.equipment.bed.bed import Bed
 from ..services.patient_factory import PatientFactory
+from ..services.arrival_trace import ArrivalTrace, TraceArrival
 from ..enums.priority import Priority
 from ..services.routing_service import RoutingService
+from ..enums.decision_retention import DecisionRetention
+from ..enums.simulation_engine import SimulationEngine
+from ..agents.specialist_agent import SpecialistAgent
+from ..services.agent_routing_service import AgentRoutingService
+from ..services.routing_cache import RoutingDecisionCache
+from ..monitoring.engine_metrics import EngineMetrics
+from ..monitoring.stage_profiler import StageProfiler
+from ..monitoring.kpi_accumulators import SimulationKPIs
+from ..analytics.event_analytics import analyze_events, events_to_columns
+from ..analytics.run_comparison import summarize_run
+from ..analytics.run_catalog import RunCatalog
+from ..analytics.event_store import EventStore
+from .routing_batcher import RoutingBatcher
+from .event_fingerprint import EventStreamFingerprint
+from .event_calendar import CalendarEvent, CalendarEventType, EventCalendar, PatientJourneyState
 
 class HospitalSimulation:
-    """SimPy-based hospital simulation that tracks patient journeys and generates JSON events"""
-
-    def __init__(self, hospital: Hospital, simulation_time: int = 480):
-        self.env = simpy.Environment()
+    """SimPy-based hospital simulation that tracks patient journeys and generates JSON events
+
+    The same pathway can run on SimPy (one generator process per patient) or on a
+    lightweight heapq event calendar; both produce identical event streams for the
+    same seed. Runs can be driven all at once (run_simulation) or incrementally
+    (run_until, step, iter_events); with retain_events=False the event history is
+    not kept, so incremental consumers run in constant memory.
+    """
+
+    def __init__(self, hospital: Hospital, simulation_time: int = 480,
+                 routing_retention: DecisionRetention = DecisionRetention.FULL,
+                 routing_agents: Optional[List[SpecialistAgent]] = None,
+                 routing_batch_window: float = 1.0,
+                 engine: SimulationEngine = SimulationEngine.SIMPY,
+                 seed: Optional[int] = None,
+                 start_time: Optional[datetime] = None,
+                 retain_events: bool = True,
+                 metrics: Optional[EngineMetrics] = None,
+                 profiler: Optional[StageProfiler] = None,
+                 mean_inter_arrival_time: float = 15,
+                 fingerprint: bool = False,
+                 kpis: Optional[SimulationKPIs] = None,
+                 event_store: Optional[EventStore] = None,
+                 patient_factory: Optional[PatientFactory] = None,
+                 arrival_trace: Optional[ArrivalTrace] = None):
+        if engine == SimulationEngine.EVENT_CALENDAR and routing_agents:
+            raise ValueError("Agent routing batches require the SimPy engine")
+
+        self.engine = engine
+        self.env: Union[simpy.Environment, EventCalendar] = (
+            simpy.Environment() if engine == SimulationEngine.SIMPY else EventCalendar()
+        )
         self.hospital = hospital
         self.hospital.env = self.env  # Give hospital access to environment
         self.simulation_time = simulation_time
         self.events: List[Dict[str, Any]] = []
-        self.patient_factory = PatientFactory()
-        self.start_time = datetime.now()
-        self.routing_service = RoutingService(hospital)
+        self.retain_events = retain_events
+        self._new_events: Deque[Dict[str, Any]] = deque()  # Logged but not yet handed to a caller
+        self._started = False
+        self.seed = seed
+        self.random = random.Random(seed)  # Drives arrivals; the patient factory has its own RNG
+        self.patient_factory = patient_factory or PatientFactory(seed)  # e.g. a FHIRCohortFactory for real cohorts
+        self.start_time = start_time or (arrival_trace.start if arrival_trace else None) or datetime.now()
+        self.routing_service = RoutingService(hospital, retention=routing_retention)
+        self._next_patient_id = 1
+        self.mean_inter_arrival_time = mean_inter_arrival_time
+
+        # Optional recorded arrivals replacing the exponential arrival stream, read as the run advances;
+        # trace datetimes are replayed relative to the simulation start
+        self.arrival_trace = arrival_trace
+        self._trace_arrivals: Optional[Iterator[TraceArrival]] = (arrival_trace.arrivals(self.start_time)
+                                                                     if arrival_trace else None)
+        self._trace_arrival: Optional[TraceArrival] = None
+
+        # Optional engine instrumentation, shared with the triage and routing hot paths
+        self.metrics = metrics
+        if metrics is not None:
+            self.hospital.triage_system.latency_histogram = metrics.triage_latency
+            self.routing_service.latency_histogram = metrics.routing_latency
+
+        # Optional online KPIs, so summaries do not need the full event history
+        self.kpis = kpis
+
+        # Optional rolling hash of the event stream, for checking optimized engines produce identical runs
+        self.fingerprint: Optional[EventStreamFingerprint] = EventStreamFingerprint() if fingerprint else None
+
+        # Optional per-stage profiling of the pathway hot path
+        self.profiler = profiler
+        if profiler is not None:
+            self._attach_profiler(profiler)
+
+        # Optional agent-based routing: requests within a window share one agent batch
+        self.routing_batcher: Optional[RoutingBatcher] = None
+        if routing_agents and isinstance(self.env, simpy.Environment):
+            agent_router = AgentRoutingService(self.routing_service, routing_agents, cache=RoutingDecisionCache())
+            self.routing_batcher = RoutingBatcher(self.env, agent_router, routing_batch_window)
+
+        # Optional SQLite sink, so events can be queried across runs without loading them
+        self.event_store = event_store
+        self.event_store_run_id: Optional[int] = None
+        if event_store is not None:
+            self.event_store_run_id = event_store.begin_run(hospital.name, self.start_time.isoformat(),
+                                                            self.get_run_config())
+        self._event_store_run_open = event_store is not None
+
+    def _attach_profiler(self, profiler: StageProfiler) -> None:
+        """Shadow the engine loop, pathway stages and their hot methods with profiled wrappers"""
+        for method_name in ("run_until", "_process_next_event"):
+            profiler.wrap(self, method_name, "simulation")
+        for method_name, stage in (("_create_next_patient", "patient_creation"), ("_log_arrival", "arrival"),
+                                   ("_perform_triage", "triage"), ("_log_routing_decision", "routing"),
+                                   ("_join_doctor_queue", "queue_join"), ("_start_consultation", "consultation"),
+                                   ("_end_consultation", "consultation"), ("_assign_bed", "bed"),
+                                   ("_release_bed", "bed"), ("_discharge", "discharge"),
+                                   ("_log_hospital_status", "status_monitor")):
+            profiler.wrap(self, method_name, stage)
+        profiler.wrap(self.hospital.triage_system, "determine_priority")
+        profiler.wrap(self.hospital.triage_system, "get_triage_info")
+        profiler.wrap(self.routing_service, "make_routing_decision")
+        profiler.wrap(self.hospital, "discharge_patient")
+        profiler.wrap(self, "log_event")
 
     def log_event(self, event_type: str, patient_name: str, resource_name: Optional[str] = None,
                   priority: Optional[str] = None, details: Optional[Dict[str, Any]] = None) -> None:
@@ -34,37 +145,49 @@ class HospitalSimulation:
             "priority": priority,
             "details": details or {}
         }
-        self.events.append(event)
+        if self.retain_events:
+            self.events.append(event)
+        self._new_events.append(event)
+        if self.metrics is not None:
+            self.metrics.record_event(event_type)
+        if self.fingerprint is not None:
+            self.fingerprint.update(event)
+        if self.event_store is not None and self._event_store_run_open:
+            assert self.event_store_run_id is not None
+            self.event_store.add(self.event_store_run_id, event)
         print(f"[{self.env.now:6.1f}] {event_type}: {patient_name} {details or ''}")
 
-    def patient_arrival_process(self):
-        """Generate patient arrivals throughout the simulation"""
-        patient_id = 1
-
-        while True:
-            # Create patient with random priority
-            patient: Patient = self.patient_factory.create_patient()
-            patient.id = patient_id
-            patient_id += 1
-
-            # Start patient journey
-            self.env.process(self.patient_journey(patient))
-
-            # Wait for next arrival (exponential distribution)
-            inter_arrival_time = random.expovariate(1.0 / 15)  # Average 15 minutes
-            yield self.env.timeout(inter_arrival_time)
-
-    def patient_journey(self, patient: Patient):
-        """Simulate complete patient journey through hospital"""
-        # 1. Patient arrives
-        arrival_time = self.env.now
+    # Pathway stages shared by both engines
+    def _create_next_patient(self) -> Patient:
+        """Create the next arriving patient with random priority, or from the current trace arrival"""
+        patient: Patient = (self._trace_arrival.to_patient(self.patient_factory) if self._trace_arrival
+                            else self.patient_factory.create_patient())
+        patient.id = self._next_patient_id
+        self._next_patient_id += 1
+        return patient
+
+    def _next_inter_arrival_time(self) -> Optional[float]:
+        """Time until the next arrival (exponential distribution, or the next trace arrival)
+
+        Returns None once the arrival trace is exhausted.
+        """
+        if self._trace_arrivals is not None:
+            self._trace_arrival = next(self._trace_arrivals, None)
+            return None if self._trace_arrival is None else max(self._trace_arrival.time - self.env.now, 0)
+        return self.random.expovariate(1.0 / self.mean_inter_arrival_time)  # Average 15 minutes by default
+
+    def _log_arrival(self, patient: Patient) -> None:
+        if self.metrics is not None:
+            self.metrics.active_processes += 1
+        if self.kpis is not None:
+            self.kpis.record_arrival(patient.id, self.env.now)
         self.log_event("PATIENT_ARRIVAL", patient.name, details={
             "symptoms": patient.symptoms.symptoms,
             "history": patient.history
         })
 
-        # 2. Triage process
-        yield self.env.timeout(2)  # 2 minutes for triage
+    def _perform_triage(self, patient: Patient) -> Priority:
+        """Triage the patient and log the result"""
         priority = self.hospital.triage_system.determine_priority(patient)
         triage_info = self.hospital.triage_system.get_triage_info(patient)
 
@@ -73,117 +196,420 @@ class HospitalSimulation:
             "max_wait_time": priority.max_wait_time,
             "triage_scores": triage_info["final_scores"]
         })
+        return priority
 
-        # 3. Routing decision using enhanced routing agent
-        routing_decision = self.routing_service.make_routing_decision(patient, priority)
+    def _log_routing_decision(self, patient: Patient, priority: Priority, routing_decision: Dict[str, Any]) -> None:
         routing_decision["timestamp"] = self.env.now  # Add timestamp
 
         self.log_event("ROUTING_DECISION", patient.name, priority=priority.value, details={
             "assign_doctor": routing_decision["assign_doctor"],
             "assign_bed": routing_decision["assign_bed"],
-            "routing_logic": routing_decision["routing_logic"]
+            "routing_logic": routing_decision.get("routing_logic")
         })
 
-        # 4. Doctor consultation
-        if routing_decision["assign_doctor"]:
-            doctor = routing_decision["assigned_doctor"]
-            if doctor:
-                # Add to doctor's queue
-                self.routing_service.assign_patient_to_doctor(patient, doctor, priority)
-                self.log_event("QUEUE_JOIN", patient.name, doctor.name, priority.value, details={
-                    "queue_position": len([p for p in doctor.patient_queue[priority.value]]),
-                    "total_in_queue": doctor.get_total_patients_in_queue()
-                })
-
-                # Wait for doctor availability based on priority
-                wait_time = self.routing_service.calculate_wait_time(priority, doctor)
-                yield self.env.timeout(wait_time)
-
-                # Start consultation
-                self.log_event("CONSULTATION_START", patient.name, doctor.name, priority.value)
-
-                # Consultation duration based on priority
-                consultation_time = self.routing_service.calculate_consultation_time(priority)
-                yield self.env.timeout(consultation_time)
-
-                # Remove from queue
-                doctor.remove_patient_from_queue(patient)
-                self.log_event("CONSULTATION_END", patient.name, doctor.name, priority.value, details={
-                    "duration": consultation_time
-                })
+    def _join_doctor_queue(self, patient: Patient, doctor: Doctor, priority: Priority) -> float:
+        """Add the patient to the doctor's queue and return the expected wait"""
+        self.routing_service.assign_patient_to_doctor(patient, doctor, priority)
+        if self.kpis is not None:
+            self.kpis.record_queue_length(doctor.name, doctor.get_total_patients_in_queue(), self.env.now)
+        self.log_event("QUEUE_JOIN", patient.name, doctor.name, priority.value, details={
+            "queue_position": len([p for p in doctor.patient_queue[priority.value]]),
+            "total_in_queue": doctor.get_total_patients_in_queue()
+        })
 
-        # 5. Bed assignment for urgent patients
-        if routing_decision["assign_bed"]:
-            bed = routing_decision["assigned_bed"]
-            if bed:
-                self.routing_service.assign_patient_to_bed(patient, bed, priority)
+        # Wait for doctor availability based on priority
+        return self.routing_service.calculate_wait_time(priority, doctor)
+
+    def _start_consultation(self, patient: Patient, doctor: Doctor, priority: Priority) -> float:
+        """Log the consultation start and return its duration"""
+        self.log_event("CONSULTATION_START", patient.name, doctor.name, priority.value)
+        if self.kpis is not None:
+            self.kpis.record_consultation_start(patient.id, priority.value, doctor.name, self.env.now)
+
+        # Consultation duration based on priority
+        return self.routing_service.calculate_consultation_time(priority)
+
+    def _end_consultation(self, patient: Patient, doctor: Doctor, priority: Priority, consultation_time: float) -> None:
+        doctor.remove_patient_from_queue(patient)
+        if self.kpis is not None:
+            self.kpis.record_service_end(doctor.name, self.env.now)
+            self.kpis.record_queue_length(doctor.name, doctor.get_total_patients_in_queue(), self.env.now)
+        self.log_event("CONSULTATION_END", patient.name, doctor.name, priority.value, details={
+            "duration": consultation_time
+        })
 
-                self.log_event("BED_ASSIGNMENT", patient.name, bed.name, priority.value)
+    def _assign_bed(self, patient: Patient, bed: Bed, priority: Priority) -> float:
+        """Put the patient in the bed and return the length of stay"""
+        self.routing_service.assign_patient_to_bed(patient, bed, priority)
+        if self.kpis is not None:
+            self.kpis.record_service_start(bed.name, self.env.now)
 
-                # Stay in bed based on priority
-                bed_time = self.routing_service.calculate_bed_time(priority)
-                yield self.env.timeout(bed_time)
+        self.log_event("BED_ASSIGNMENT", patient.name, bed.name, priority.value)
 
-                bed.remove_patient_from_queue(patient)
-                self.log_event("BED_DISCHARGE", patient.name, bed.name, priority.value, details={
-                    "duration": bed_time
-                })
+        # Stay in bed based on priority
+        return self.routing_service.calculate_bed_time(priority)
 
-        # 6. Patient discharge
+    def _release_bed(self, patient: Patient, bed: Bed, priority: Priority, bed_time: float) -> None:
+        self.routing_service.release_patient_from_bed(patient, bed)
+        if self.kpis is not None:
+            self.kpis.record_service_end(bed.name, self.env.now)
+        self.log_event("BED_DISCHARGE", patient.name, bed.name, priority.value, details={
+            "duration": bed_time
+        })
+
+    def _discharge(self, patient: Patient, arrival_time: float, priority: Priority) -> None:
         total_time = self.env.now - arrival_time
         self.hospital.discharge_patient(patient)
+        if self.metrics is not None:
+            self.metrics.active_processes -= 1
+        if self.kpis is not None:
+            self.kpis.record_discharge(patient.id, priority.value, self.env.now)
 
         self.log_event("PATIENT_DISCHARGE", patient.name, details={
             "total_time_in_hospital": total_time,
             "priority": priority.value
         })
 
-    def hospital_status_monitor(self):
-        """Monitor and log hospital status periodically"""
+    def _log_hospital_status(self) -> None:
+        stats = self.hospital.get_hospital_stats()
+        queue_summary = self.hospital.get_queue_summary()
+
+        self.log_event("HOSPITAL_STATUS", "SYSTEM", details={
+            "statistics": stats,
+            "queue_summary": queue_summary,
+            "simulation_time": self.env.now
+        })
+
+    # SimPy engine
+    @property
+    def _simpy_env(self) -> simpy.Environment:
+        assert isinstance(self.env, simpy.Environment)
+        return self.env
+
+    def patient_arrival_process(self):
+        """Generate patient arrivals throughout the simulation"""
+        if self._trace_arrivals is not None:  # Wait for the first recorded arrival
+            delay = self._next_inter_arrival_time()
+            if delay is None:
+                return
+            yield self._simpy_env.timeout(delay)
+
         while True:
-            yield self.env.timeout(60)  # Every hour
+            patient = self._create_next_patient()
 
-            stats = self.hospital.get_hospital_stats()
-            queue_summary = self.hospital.get_queue_summary()
+            # Start patient journey
+            self._simpy_env.process(self.patient_journey(patient))
 
-            self.log_event("HOSPITAL_STATUS", "SYSTEM", details={
-                "statistics": stats,
-                "queue_summary": queue_summary,
-                "simulation_time": self.env.now
-            })
+            # Wait for next arrival
+            delay = self._next_inter_arrival_time()
+            if delay is None:
+                return
+            yield self._simpy_env.timeout(delay)
+
+    def patient_journey(self, patient: Patient):
+        """Simulate complete patient journey through hospital"""
+        env = self._simpy_env
+
+        # 1. Patient arrives
+        arrival_time = env.now
+        self._log_arrival(patient)
+
+        # 2. Triage process
+        yield env.timeout(2)  # 2 minutes for triage
+        priority = self._perform_triage(patient)
+
+        # 3. Routing decision using enhanced routing agent
+        if self.routing_batcher:
+            routing_decision = yield self.routing_batcher.request(patient, priority)
+        else:
+            routing_decision = self.routing_service.make_routing_decision(patient, priority)
+        self._log_routing_decision(patient, priority, routing_decision)
+
+        # 4. Doctor consultation
+        if routing_decision["assign_doctor"]:
+            doctor = routing_decision["assigned_doctor"]
+            if doctor:
+                wait_time = self._join_doctor_queue(patient, doctor, priority)
+                yield env.timeout(wait_time)
+
+                consultation_time = self._start_consultation(patient, doctor, priority)
+                yield env.timeout(consultation_time)
+
+                self._end_consultation(patient, doctor, priority, consultation_time)
+
+        # 5. Bed assignment for urgent patients
+        if routing_decision["assign_bed"]:
+            bed = routing_decision["assigned_bed"]
+            if bed:
+                bed_time = self._assign_bed(patient, bed, priority)
+                yield env.timeout(bed_time)
+
+                self._release_bed(patient, bed, priority, bed_time)
+
+        # 6. Patient discharge
+        self._discharge(patient, arrival_time, priority)
+
+    def hospital_status_monitor(self):
+        """Monitor and log hospital status periodically"""
+        while True:
+            yield self._simpy_env.timeout(60)  # Every hour
+            self._log_hospital_status()
+
+    # Event-calendar engine: the same pathway as patient_journey, one handler per step
+    @property
+    def _calendar(self) -> EventCalendar:
+        assert isinstance(self.env, EventCalendar)
+        return self.env
+
+    def _handle_calendar_event(self, event: CalendarEvent) -> None:
+        """Dispatch a calendar event to its pathway step"""
+        calendar = self._calendar
+        event_type = event.event_type
+
+        if event_type == CalendarEventType.PATIENT_ARRIVAL:
+            journey = PatientJourneyState(self._create_next_patient())
+            calendar.schedule(CalendarEventType.JOURNEY_START, journey=journey, urgent=True)
+            delay = self._next_inter_arrival_time()
+            if delay is not None:
+                calendar.schedule(CalendarEventType.PATIENT_ARRIVAL, delay)
+            return
+
+        if event_type == CalendarEventType.STATUS_MONITOR_START:
+            calendar.schedule(CalendarEventType.STATUS_CHECK, 60)
+            return
+
+        if event_type == CalendarEventType.STATUS_CHECK:
+            self._log_hospital_status()
+            calendar.schedule(CalendarEventType.STATUS_CHECK, 60)  # Every hour
+            return
+
+        journey = event.journey
+        assert journey is not None
+        patient = journey.patient
+
+        if event_type == CalendarEventType.JOURNEY_START:
+            journey.arrival_time = calendar.now
+            self._log_arrival(patient)
+            calendar.schedule(CalendarEventType.TRIAGE_COMPLETE, 2, journey)  # 2 minutes for triage
+
+        elif event_type == CalendarEventType.TRIAGE_COMPLETE:
+            journey.priority = self._perform_triage(patient)
+            journey.routing_decision = self.routing_service.make_routing_decision(patient, journey.priority)
+            self._log_routing_decision(patient, journey.priority, journey.routing_decision)
+
+            doctor = journey.routing_decision["assigned_doctor"]
+            if journey.routing_decision["assign_doctor"] and doctor:
+                wait_time = self._join_doctor_queue(patient, doctor, journey.priority)
+                calendar.schedule(CalendarEventType.CONSULTATION_START, wait_time, journey)
+            else:
+                self._calendar_bed_or_discharge(journey)
+
+        elif event_type == CalendarEventType.CONSULTATION_START:
+            journey.consultation_time = self._start_consultation(
+                patient, journey.routing_decision["assigned_doctor"], journey.priority
+            )
+            calendar.schedule(CalendarEventType.CONSULTATION_END, journey.consultation_time, journey)
+
+        elif event_type == CalendarEventType.CONSULTATION_END:
+            self._end_consultation(patient, journey.routing_decision["assigned_doctor"],
+                                   journey.priority, journey.consultation_time)
+            self._calendar_bed_or_discharge(journey)
+
+        elif event_type == CalendarEventType.BED_RELEASE:
+            self._release_bed(patient, journey.routing_decision["assigned_bed"], journey.priority, journey.bed_time)
+            self._discharge(patient, journey.arrival_time, journey.priority)
+
+    def _calendar_bed_or_discharge(self, journey: PatientJourneyState) -> None:
+        """Continue to a bed for urgent patients, otherwise discharge now"""
+        bed = journey.routing_decision["assigned_bed"]
+        if journey.routing_decision["assign_bed"] and bed:
+            journey.bed_time = self._assign_bed(journey.patient, bed, journey.priority)
+            self._calendar.schedule(CalendarEventType.BED_RELEASE, journey.bed_time, journey)
+        else:
+            self._discharge(journey.patient, journey.arrival_time, journey.priority)
+
+    def _start(self) -> None:
+        """Start the arrival and monitoring processes once"""
+        if self._started:
+            return
+        self._started = True
+
+        if isinstance(self.env, simpy.Environment):
+            self.env.process(self.patient_arrival_process())
+            self.env.process(self.hospital_status_monitor())
+        elif self._trace_arrivals is not None:
+            delay = self._next_inter_arrival_time()  # The first recorded arrival, as in patient_arrival_process
+            if delay is not None:
+                self.env.schedule(CalendarEventType.PATIENT_ARRIVAL, delay)
+            self.env.schedule(CalendarEventType.STATUS_MONITOR_START, urgent=True)
+        else:
+            self.env.schedule(CalendarEventType.PATIENT_ARRIVAL, urgent=True)
+            self.env.schedule(CalendarEventType.STATUS_MONITOR_START, urgent=True)
+
+    def _take_new_events(self) -> List[Dict[str, Any]]:
+        new_events = list(self._new_events)
+        self._new_events.clear()
+        return new_events
+
+    def _process_next_event(self) -> None:
+        started, simulated_from = time.perf_counter(), self.env.now
+        if isinstance(self.env, simpy.Environment):
+            self.env.step()
+        else:
+            self._handle_calendar_event(self.env.pop())
+        if self.metrics is not None:
+            self.metrics.record_advance(self.env.now - simulated_from, time.perf_counter() - started)
+
+    @property
+    def is_finished(self) -> bool:
+        """True once no scheduled event falls before the simulation horizon"""
+        return self._started and self.env.peek() >= self.simulation_time
+
+    def run_until(self, until: float) -> List[Dict[str, Any]]:
+        """Advance the simulation to ``until`` (capped at the horizon)
+
+        Events at exactly ``until`` are left for the next call, as with SimPy's
+        ``env.run(until=...)``.
+
+        Returns:
+            Events logged since the last call that handed events back
+        """
+        self._start()
+        until = min(until, self.simulation_time)
+        if until > self.env.now:
+            started, simulated_from = time.perf_counter(), self.env.now
+            if isinstance(self.env, simpy.Environment):
+                self.env.run(until=until)
+            else:
+                self.env.run(until, self._handle_calendar_event)
+            if self.metrics is not None:
+                self.metrics.record_advance(self.env.now - simulated_from, time.perf_counter() - started)
+        if self.is_finished:
+            self._end_event_store_run()
+        elif self.event_store is not None:
+            self.event_store.flush()
+        return self._take_new_events()
+
+    def _end_event_store_run(self) -> None:
+        """Flush the run's remaining events to the event store and close the run there
+
+        The store itself belongs to the caller, who closes it.
+        """
+        if self.event_store is not None and self._event_store_run_open:
+            assert self.event_store_run_id is not None
+            self.event_store.end_run(self.event_store_run_id)
+            self._event_store_run_open = False
+
+    def get_metrics_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Refresh the gauges and return a snapshot of the engine metrics, if enabled"""
+        if self.metrics is None:
+            return None
+        self.metrics.queue_depths = {
+            resource_name: sum(queue_status.values())
+            for resource_name, queue_status in self.hospital.get_queue_summary().items()
+        }
+        return self.metrics.snapshot()
+
+    def get_kpi_summary(self) -> Optional[Dict[str, Any]]:
+        """Online KPI summary as of the current simulation time, if enabled"""
+        if self.kpis is None:
+            return None
+        return self.kpis.summary(self.env.now)
+
+    def step(self) -> List[Dict[str, Any]]:
+        """Process the next scheduled engine event if it falls before the horizon
+
+        A single engine event may log zero, one or several simulation events.
+
+        Returns:
+            Events logged since the last call that handed events back
+        """
+        self._start()
+        if not self.is_finished:
+            self._process_next_event()
+        if self.is_finished:
+            self._end_event_store_run()
+        return self._take_new_events()
+
+    def iter_events(self, until: Optional[float] = None,
+                    stop_condition: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield events as they are produced, up to ``until`` (default: the horizon)
+
+        Stops right after the first event for which ``stop_condition`` returns True,
+        leaving the rest of the horizon unsimulated; events already produced by the
+        same engine step are kept for the next call.
+        """
+        horizon = self.simulation_time if until is None else min(until, self.simulation_time)
+        self._start()
+        while True:
+            while self._new_events:
+                event = self._new_events.popleft()
+                yield event
+                if stop_condition and stop_condition(event):
+                    return
+            if self.env.peek() >= horizon:
+                break
+            self._process_next_event()
+        self.run_until(horizon)
 
     def run_simulation(self) -> List[Dict[str, Any]]:
         """Run the complete simulation and return events"""
         print(f"Starting hospital simulation for {self.simulation_time} minutes...")
 
-        # Start processes
-        self.env.process(self.patient_arrival_process())
-        self.env.process(self.hospital_status_monitor())
-
         # Run simulation
-        self.env.run(until=self.simulation_time)
+        self.run_until(self.simulation_time)
 
         print(f"\nSimulation completed. Generated {len(self.events)} events.")
+        if self.fingerprint is not None:
+            print(f"Event stream fingerprint: {self.fingerprint.hexdigest()}")
+        if self.profiler is not None:
+            print(f"\nStage profile:\n{self.profiler.format_report()}")
+            folded_file = self.profiler.finish()
+            if folded_file:
+                print(f"Folded stacks written to {folded_file}")
         return self.events
 
-    def export_events_to_json(self, filename: Optional[str] = None) -> str:
-        """Export simulation events to JSON file"""
+    def get_run_config(self) -> Dict[str, Any]:
+        """Settings that distinguish this run from others of the same hospital"""
+        return {
+            "engine": self.engine.value,
+            "seed": self.seed,
+            "simulation_time": self.simulation_time,
+            "mean_inter_arrival_time": self.mean_inter_arrival_time,
+            "arrival_trace": self.arrival_trace.path if self.arrival_trace else None,
+            "routing_retention": self.routing_service.retention.value,
+            "routing_batch_window": self.routing_batcher.window if self.routing_batcher else None
+        }
+
+    def export_events_to_json(self, filename: Optional[str] = None, catalog: bool = False) -> str:
+        """Export simulation events to JSON file
+
+        With ``catalog`` the run's config and headline KPIs are also recorded in the
+        run catalog in the same directory, so viewers can list runs without opening them.
+        This runs the full analytics pass, so only callers feeding a viewer ask for it.
+        """
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"hospital_simulation_{timestamp}.json"
 
+        simulation_info = {
+            "start_time": self.start_time.isoformat(),
+            "duration_minutes": self.simulation_time,
+            "total_events": len(self.events),
+            "hospital_name": self.hospital.name
+        }
         simulation_data = {
-            "simulation_info": {
-                "start_time": self.start_time.isoformat(),
-                "duration_minutes": self.simulation_time,
-                "total_events": len(self.events),
-                "hospital_name": self.hospital.name
-            },
+            "simulation_info": simulation_info,
             "events": self.events
         }
 
         with open(filename, 'w') as f:
             json.dump(simulation_data, f, indent=2, default=str)
 
+        if catalog:
+            kpis = summarize_run(analyze_events(events_to_columns(self.events, simulation_info)))
+            with RunCatalog(os.path.dirname(os.path.abspath(filename))) as run_catalog:
+                run_catalog.record_run(filename, simulation_info, self.get_run_config(), kpis)
+
         print(f"Events exported to {filename}")
         return filename
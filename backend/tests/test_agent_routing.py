@@ -0,0 +1,143 @@
+import asyncio
+import simpy
+from src.agents.specialist_agent import create_default_specialist_agents
+from src.entities.patient.patient import Patient
+from src.entities.patient.symptoms import Symptoms
+from src.enums.priority import Priority
+from src.services.agent_routing_service import AgentRoutingService
+from src.services.hospital_factory import HospitalFactory
+from src.services.routing_cache import CachedRoutingDecision, RoutingDecisionCache, canonical_routing_key
+from src.services.routing_service import RoutingService
+from src.simulation.routing_batcher import RoutingBatcher
+
+
+def _patient(patient_id: int, *symptoms: str) -> Patient:
+    return Patient(id=patient_id, name=f"Patient {patient_id}", symptoms=Symptoms(list(symptoms or ["chest pain"])))
+
+
+def _router(num_beds: int = 5, latency: float = 0.0, deadline: float = 2.0, cache=None) -> AgentRoutingService:
+    hospital = HospitalFactory.create_hospital(num_beds=num_beds)
+    return AgentRoutingService(RoutingService(hospital), create_default_specialist_agents(latency),
+                               decision_deadline=deadline, cache=cache)
+
+
+def _outcome(name: str) -> CachedRoutingDecision:
+    return CachedRoutingDecision(assign_doctor=True, assign_bed=True, routing_logic=name, agent_votes=(name,))
+
+
+def test_canonical_key_ignores_symptom_order_and_case():
+    hospital = HospitalFactory.create_hospital()
+    first = canonical_routing_key(_patient(1, "Chest Pain", "nausea"), Priority.RED, hospital)
+    second = canonical_routing_key(_patient(2, "nausea", " chest pain"), Priority.RED, hospital)
+    assert first == second == ("red", ("chest pain", "nausea"), (0, 2))
+    assert canonical_routing_key(_patient(3, "nausea"), Priority.RED, hospital) != first
+
+
+def test_canonical_key_tracks_the_shortest_queue():
+    hospital = HospitalFactory.create_hospital(num_doctors=2)
+    for doctor in hospital.get_available_doctors():
+        doctor.add_patient_to_queue(_patient(doctor.id))
+    assert canonical_routing_key(_patient(1), Priority.RED, hospital)[2] == (1, 2)
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used():
+    cache = RoutingDecisionCache(max_size=2)
+    keys = [("red", (f"symptom {index}",), (0, 2)) for index in range(3)]
+    cache.put(keys[0], _outcome("a"))
+    cache.put(keys[1], _outcome("b"))
+    assert cache.get(keys[0]).routing_logic == "a"  # Now the most recently used
+    cache.put(keys[2], _outcome("c"))
+
+    assert keys[1] not in cache and keys[0] in cache
+    assert cache.get(keys[1]) is None
+    assert cache.get_stats() == {"size": 2, "max_size": 2, "hits": 1, "misses": 1, "evictions": 1, "hit_rate": 0.5}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_repeated_signatures_are_served_from_the_cache():
+    router = _router(cache=RoutingDecisionCache())
+    first = router.make_routing_decision(_patient(1, "headache"), Priority.GREEN)
+    second = router.make_routing_decision(_patient(2, "Headache"), Priority.GREEN)
+
+    assert first["routing_source"] == "agents" and second["routing_source"] == "cache"
+    assert second["agent_votes"] == ["neurology"]
+    assert router.agent_batches == 1
+    assert router.cache.get_stats()["hits"] == 1
+
+
+def test_identical_signatures_in_a_batch_share_one_agent_call():
+    router = _router()
+    decisions = router.make_routing_decisions_batch([(_patient(index, "headache"), Priority.GREEN)
+                                                     for index in range(1, 5)])
+    assert [decision["routing_source"] for decision in decisions] == ["agents"] * 4
+    assert router.agent_batches == 1
+    assert all(agent.inference_calls == 1 for agent in router.agents)
+
+
+def test_batch_keys_reflect_beds_reserved_earlier_in_the_batch():
+    router = _router(num_beds=1, cache=RoutingDecisionCache())
+    decisions = router.make_routing_decisions_batch([(_patient(1), Priority.RED), (_patient(2), Priority.RED)])
+
+    assert decisions[0]["assigned_bed"] is not None
+    assert decisions[1]["assigned_bed"] is None
+    assert router.agent_batches == 1
+    # One entry for the state with a free bed and one for the state without
+    assert [key[2][1] for key in router.cache._entries] == [1, 0]
+    assert router.cache.get_stats()["hits"] == 0
+
+
+def test_signature_cached_only_for_the_starting_state_is_voted_on_again():
+    router = _router(num_beds=1, cache=RoutingDecisionCache())
+    hospital = router.rule_router.hospital
+    router.cache.put(canonical_routing_key(_patient(1), Priority.RED, hospital), _outcome("cached"))
+
+    decisions = router.make_routing_decisions_batch([(_patient(1), Priority.RED), (_patient(2), Priority.RED)])
+    assert [decision["routing_source"] for decision in decisions] == ["cache", "agents"]
+    assert decisions[1]["agent_votes"] == ["cardiology"]
+    assert router.agent_batches == 1
+
+
+def test_agents_missing_the_deadline_fall_back_to_rules():
+    router = _router(latency=0.5, deadline=0.01)
+    decision = router.make_routing_decision(_patient(1), Priority.RED)
+    assert decision["routing_source"] == "rule_based_fallback"
+    assert decision["agent_votes"] == []
+    assert router.fallback_count == 1
+
+
+def test_abstaining_agents_fall_back_to_rules():
+    router = _router(cache=RoutingDecisionCache())
+    decision = router.make_routing_decision(_patient(1, "sprained ankle"), Priority.GREEN)
+    assert decision["routing_source"] == "rule_based_fallback"
+    assert len(router.cache) == 0
+
+
+def test_sync_wrapper_works_inside_a_running_event_loop():
+    router = _router()
+
+    async def route_from_handler():
+        return router.make_routing_decision(_patient(1), Priority.RED)
+
+    assert asyncio.run(route_from_handler())["routing_source"] == "agents"
+
+
+def test_batcher_groups_requests_within_a_window():
+    env = simpy.Environment()
+    router = _router()
+    batcher = RoutingBatcher(env, router, window=1.0, include_explanation=False)
+    routed = []
+
+    def arrive(delay: float, patient: Patient):
+        yield env.timeout(delay)
+        decision = yield batcher.request(patient, Priority.YELLOW)
+        routed.append((env.now, patient.id, decision["routing_source"]))
+
+    for delay, patient_id in [(0.0, 1), (0.5, 2), (0.9, 3), (2.0, 4)]:
+        env.process(arrive(delay, _patient(patient_id)))
+    env.run()
+
+    assert routed == [(1.0, 1, "agents"), (1.0, 2, "agents"), (1.0, 3, "agents"), (3.0, 4, "agents")]
+    assert batcher.batches_sent == 2
+    assert batcher.requests_routed == 4
+    assert router.agent_batches == 2
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.enums.priority import Priority
+from src.services.arrival_trace import ArrivalTrace
+from src.services.hospital_factory import HospitalFactory
+from src.simulation.simulation import HospitalSimulation
+
+
+def _write(tmp_path, rows, header="arrival_time,priority,symptoms"):
+    path = tmp_path / "arrivals.csv"
+    path.write_text("\n".join([header] + rows) + "\n")
+    return str(path)
+
+
+def test_datetimes_are_replayed_from_the_first_arrival(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["2024-03-01T08:00:00,red,", "2024-03-01T08:45:00,,fever;cough"]))
+    arrivals = list(trace.arrivals())
+
+    assert trace.start == datetime(2024, 3, 1, 8, 0)
+    assert [arrival.time for arrival in arrivals] == [0.0, 45.0]
+    assert arrivals[0].priority == Priority.RED and arrivals[0].symptoms == []
+    assert arrivals[1].priority is None and arrivals[1].symptoms == ["fever", "cough"]
+
+
+def test_rows_before_the_start_are_skipped(tmp_path):
+    path = _write(tmp_path, ["2024-03-01T07:00:00,,", "2024-03-01T08:30:00,,"])
+    trace = ArrivalTrace(path, start=datetime(2024, 3, 1, 8, 0))
+    assert [arrival.time for arrival in trace.arrivals()] == [30.0]
+
+
+def test_minute_offsets_need_no_start(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["0,,", "2.5,green,", "10,,"]))
+    assert trace.start is None
+    assert [arrival.time for arrival in trace.arrivals()] == [0.0, 2.5, 10.0]
+
+
+def test_out_of_order_rows_are_rejected(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["0,,", "20,,", "10,,"]))
+    with pytest.raises(ValueError, match="row 3 is out of order"):
+        list(trace.arrivals())
+
+
+def test_unknown_priority_is_rejected(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["0,purple,"]))
+    with pytest.raises(ValueError, match="Unknown priority"):
+        list(trace.arrivals())
+
+
+def test_utc_offsets_are_compared_across_timezones(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["2024-03-01T08:00:00Z,,", "2024-03-01T09:30:00+01:00,,",
+                                           "2024-03-01T04:00:00-05:00,,"]))
+    assert [arrival.time for arrival in trace.arrivals()] == [0.0, 30.0, 60.0]
+    start = datetime(2024, 3, 1, 8, 15, tzinfo=timezone(timedelta(hours=1)))  # 07:15 UTC
+    assert [arrival.time for arrival in trace.arrivals(start)] == [45.0, 75.0, 105.0]
+
+
+def test_naive_start_with_timezone_aware_times_is_rejected(tmp_path):
+    trace = ArrivalTrace(_write(tmp_path, ["2024-03-01T08:00:00Z,,"]), start=datetime(2024, 3, 1, 7, 0))
+    with pytest.raises(ValueError, match="timezone-aware arrival time .* naive start"):
+        list(trace.arrivals())
+
+
+def test_missing_trace_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="does not exist"):
+        ArrivalTrace(str(tmp_path / "missing.csv"))
+
+
+def test_parquet_trace_matches_csv(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = ["2024-03-01T08:00:00,red,", "2024-03-01T08:10:00,,fever", "2024-03-01T09:00:00,blue,"]
+    csv_trace = ArrivalTrace(_write(tmp_path, rows))
+    table = pa.table({"arrival_time": [row.split(",")[0] for row in rows],
+                      "priority": [row.split(",")[1] or None for row in rows],
+                      "symptoms": [row.split(",")[2] or None for row in rows]})
+    pq.write_table(table, str(tmp_path / "arrivals.parquet"))
+    parquet_trace = ArrivalTrace(str(tmp_path / "arrivals.parquet"), chunk_size=2)
+
+    assert list(parquet_trace.arrivals()) == list(csv_trace.arrivals())
+
+
+def test_simulation_replays_the_trace_from_its_own_start(tmp_path):
+    path = _write(tmp_path, ["2024-03-01T08:00:00Z,red,", "2024-03-01T08:30:00Z,green,",
+                             "2024-03-01T09:00:00Z,blue,"])
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(), 300, seed=1, arrival_trace=ArrivalTrace(path),
+                                    start_time=datetime(2024, 3, 1, 7, 50, tzinfo=timezone.utc))
+    simulation.run_simulation()
+
+    arrivals = [event["timestamp"] for event in simulation.events if event["event_type"] == "PATIENT_ARRIVAL"]
+    assert arrivals == [10.0, 40.0, 70.0]
+
+
+def test_simulation_defaults_to_the_trace_start(tmp_path):
+    path = _write(tmp_path, ["2024-03-01T08:00:00,,", "2024-03-01T08:20:00,,"])
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(), 300, seed=1, arrival_trace=ArrivalTrace(path))
+    simulation.run_simulation()
+
+    assert simulation.start_time == datetime(2024, 3, 1, 8, 0)
+    arrivals = [event["timestamp"] for event in simulation.events if event["event_type"] == "PATIENT_ARRIVAL"]
+    assert arrivals == [0.0, 20.0]
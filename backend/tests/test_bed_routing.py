@@ -0,0 +1,56 @@
+from src.entities.patient.patient import Patient
+from src.entities.patient.symptoms import Symptoms
+from src.enums.bed_type import BedType
+from src.enums.priority import Priority
+from src.services.hospital_factory import HospitalFactory
+from src.services.routing_service import RoutingService
+
+
+def _patient(patient_id: int) -> Patient:
+    return Patient(id=patient_id, name=f"Patient {patient_id}", symptoms=Symptoms(["chest pain"]))
+
+
+def test_sample_hospital_has_critical_care_beds():
+    bed_manager = HospitalFactory.create_hospital(num_beds=5).bed_manager
+    assert [len(bed_manager.get_beds_by_type(bed_type)) for bed_type in BedType] == [1, 1, 3]
+    assert bed_manager.count_available_beds() == 5
+
+
+def test_availability_follows_occupancy():
+    bed_manager = HospitalFactory.create_hospital(num_beds=3).bed_manager
+    icu_bed = bed_manager.get_first_available_bed(BedType.ICU)
+    assert icu_bed is not None
+
+    bed_manager.occupy_bed(icu_bed)
+    assert bed_manager.count_available_beds(BedType.ICU) == 0
+    assert bed_manager.count_available_beds() == 2
+    assert icu_bed not in bed_manager.get_available_beds()
+
+    bed_manager.release_bed(icu_bed)
+    assert bed_manager.get_first_available_bed(BedType.ICU) is icu_bed
+    assert bed_manager.count_available_beds() == 3
+
+
+def test_routing_reserves_beds_by_preference_until_released():
+    hospital = HospitalFactory.create_hospital(num_beds=3)
+    router = RoutingService(hospital)
+
+    red = router.make_routing_decision(_patient(1), Priority.RED)
+    orange = router.make_routing_decision(_patient(2), Priority.ORANGE)
+    assert red["assigned_bed"].bed_type == BedType.ICU
+    assert orange["assigned_bed"].bed_type == BedType.WARD
+
+    # The only free bed left is HDU, taken by the next RED patient; after that none is free
+    assert router.make_routing_decision(_patient(3), Priority.RED)["assigned_bed"].bed_type == BedType.HDU
+    assert router.make_routing_decision(_patient(4), Priority.RED)["assigned_bed"] is None
+    assert hospital.bed_manager.count_available_beds() == 0
+
+    router.release_patient_from_bed(_patient(1), red["assigned_bed"])
+    assert router.make_routing_decision(_patient(5), Priority.RED)["assigned_bed"] is red["assigned_bed"]
+
+
+def test_non_urgent_patients_get_no_bed():
+    hospital = HospitalFactory.create_hospital()
+    decision = RoutingService(hospital).make_routing_decision(_patient(1), Priority.GREEN)
+    assert decision["assigned_bed"] is None and decision["assigned_doctor"] is not None
+    assert hospital.bed_manager.count_available_beds() == 5
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from src.analytics.downsampling import LevelSeries, lttb, min_max
+
+
+def _series(count: int = 10000):
+    rng = np.random.default_rng(3)
+    x = np.cumsum(rng.uniform(0.1, 1.0, count))
+    y = np.cumsum(rng.normal(0, 1, count))
+    return x, y
+
+
+def test_lttb_keeps_the_endpoints_and_returns_the_requested_points():
+    x, y = _series()
+    sampled_x, sampled_y = lttb(x, y, 500)
+
+    assert len(sampled_x) == len(sampled_y) == 500
+    assert (sampled_x[0], sampled_x[-1]) == (x[0], x[-1])
+    assert np.all(np.diff(sampled_x) > 0)
+    assert np.isin(sampled_x, x).all()
+
+
+def test_lttb_keeps_an_isolated_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[537] = 100.0
+    _, sampled_y = lttb(x, y, 50)
+    assert sampled_y.max() == 100.0
+
+
+def test_min_max_keeps_every_bucket_extreme():
+    x, y = _series()
+    sampled_x, sampled_y = min_max(x, y, 400)
+
+    assert len(sampled_x) <= 400
+    assert sampled_y.max() == y.max() and sampled_y.min() == y.min()
+    assert np.all(np.diff(sampled_x) > 0)
+
+
+@pytest.mark.parametrize("downsample", [lttb, min_max])
+def test_short_series_are_returned_unchanged(downsample):
+    x, y = _series(100)
+    sampled_x, sampled_y = downsample(x, y, 500)
+    assert sampled_x is x and sampled_y is y
+
+
+def test_level_series_rebuilds_levels_and_caches_windows():
+    events = [
+        {"event_type": "PATIENT_ARRIVAL", "timestamp": 0.0, "patient_name": "A"},
+        {"event_type": "QUEUE_JOIN", "timestamp": 1.0, "patient_name": "A", "resource_name": "Dr. X"},
+        {"event_type": "PATIENT_ARRIVAL", "timestamp": 2.0, "patient_name": "B"},
+        {"event_type": "QUEUE_JOIN", "timestamp": 2.0, "patient_name": "B", "resource_name": "Dr. X"},
+        {"event_type": "CONSULTATION_START", "timestamp": 3.0, "patient_name": "A", "resource_name": "Dr. X"},
+        {"event_type": "PATIENT_DISCHARGE", "timestamp": 5.0, "patient_name": "A"},
+    ]
+    series = LevelSeries(events)
+
+    times, values = series.series["queue"]["Dr. X"]
+    assert times.tolist() == [1.0, 2.0, 3.0] and values.tolist() == [1, 2, 1]
+    assert series.series["census"]["Patients in hospital"][1].tolist() == [1, 2, 1]
+
+    first = series.downsample("queue", "Dr. X")
+    assert series.downsample("queue", "Dr. X") is first
+    assert (series.hits, series.misses) == (1, 1)
+    with pytest.raises(ValueError):
+        series.downsample("queue", "Dr. X", method="bogus")
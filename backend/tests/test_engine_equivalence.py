@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, Dict, List
+import pytest
+from src.analytics.event_store import EventStore
+from src.enums.simulation_engine import SimulationEngine
+from src.services.hospital_factory import HospitalFactory
+from src.simulation.simulation import HospitalSimulation
+
+START = datetime(2025, 1, 1, 8, 0)
+
+
+def _run(engine: SimulationEngine, mean_inter_arrival_time: float, **kwargs: Any) -> HospitalSimulation:
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(), 480, engine=engine, seed=7, start_time=START,
+                                    mean_inter_arrival_time=mean_inter_arrival_time, fingerprint=True, **kwargs)
+    simulation.run_simulation()
+    return simulation
+
+
+@pytest.mark.parametrize("mean_inter_arrival_time", [15.0, 1.5])
+def test_engines_produce_identical_event_streams(mean_inter_arrival_time: float):
+    simpy_run = _run(SimulationEngine.SIMPY, mean_inter_arrival_time)
+    calendar_run = _run(SimulationEngine.EVENT_CALENDAR, mean_inter_arrival_time)
+
+    assert simpy_run.events == calendar_run.events
+    assert simpy_run.fingerprint is not None and calendar_run.fingerprint is not None
+    assert simpy_run.fingerprint.hexdigest() == calendar_run.fingerprint.hexdigest()
+
+
+@pytest.mark.parametrize("engine", list(SimulationEngine))
+def test_seeded_runs_are_reproducible(engine: SimulationEngine):
+    assert _run(engine, 5.0).events == _run(engine, 5.0).events
+
+
+@pytest.mark.parametrize("engine", list(SimulationEngine))
+def test_stepping_matches_a_full_run(engine: SimulationEngine):
+    stepped = HospitalSimulation(HospitalFactory.create_hospital(), 480, engine=engine, seed=7, start_time=START)
+    events: List[Dict[str, Any]] = []
+    while not stepped.is_finished:
+        events.extend(stepped.step())
+    events.extend(stepped.run_until(480))
+
+    assert events == _run(engine, 15.0).events
+
+
+@pytest.mark.parametrize("engine", list(SimulationEngine))
+def test_beds_are_never_shared(engine: SimulationEngine):
+    simulation = _run(engine, 1.5)
+    occupants: Dict[str, int] = {}
+    for event in simulation.events:
+        if event["event_type"] == "BED_ASSIGNMENT":
+            occupants[event["resource_name"]] = occupants.get(event["resource_name"], 0) + 1
+            assert occupants[event["resource_name"]] == 1
+        elif event["event_type"] == "BED_DISCHARGE":
+            occupants[event["resource_name"]] -= 1
+
+
+@pytest.mark.parametrize("engine", list(SimulationEngine))
+def test_stepped_run_is_flushed_to_the_event_store(tmp_path, engine: SimulationEngine):
+    with EventStore(str(tmp_path / "events.sqlite"), batch_size=1_000_000) as store:
+        simulation = HospitalSimulation(HospitalFactory.create_hospital(), 300, engine=engine, seed=7,
+                                        start_time=START, event_store=store)
+        assert simulation.event_store_run_id is not None
+        while not simulation.is_finished:
+            simulation.step()
+        simulation.step()
+
+        stored = store.query_events(simulation.event_store_run_id)
+        assert len(stored) == len(simulation.events) > 0
+        assert store.list_runs()[0]["total_events"] == len(simulation.events)
@@ -0,0 +1,26 @@
+from src.monitoring.engine_metrics import EngineMetrics, merge_snapshots, render_prometheus
+
+
+def test_latency_buckets_resolve_tens_and_hundreds_of_milliseconds():
+    metrics = EngineMetrics()
+    for seconds in (0.02, 0.04, 0.2, 0.4, 0.7):
+        metrics.routing_latency.observe(seconds)
+
+    text = render_prometheus(metrics.snapshot(), merge_snapshots([]))
+    assert 'simulation_routing_latency_seconds_bucket{le="0.01"} 0' in text
+    assert 'simulation_routing_latency_seconds_bucket{le="0.025"} 1' in text
+    assert 'simulation_routing_latency_seconds_bucket{le="0.05"} 2' in text
+    assert 'simulation_routing_latency_seconds_bucket{le="0.25"} 3' in text
+    assert 'simulation_routing_latency_seconds_bucket{le="0.5"} 4' in text
+    assert 'simulation_routing_latency_seconds_bucket{le="1"} 5' in text
+
+
+def test_throughput_is_exported_as_counters_only():
+    metrics = EngineMetrics()
+    metrics.record_event("PATIENT_ARRIVAL")
+    metrics.record_advance(60.0, 0.5)
+
+    text = render_prometheus(metrics.snapshot(), merge_snapshots([]))
+    assert "simulation_simulated_minutes_total 60.0" in text
+    assert "simulation_wall_seconds_total 0.5" in text
+    assert "per_second" not in text and "per_wall_second" not in text
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional
+import pytest
+from src.analytics.event_analytics import _max_wait_minutes, analyze_events, events_to_columns
+from src.enums.priority import Priority
+from src.services.hospital_factory import HospitalFactory
+from src.simulation.simulation import HospitalSimulation
+
+
+def _event(timestamp: float, event_type: str, patient: str, priority: Optional[str] = None,
+           resource: Optional[str] = None) -> Dict[str, Any]:
+    return {"timestamp": timestamp, "event_type": event_type, "patient_name": patient, "priority": priority,
+            "resource_name": resource, "details": {}}
+
+
+def _journey(patient: str, arrival: float, priority: str, wait: float, bed: Optional[str] = None,
+             stay: float = 0.0) -> List[Dict[str, Any]]:
+    consultation = arrival + 2 + wait
+    events = [
+        _event(arrival, "PATIENT_ARRIVAL", patient),
+        _event(arrival + 2, "TRIAGE_COMPLETE", patient, priority),
+        _event(consultation, "CONSULTATION_START", patient, priority, "Dr. A"),
+        _event(consultation + 10, "CONSULTATION_END", patient, priority, "Dr. A"),
+    ]
+    if bed:
+        events += [_event(consultation + 10, "BED_ASSIGNMENT", patient, priority, bed),
+                   _event(consultation + 10 + stay, "BED_DISCHARGE", patient, priority, bed)]
+    return events + [_event(consultation + 10 + stay, "PATIENT_DISCHARGE", patient)]
+
+
+def _analyze(events: List[Dict[str, Any]], horizon: float) -> Dict[str, Any]:
+    events = sorted(events, key=lambda event: event["timestamp"])
+    return analyze_events(events_to_columns(events, {"duration_minutes": horizon}))
+
+
+@pytest.mark.parametrize("priority, minutes", [(Priority.RED, 0), (Priority.ORANGE, 10), (Priority.YELLOW, 60),
+                                               (Priority.GREEN, 120), (Priority.BLUE, 240)])
+def test_targets_are_parsed_from_max_wait_time(priority: Priority, minutes: float):
+    assert _max_wait_minutes(priority) == minutes
+
+
+def test_breaches_are_measured_from_triage():
+    # Both RED patients are seen the moment triage ends; the ORANGE one waits 11 minutes
+    events = _journey("Ann", 0, "red", 0) + _journey("Bob", 20, "red", 0) + _journey("Cat", 40, "orange", 11)
+    analysis = _analyze(events, 200)
+
+    red, orange = analysis["by_priority"]["red"], analysis["by_priority"]["orange"]
+    assert (red["wait_breaches"], red["wait_breach_rate"]) == (0, 0.0)
+    assert (orange["wait_breaches"], orange["wait_breach_rate"], orange["max_wait_minutes"]) == (1, 1.0, 10)
+    assert orange["waits"]["wait_for_doctor"]["mean"] == 13.0
+
+
+def test_overlapping_bed_stays_count_once():
+    # Two stays on one bed overlap for 50 minutes, and a third runs past the horizon
+    events = (_journey("Ann", 0, "red", 0, "Bed-1", 100) + _journey("Bob", 38, "red", 0, "Bed-1", 100)
+              + _journey("Cat", 150, "red", 0, "Bed-1", 500))
+    utilization = _analyze(events, 200)["utilization"]
+
+    # Ann 12-112 and Bob 50-150 cover 12-150, Cat covers 162-200
+    assert utilization["Bed-1"] == pytest.approx((138 + 38) / 200)
+    assert utilization["Dr. A"] == pytest.approx(30 / 200)
+
+
+def test_simulated_utilization_stays_within_bounds():
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(), 2000, seed=7, mean_inter_arrival_time=2)
+    simulation.run_simulation()
+    analysis = analyze_events(events_to_columns(simulation.events, {"duration_minutes": 2000}))
+
+    assert analysis["utilization"]
+    assert all(0.0 <= value <= 1.0 for value in analysis["utilization"].values())
+    assert analysis["patients"] >= analysis["discharged"] > 0
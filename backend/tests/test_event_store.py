@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional
+import pytest
+from src.analytics.event_store import EventStore
+
+
+def _event(timestamp: float, event_type: str, patient: str, priority: Optional[str] = None,
+           resource: Optional[str] = None) -> Dict[str, Any]:
+    return {"timestamp": timestamp, "event_type": event_type, "patient_name": patient, "priority": priority,
+            "resource_name": resource, "details": {"note": event_type.lower()}}
+
+
+def _journey(patient: str, arrival: float, priority: str, wait: float) -> List[Dict[str, Any]]:
+    return [
+        _event(arrival, "PATIENT_ARRIVAL", patient),
+        _event(arrival + 2, "TRIAGE_COMPLETE", patient, priority),
+        _event(arrival + 2 + wait, "CONSULTATION_START", patient, priority, "Dr. A"),
+        _event(arrival + 30 + wait, "PATIENT_DISCHARGE", patient),
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with EventStore(str(tmp_path / "events.sqlite"), batch_size=3) as event_store:
+        yield event_store
+
+
+def test_runs_round_trip_with_filters(store: EventStore):
+    events = _journey("Ann", 0, "red", 1) + _journey("Bob", 5, "green", 40)
+    run_id = store.add_run(sorted(events, key=lambda event: event["timestamp"]), "General", "2025-01-01T08:00:00",
+                           {"seed": 1}, label="baseline")
+
+    runs = store.list_runs()
+    assert [(run["run_id"], run["label"], run["total_events"], run["config"]) for run in runs] == \
+        [(run_id, "baseline", 8, {"seed": 1})]
+    assert len(store.query_events(run_id)) == 8
+    assert [event["patient_name"] for event in store.query_events(run_id, event_type="CONSULTATION_START")] == ["Ann", "Bob"]
+    assert [event["timestamp"] for event in store.query_events(run_id, patient_name="Bob", start=6, end=47)] == [7.0]
+    assert store.query_events(run_id, limit=2)[1]["details"] == {"note": "triage_complete"}
+
+
+def test_stage_delays_follow_each_journey(store: EventStore):
+    # Ann returns later: her second journey is matched with its own triage
+    events = _journey("Ann", 0, "red", 1) + _journey("Bob", 5, "red", 15) + _journey("Ann", 100, "red", 20)
+    first = store.add_run(sorted(events, key=lambda event: event["timestamp"]))
+    second = store.add_run(_journey("Cat", 0, "orange", 30))
+
+    delays = store.find_stage_delays("TRIAGE_COMPLETE", "CONSULTATION_START", "red", 10)
+    assert [(delay["run_id"], delay["patient"], delay["delay"]) for delay in delays] == \
+        [(first, "Bob", 15.0), (first, "Ann", 20.0)]
+    assert [delay["patient"] for delay in store.find_stage_delays("TRIAGE_COMPLETE", "CONSULTATION_START",
+                                                                  run_ids=[second])] == ["Cat"]
+
+
+def test_incremental_runs_are_flushed_when_ended(store: EventStore):
+    run_id = store.begin_run("General")
+    for event in _journey("Ann", 0, "red", 1)[:2]:
+        store.add(run_id, event)
+    assert store.query_events(run_id) == []  # Still buffered: the batch holds 3 events
+
+    store.end_run(run_id)
+    assert len(store.query_events(run_id)) == 2
+    assert store.list_runs()[0]["total_events"] == 2
+
+
+def test_batch_size_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        EventStore(str(tmp_path / "events.sqlite"), batch_size=0)
@@ -0,0 +1,99 @@
+import json
+import pytest
+from src.entities.triage.triage import FuzzyManchesterTriage
+from src.enums.priority import Priority
+from src.services.fhir_cohort import (CohortPatient, FHIRCohortFactory, _iter_bundle_entries, iter_fhir_resources,
+                                      load_fhir_cohort, parse_fhir_cohort)
+
+
+def _bundle(count: int):
+    # Non-ASCII names make the character and byte offsets of the entries differ
+    return {"resourceType": "Bundle", "type": "collection", "entry": [
+        {"fullUrl": f"urn:uuid:{index}", "resource": {"resourceType": "Patient", "id": str(index),
+                                                      "name": [{"given": [f"José{index}"], "family": "Núñez"}]}}
+        for index in range(count)
+    ]}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_bundle_entries_decode_across_chunk_boundaries(tmp_path, chunk_size: int):
+    path = tmp_path / "bundle.json"
+    path.write_text(json.dumps(_bundle(40), indent=2, ensure_ascii=False), encoding="utf-8")
+
+    resources = list(_iter_bundle_entries(str(path), chunk_size))
+    assert [resource["id"] for resource in resources] == [str(index) for index in range(40)]
+
+
+def test_bundle_without_entries_yields_nothing(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text('{"resourceType": "Bundle", "entry": []}')
+    assert list(_iter_bundle_entries(str(path), 4)) == []
+
+
+def test_malformed_entry_fails_at_the_size_cap_with_its_offset(tmp_path):
+    text = json.dumps(_bundle(20), ensure_ascii=False)
+    bad_entry = text.index('{"fullUrl": "urn:uuid:5"')
+    text = text[:bad_entry] + text[bad_entry:].replace('"id": "5"', '"id": "5",,', 1)
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=f"character {bad_entry} .*larger than 256"):
+        list(_iter_bundle_entries(str(path), chunk_size=16, max_entry_size=256))
+    with pytest.raises(ValueError, match=f"malformed Bundle entry at character {bad_entry}"):
+        list(_iter_bundle_entries(str(path), chunk_size=16))
+
+
+def test_truncated_bundle_raises(tmp_path):
+    text = json.dumps(_bundle(3))
+    path = tmp_path / "truncated.json"
+    path.write_text(text[:-20])
+    with pytest.raises(ValueError, match="malformed Bundle entry"):
+        list(_iter_bundle_entries(str(path), chunk_size=8))
+
+
+def test_cohort_patients_from_ndjson_and_bundle_files(tmp_path):
+    (tmp_path / "Patient.ndjson").write_text(json.dumps(
+        {"resourceType": "Patient", "id": "p1", "name": [{"given": ["Ann12"], "family": "Lee34"}]}) + "\n")
+    (tmp_path / "clinical.json").write_text(json.dumps({"resourceType": "Bundle", "entry": [
+        {"resource": {"resourceType": "Condition", "subject": {"reference": "Patient/p1"},
+                      "onsetDateTime": "2024-01-01", "code": {"text": "Acute myocardial infarction"}}},
+        {"resource": {"resourceType": "Condition", "subject": {"reference": "Patient/p1"},
+                      "onsetDateTime": "2020-01-01", "code": {"text": "Essential hypertension"}}},
+        {"resource": {"resourceType": "Observation", "subject": {"reference": "Patient/p1"},
+                      "effectiveDateTime": "2024-01-01", "code": {"coding": [{"code": "8310-5"}]},
+                      "valueQuantity": {"value": 39.4}}},
+    ]}))
+
+    assert len(list(iter_fhir_resources(str(tmp_path)))) == 4
+    cohort = parse_fhir_cohort([str(tmp_path)])
+    assert cohort == [CohortPatient("Ann Lee", ["high fever", "chest pain"], "Patient has history of hypertension. ")]
+
+    cache_file = str(tmp_path / "cohort_cache.txt")
+    assert load_fhir_cohort([str(tmp_path)], cache_file) == cohort
+    assert load_fhir_cohort([str(tmp_path)], cache_file) == cohort
+
+
+def test_factory_draws_patients_that_triage_to_the_target_priority():
+    cohort = [CohortPatient("Red", ["cardiac arrest"], "No significant medical history."),
+              CohortPatient("Green", ["sprain"], "No significant medical history."),
+              CohortPatient("Yellow", ["fever"], "No significant medical history.")]
+    factory = FHIRCohortFactory(cohort, seed=1)
+    triage = FuzzyManchesterTriage()
+
+    for _ in range(3):
+        assert triage.determine_priority(factory.create_patient(Priority.RED)) == Priority.RED
+        assert factory.create_patient(Priority.GREEN).name == "Green"
+    assert {factory.create_patient().name for _ in range(3)} == {"Red", "Green", "Yellow"}
+    with pytest.raises(ValueError, match="blue"):
+        factory.create_patient(Priority.BLUE)
+
+
+def test_factory_rejects_an_empty_cohort():
+    with pytest.raises(ValueError):
+        FHIRCohortFactory([])
+
+
+def test_factory_ids_are_unique_across_reshuffles():
+    factory = FHIRCohortFactory([CohortPatient(f"Patient {index}", ["fever"], "") for index in range(10)], seed=1)
+    ids = [factory.create_patient().id for _ in range(1000)]
+    assert len(set(ids)) == 1000
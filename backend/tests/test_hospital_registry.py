@@ -0,0 +1,45 @@
+import pytest
+from src.entities.patient.patient import Patient
+from src.entities.patient.symptoms import Symptoms
+from src.services.hospital_factory import HospitalFactory
+from src.services.patient_factory import PatientFactory
+
+
+def test_admit_lookup_and_discharge():
+    hospital = HospitalFactory.create_hospital()
+    patients = PatientFactory(seed=1).create_patients(3)
+    for patient in patients:
+        hospital.admit_patient(patient)
+
+    assert hospital.get_active_patient_count() == 3
+    assert hospital.get_patient(patients[1].id) is patients[1]
+
+    hospital.discharge_patient(patients[1])
+    assert hospital.get_patient(patients[1].id) is None
+    assert hospital.get_active_patient_count() == 2
+
+    hospital.discharge_patient(patients[1])  # Already gone: ignored
+    assert hospital.get_active_patient_count() == 2
+
+
+def test_readmitting_the_same_patient_is_allowed():
+    hospital = HospitalFactory.create_hospital()
+    patient = PatientFactory(seed=1).create_patient()
+    hospital.admit_patient(patient)
+    hospital.admit_patient(patient)
+    assert hospital.get_active_patient_count() == 1
+
+
+def test_duplicate_ids_are_rejected():
+    hospital = HospitalFactory.create_hospital()
+    hospital.admit_patient(Patient(id=7, name="Ann Lee", symptoms=Symptoms(["fever"])))
+    with pytest.raises(ValueError, match="Patient id 7 is already registered to Ann Lee"):
+        hospital.admit_patient(Patient(id=7, name="Bob Ray", symptoms=Symptoms(["cough"])))
+    assert hospital.get_patient(7).name == "Ann Lee"
+
+
+def test_factory_ids_are_unique():
+    factory = PatientFactory(seed=1)
+    patients = factory.create_patients(5000) + factory.create_mixed_priority_patients(50)
+    assert len({patient.id for patient in patients}) == len(patients)
+    assert [patient.id for patient in patients[:3]] == [1, 2, 3]
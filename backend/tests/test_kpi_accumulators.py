@@ -0,0 +1,53 @@
+import random
+import numpy as np
+import pytest
+from src.monitoring.kpi_accumulators import P2Quantile, WelfordAccumulator
+
+
+@pytest.mark.parametrize("quantile", [0.5, 0.9, 0.95])
+def test_p2_quantile_tracks_the_exact_quantile(quantile: float):
+    rng = random.Random(1)
+    values = [rng.expovariate(1 / 30) for _ in range(20000)]
+    sketch = P2Quantile(quantile)
+    for value in values:
+        sketch.add(value)
+
+    estimate = sketch.value()
+    assert estimate is not None
+    assert estimate == pytest.approx(float(np.quantile(values, quantile)), rel=0.05)
+
+
+def test_p2_quantile_is_exact_for_the_first_observations():
+    sketch = P2Quantile(0.5)
+    assert sketch.value() is None
+    for value in (5.0, 1.0, 3.0):
+        sketch.add(value)
+    assert sketch.value() == 3.0
+
+
+def test_p2_quantile_handles_constant_input():
+    sketch = P2Quantile(0.9)
+    for _ in range(1000):
+        sketch.add(4.0)
+    assert sketch.value() == 4.0
+
+
+@pytest.mark.parametrize("quantile", [0.0, 1.0, -0.5])
+def test_p2_quantile_rejects_invalid_quantiles(quantile: float):
+    with pytest.raises(ValueError):
+        P2Quantile(quantile)
+
+
+def test_welford_merge_matches_a_single_pass():
+    rng = random.Random(2)
+    values = [rng.gauss(20, 5) for _ in range(1000)]
+    left, right, combined = WelfordAccumulator(), WelfordAccumulator(), WelfordAccumulator()
+    for index, value in enumerate(values):
+        (left if index % 3 else right).add(value)
+        combined.add(value)
+    left.merge(right)
+
+    assert left.count == combined.count == len(values)
+    assert left.mean == pytest.approx(np.mean(values))
+    assert left.variance == pytest.approx(combined.variance)
+    assert combined.variance == pytest.approx(np.var(values, ddof=1))
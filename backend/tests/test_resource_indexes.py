@@ -0,0 +1,126 @@
+from src.entities.doctor.doctor import Doctor
+from src.entities.patient.patient import Patient
+from src.entities.patient.symptoms import Symptoms
+from src.managers.availability_index import AvailabilityIndex
+from src.managers.doctor_manager import DoctorManager
+from src.managers.queue_length_index import QueueLengthIndex
+
+
+def _doctors(count: int, specialty: str = "Emergency Medicine"):
+    return [Doctor(id=index, name=f"Doctor {index}", specialty=specialty) for index in range(1, count + 1)]
+
+
+def _patient(patient_id: int) -> Patient:
+    return Patient(id=patient_id, name=f"Patient {patient_id}", symptoms=Symptoms(["fever"]))
+
+
+def _least_loaded_by_scan(manager: DoctorManager):
+    available = manager.get_available_doctors()
+    return min(available, key=lambda d: d.get_total_patients_in_queue()) if available else None
+
+
+def test_availability_index_rejoins_at_the_back():
+    index = AvailabilityIndex()
+    doctors = _doctors(3)
+    for doctor in doctors:
+        index.add(doctor)
+
+    doctors[0].set_available(False)
+    assert index.get_available() == doctors[1:]
+    assert index.count_available() == 2
+
+    doctors[0].set_available(True)
+    assert index.get_available() == [doctors[1], doctors[2], doctors[0]]
+    assert index.first_available() is doctors[1]
+
+    index.remove(doctors[1])
+    doctors[1].set_available(False)
+    doctors[1].set_available(True)
+    assert index.get_available() == [doctors[2], doctors[0]]
+    assert len(index) == 2
+
+
+def test_queue_length_index_follows_queue_changes():
+    index = QueueLengthIndex()
+    doctors = _doctors(3)
+    for doctor in doctors:
+        index.add(doctor)
+    assert index.least_loaded() is doctors[0]
+
+    doctors[0].add_patient_to_queue(_patient(1), "red")
+    doctors[1].add_patient_to_queue(_patient(2), "green")
+    assert index.least_loaded() is doctors[2]
+
+    doctors[2].add_patient_to_queue(_patient(3), "blue")
+    doctors[2].add_patient_to_queue(_patient(4), "blue")
+    assert index.least_loaded() is doctors[0]  # Tied at one patient: first available wins
+
+    assert doctors[0].get_next_patient().id == 1
+    assert index.least_loaded() is doctors[0]
+    doctors[0].add_patient_to_queue(_patient(5), "yellow")
+    doctors[0].add_patient_to_queue(_patient(6), "yellow")
+    doctors[1].remove_patient_from_queue(doctors[1].get_current_serving_patient())
+    assert index.least_loaded() is doctors[1]
+
+
+def test_queue_length_index_skips_unavailable_and_removed_doctors():
+    index = QueueLengthIndex()
+    doctors = _doctors(2)
+    for doctor in doctors:
+        index.add(doctor)
+
+    doctors[0].set_available(False)
+    assert index.least_loaded() is doctors[1]
+    doctors[0].add_patient_to_queue(_patient(1))  # Queue changes while off duty are ignored
+    index.remove(doctors[1])
+    assert index.least_loaded() is None
+
+    doctors[0].set_available(True)
+    assert index.least_loaded() is doctors[0]
+    assert len(index) == 1
+
+
+def test_queue_length_index_compacts_stale_entries():
+    index = QueueLengthIndex()
+    doctor = _doctors(1)[0]
+    index.add(doctor)
+    for patient_id in range(200):
+        doctor.add_patient_to_queue(_patient(patient_id))
+    assert len(index._heap) <= 2 * len(index._entries) + 16
+    assert index.least_loaded() is doctor
+
+
+def test_least_loaded_doctor_matches_a_full_scan():
+    manager = DoctorManager()
+    doctors = _doctors(6)
+    for doctor in doctors:
+        manager.add_doctor(doctor)
+
+    for step in range(60):
+        doctor = doctors[(step * 7) % len(doctors)]
+        if step % 5 == 0:
+            doctor.set_available(not doctor.is_available())
+        elif step % 3 == 0:
+            doctor.get_next_patient()
+        else:
+            doctor.add_patient_to_queue(_patient(step))
+        assert manager.get_least_loaded_doctor() is _least_loaded_by_scan(manager)
+
+    manager.remove_doctor(doctors[0])
+    assert manager.get_least_loaded_doctor() is _least_loaded_by_scan(manager)
+
+
+def test_specialty_lookup_is_case_insensitive():
+    manager = DoctorManager()
+    cardiologists = _doctors(2, "Cardiology")
+    neurologist = Doctor(id=3, name="Doctor 3", specialty="Neurology")
+    for doctor in cardiologists + [neurologist]:
+        manager.add_doctor(doctor)
+
+    assert manager.get_doctors_by_specialty("cardiology") == cardiologists
+    assert manager.get_doctors_by_specialty("NEUROLOGY") == [neurologist]
+    assert manager.get_doctors_by_specialty("Oncology") == []
+
+    manager.get_doctors_by_specialty("Cardiology").clear()  # Callers get a copy
+    manager.remove_doctor(cardiologists[0])
+    assert manager.get_doctors_by_specialty("Cardiology") == [cardiologists[1]]
@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+from src.analytics.run_catalog import RUN_CATALOG_FILE, RunCatalog
+from src.services.hospital_factory import HospitalFactory
+from src.simulation.simulation import HospitalSimulation
+
+INFO = {"hospital_name": "General", "start_time": "2025-01-01T08:00:00", "duration_minutes": 480, "total_events": 12}
+
+
+def _export(directory, name: str, simulation_info) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        json.dump({"simulation_info": simulation_info, "events": []}, f)
+    return path
+
+
+def _touch_later(path: str) -> None:
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_recorded_runs_keep_their_kpis_across_syncs(tmp_path):
+    path = _export(tmp_path, "hospital_simulation_1.json", INFO)
+    with RunCatalog(str(tmp_path)) as catalog:
+        catalog.record_run(path, INFO, {"seed": 4, "engine": "simpy"}, {"patients": 30, "four_hour_breach_rate": float("nan")})
+        assert catalog.sync() == (0, 0)
+
+        run = catalog.get_run(path)
+        assert run is not None and run.seed == 4 and run.kpis == {"patients": 30, "four_hour_breach_rate": None}
+
+
+def test_sync_indexes_new_and_edited_files_and_forgets_deleted_ones(tmp_path):
+    first = _export(tmp_path, "hospital_simulation_1.json", INFO)
+    _export(tmp_path, "hospital_simulation_2.json", dict(INFO, hospital_name="Royal"))
+    _export(tmp_path, "unrelated.json", INFO)
+    with RunCatalog(str(tmp_path)) as catalog:
+        assert catalog.sync() == (2, 0)
+        assert catalog.distinct_values("hospital_name") == ["General", "Royal"]
+
+        _export(tmp_path, "hospital_simulation_1.json", dict(INFO, total_events=99))
+        _touch_later(first)
+        assert catalog.sync() == (1, 0)
+        assert catalog.get_run(first).total_events == 99
+
+        os.remove(first)
+        assert catalog.sync() == (0, 1)
+        assert [run.file_name for run in catalog.list_runs()] == ["hospital_simulation_2.json"]
+
+
+def test_unreadable_files_are_recorded_and_retried_once_changed(tmp_path):
+    path = os.path.join(tmp_path, "hospital_simulation_bad.json")
+    with open(path, "w") as f:
+        f.write("{")
+    with RunCatalog(str(tmp_path)) as catalog:
+        assert catalog.sync() == (0, 0)
+        assert list(catalog.failed_files()) == ["hospital_simulation_bad.json"]
+        assert catalog.failed_files()["hospital_simulation_bad.json"].startswith("JSONDecodeError")
+        assert catalog.sync() == (0, 0)
+
+        _export(tmp_path, "hospital_simulation_bad.json", INFO)
+        _touch_later(path)
+        assert catalog.sync() == (1, 0)
+        assert catalog.failed_files() == {}
+
+
+def test_list_runs_rejects_unknown_sort_columns(tmp_path):
+    with RunCatalog(str(tmp_path)) as catalog:
+        with pytest.raises(ValueError):
+            catalog.list_runs(order_by="file_name; DROP TABLE runs")
+
+
+def test_exports_are_only_catalogued_on_request(tmp_path):
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(), 60, seed=1)
+    simulation.run_simulation()
+
+    plain = simulation.export_events_to_json(str(tmp_path / "hospital_simulation_1.json"))
+    assert not os.path.exists(tmp_path / RUN_CATALOG_FILE)
+
+    catalogued = simulation.export_events_to_json(str(tmp_path / "hospital_simulation_2.json"), catalog=True)
+    with RunCatalog(str(tmp_path)) as catalog:
+        assert catalog.get_run(plain) is None
+        run = catalog.get_run(catalogued)
+        assert run is not None and run.seed == 1
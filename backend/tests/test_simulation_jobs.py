@@ -0,0 +1,91 @@
+import asyncio
+import queue
+from datetime import datetime, timedelta
+from src.services.simulation_jobs import (DONE_MESSAGE, EVENTS_MESSAGE, METRICS_MESSAGE, SimulationJob,
+                                          SimulationJobManager, run_simulation_replication)
+
+CONFIG = {"hospital": {"sample": False, "num_doctors": 2, "num_beds": 2}, "horizon_minutes": 120, "seed": 3,
+          "replications": 2, "engine": "simpy", "stream_events": True}
+
+
+def test_message_log_is_bounded_and_cursors_survive_drops():
+    job = SimulationJob(job_id="job", config=CONFIG)
+    for index in range(1500):
+        job.publish(EVENTS_MESSAGE, {"events": [{"index": index}] * 2})
+
+    assert len(job.messages) == 1000 and job.message_count == 1500
+    assert job.retained_events == 2000 and job.retained_bytes > 0
+    start, messages = job.messages_since(0)
+    assert start == 500 and messages[0]["data"]["events"][0]["index"] == 500
+    start, messages = job.messages_since(1490)
+    assert start == 1490 and len(messages) == 10
+    assert job.messages_since(1500) == (1500, [])
+
+
+def test_replication_streams_tagged_messages():
+    message_queue: "queue.Queue" = queue.Queue()
+    summary = run_simulation_replication("job", CONFIG, 1, 3, message_queue, chunk_minutes=60)
+
+    messages = []
+    while not message_queue.empty():
+        messages.append(message_queue.get())
+    assert {message[0] for message in messages} == {"job"} and {message[2] for message in messages} == {1}
+    kinds = [message[1] for message in messages]
+    assert kinds[-1] == DONE_MESSAGE and kinds.count(METRICS_MESSAGE) == 2
+    streamed = sum(len(message[3]) for message in messages if message[1] == EVENTS_MESSAGE)
+    assert streamed == summary["total_events"] > 0
+    assert summary["online_kpis"] is not None
+
+
+def test_finished_jobs_expire_after_the_ttl():
+    manager = SimulationJobManager(finished_job_ttl=60)
+    old, recent, running = (SimulationJob(job_id=job_id, config=CONFIG) for job_id in ("old", "recent", "running"))
+    old.status, old.finished_at = "completed", datetime.now() - timedelta(seconds=120)
+    recent.status, recent.finished_at = "failed", datetime.now()
+    manager.jobs = {job.job_id: job for job in (old, recent, running)}
+
+    assert [job.job_id for job in manager.list_jobs()] == ["recent", "running"]
+    assert manager.get_job("old") is None and manager.active_job_count() == 1
+
+
+def test_jobs_run_on_the_worker_pool():
+    async def run() -> SimulationJob:
+        manager = SimulationJobManager(max_workers=2)
+        try:
+            job = manager.submit(dict(CONFIG))
+            while not job.is_finished:
+                await job.wait_for_update(timeout=5)
+            return job
+        finally:
+            await manager.shutdown()
+
+    job = asyncio.run(run())
+    assert job.status == "completed", job.errors
+    assert job.replications_completed == 2 and len(job.kpis) == 2
+    assert job.event_count == sum(kpis["total_events"] for kpis in job.kpis) > 0
+    assert {message["type"] for message in job.messages} == {"status", "events", "kpis"}
+
+
+def test_worker_dying_silently_leaves_no_getter_on_the_job_queue(monkeypatch):
+    monkeypatch.setattr("src.services.simulation_jobs.DRAIN_TIMEOUT", 0.01)
+
+    async def run():
+        manager = SimulationJobManager()
+        loop = asyncio.get_running_loop()
+
+        def start_replications(job):
+            future = loop.create_future()
+            future.set_exception(RuntimeError("worker died"))
+            return [future]
+
+        manager._start_replications = start_replications
+        job = SimulationJob(job_id="job", config=dict(CONFIG, replications=1))
+        job_queue: "asyncio.Queue" = asyncio.Queue()
+        await manager._collect_job(job, job_queue)
+        await asyncio.sleep(0)
+        return job, job_queue, asyncio.all_tasks() - {asyncio.current_task()}
+
+    job, job_queue, leftover_tasks = asyncio.run(run())
+    assert job.status == "failed" and job.errors == ["replication 0: RuntimeError('worker died')"]
+    assert not leftover_tasks
+    assert not job_queue._getters
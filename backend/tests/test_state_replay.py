@@ -0,0 +1,36 @@
+from src.analytics.state_replay import StateReplayEngine
+from src.services.hospital_factory import HospitalFactory
+from src.simulation.simulation import HospitalSimulation
+
+
+def _events():
+    simulation = HospitalSimulation(HospitalFactory.create_hospital(num_mri=3, num_ultrasonic=1), 600, seed=7,
+                                    mean_inter_arrival_time=5)
+    return simulation.run_simulation()
+
+
+def test_resources_are_discovered_from_the_log():
+    engine = StateReplayEngine(_events())
+    assert engine.resources["doctor"] == ["Dr. Brown", "Dr. Johnson", "Dr. Smith", "Dr. Williams"]
+    assert engine.resources["bed"] == [f"Bed-{index}" for index in range(1, 6)]
+    assert engine.resources["mri"] == ["MRI-1", "MRI-2", "MRI-3"]
+    assert engine.resources["ultrasonic"] == ["Ultrasonic-1"]
+
+
+def test_seeking_matches_replaying_from_the_start():
+    events = _events()
+    engine = StateReplayEngine(events, keyframe_interval=25)
+    assert len(engine.keyframes) > 2
+
+    for position in (0, 1, 24, 25, 26, 137, len(events) - 1, len(events)):
+        expected = StateReplayEngine(events, keyframe_interval=len(events) + 1).state_at_position(position)
+        state = engine.state_at_position(position)
+        assert (state.active_patients, state.resource_status) == (expected.active_patients, expected.resource_status)
+        assert state.processed_patients == expected.processed_patients
+
+
+def test_states_are_independent_copies():
+    engine = StateReplayEngine(_events(), keyframe_interval=10)
+    state = engine.state_at(120.0)
+    state.active_patients.clear()
+    assert engine.state_at(120.0).active_patients
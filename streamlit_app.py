@@ -1,9 +1,19 @@
 import streamlit as st
+import heapq
 import json
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import os
+import sys
+
+# Add the backend src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'src'))
+
+from analytics.downsampling import LevelSeries
+from analytics.run_catalog import RunCatalog
+from analytics.state_replay import ReplayState, StateReplayEngine
 
 # Set page config
 st.set_page_config(
@@ -27,12 +37,72 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_simulation_data(file_path: str) -> Optional[Dict[str, Any]]:
-    """Load simulation data from JSON file"""
+@dataclass
+class EventIndex:
+    """Lookups over a run's events, built once per file version"""
+    sorted_events: List[Dict[str, Any]]  # By timestamp; ties keep log order
+    by_patient: Dict[str, List[Dict[str, Any]]]  # Each patient's events in timestamp order
+    by_type: Dict[str, List[int]]  # Positions in sorted_events for each event type
+    patient_names: List[str]
+    event_types: List[str]
+    latest_routing: List[int]  # Position of the latest ROUTING_DECISION at or before each position, -1 if none
+    routing_by_patient: Dict[str, int]  # Position of each patient's routing decision
+
+    def routing_decision_at(self, position: int, patient_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The patient's routing decision if already made at ``position``, else the latest one so far"""
+        routing_position = self.routing_by_patient.get(patient_name, -1) if patient_name else -1
+        if not 0 <= routing_position <= position:
+            routing_position = self.latest_routing[position]
+        return self.sorted_events[routing_position] if routing_position >= 0 else None
+
+    def events_of_types(self, event_types: List[str]) -> List[Dict[str, Any]]:
+        """Events of the given types in timestamp order, without scanning the whole log"""
+        positions = heapq.merge(*(self.by_type.get(event_type, []) for event_type in event_types))
+        return [self.sorted_events[position] for position in positions]
+
+def build_event_index(events: List[Dict[str, Any]]) -> EventIndex:
+    """Index events by patient and type in a single pass over the timestamp-sorted log"""
+    sorted_events = sorted(events, key=lambda x: x['timestamp'])
+    by_patient: Dict[str, List[Dict[str, Any]]] = {}
+    by_type: Dict[str, List[int]] = {}
+    latest_routing: List[int] = []
+    routing_by_patient: Dict[str, int] = {}
+    latest_routing_position = -1
+    for position, event in enumerate(sorted_events):
+        if event['patient_name'] != 'SYSTEM':
+            by_patient.setdefault(event['patient_name'], []).append(event)
+        by_type.setdefault(event['event_type'], []).append(position)
+        if event['event_type'] == 'ROUTING_DECISION':
+            latest_routing_position = position
+            routing_by_patient.setdefault(event['patient_name'], position)
+        latest_routing.append(latest_routing_position)
+    return EventIndex(sorted_events, by_patient, by_type, sorted(by_patient), sorted(by_type),
+                      latest_routing, routing_by_patient)
+
+@st.cache_resource(max_entries=4, show_spinner="Loading simulation...")
+def _load_indexed_simulation(backend_path: str, modified_time: float) -> Tuple[Dict[str, Any], EventIndex]:
+    """Parse and index a simulation file; cached per (path, modification time) and shared read-only across reruns"""
+    with open(backend_path, 'r') as f:
+        simulation_data = json.load(f)
+    return simulation_data, build_event_index(simulation_data['events'])
+
+@st.cache_resource(max_entries=4, show_spinner="Building replay keyframes...")
+def _load_replay_engine(backend_path: str, modified_time: float) -> StateReplayEngine:
+    """Keyframed replay of a simulation file; cached alongside its event index"""
+    _, event_index = _load_indexed_simulation(backend_path, modified_time)
+    return StateReplayEngine(event_index.sorted_events)
+
+@st.cache_resource(max_entries=4, show_spinner="Building queue and occupancy series...")
+def _load_level_series(backend_path: str, modified_time: float) -> LevelSeries:
+    """Queue and occupancy series of a simulation file; downsampled windows are cached inside"""
+    _, event_index = _load_indexed_simulation(backend_path, modified_time)
+    return LevelSeries(event_index.sorted_events)
+
+def load_simulation_data(file_path: str) -> Optional[Tuple[Dict[str, Any], EventIndex]]:
+    """Load simulation data from JSON file together with its event index"""
     backend_path = os.path.join('backend', os.path.basename(file_path))
     try:
-        with open(backend_path, 'r') as f:
-            return json.load(f)
+        return _load_indexed_simulation(backend_path, os.path.getmtime(backend_path))
     except FileNotFoundError:
         st.error(f"Simulation file not found: {backend_path}")
         return None
@@ -57,9 +127,9 @@ def format_event_time(timestamp: float, start_time: str) -> str:
     event_dt = start_dt + timedelta(minutes=timestamp)
     return event_dt.strftime("%H:%M:%S")
 
-def display_patient_journey(events: List[Dict[str, Any]], patient_name: str):
+def display_patient_journey(event_index: EventIndex, patient_name: str):
     """Display journey for a specific patient"""
-    patient_events = [e for e in events if e['patient_name'] == patient_name]
+    patient_events = event_index.by_patient.get(patient_name, [])
     
     if not patient_events:
         st.warning(f"No events found for patient: {patient_name}")
@@ -81,16 +151,36 @@ def display_patient_journey(events: List[Dict[str, Any]], patient_name: str):
             </div>
             """, unsafe_allow_html=True)
 
-def display_hospital_status(events: List[Dict[str, Any]]):
+CHART_POINTS = 500  # Per line, whatever the window length
+
+def display_level_chart(level_series: LevelSeries):
+    """Queue, occupancy and census over a zoomable window, downsampled to a fixed number of points per line"""
+    st.subheader("📈 Queues and Occupancy Over Time")
+    series_labels = {"Queue length": "queue", "Occupancy": "occupancy", "Patients in hospital": "census"}
+    kind = series_labels[st.radio("Series", list(series_labels), horizontal=True)]
+    if level_series.duration <= 0 or not level_series.names(kind):
+        st.info("No data for this series")
+        return
+    
+    start, end = st.slider("🔍 Time Window (minutes)", 0.0, level_series.duration, (0.0, level_series.duration), 1.0)
+    chart_data: Dict[str, List[Any]] = {"Minute": [], "Resource": [], "Level": []}
+    for name in level_series.names(kind):
+        minutes, levels = level_series.downsample(kind, name, start, end, CHART_POINTS)
+        chart_data["Minute"].extend(minutes.tolist())
+        chart_data["Resource"].extend([name] * len(minutes))
+        chart_data["Level"].extend(levels.tolist())
+    st.line_chart(chart_data, x="Minute", y="Level", color="Resource")
+
+def display_hospital_status(event_index: EventIndex):
     """Display current hospital status"""
     # Get latest hospital status event
-    status_events = [e for e in events if e['event_type'] == 'HOSPITAL_STATUS']
+    status_positions = event_index.by_type.get('HOSPITAL_STATUS', [])
     
-    if not status_events:
+    if not status_positions:
         st.warning("No hospital status data available")
         return
     
-    latest_status = status_events[-1]
+    latest_status = event_index.sorted_events[status_positions[-1]]
     stats = latest_status['details']['statistics']
     queues = latest_status['details']['queue_summary']
     
@@ -131,390 +221,301 @@ def display_hospital_status(events: List[Dict[str, Any]]):
             </div>
             """, unsafe_allow_html=True)
 
-def display_hospital_layout(active_patients: Dict[str, Any], resource_status: Dict[str, List[str]], processed_patients: Optional[List[Dict[str, Any]]] = None, simulation_data: Optional[Dict[str, Any]] = None, current_event: Optional[Dict[str, Any]] = None):
-    """Display visual hospital layout with resources and patient queues"""
-    st.markdown("### 🏥 Hospital Layout with Live Patient Queues")
-    
-    # Create columns for different areas - ordered: Triage, Routing Agent, Doctors, Equipment, Beds, Processed
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    
-    with col1:
-        st.markdown("#### 🚪 Entrance & Triage")
-        
-        # Get patients at entrance or being triaged
-        entrance_patients = [name for name, info in active_patients.items() 
-                           if info.get('location') in ['Entrance', 'Triage']]
-        
-        with st.container():
-            # Get patient details for entrance/triage
-            entrance_patient_cards: List[str] = []
-            for p in entrance_patients:
-                if p in active_patients:
-                    patient_info = active_patients[p]
-                    priority = patient_info.get('priority', 'pending')
-                    status = patient_info.get('status', 'Unknown')
-                    
-                    # Handle pending priority with gray color
-                    if priority == 'pending':
-                        priority_color = '#9e9e9e'  # Gray for pending
-                        priority_display = 'PENDING'
-                    else:
-                        priority_color = get_priority_color_hex(priority)
-                        priority_display = priority.upper()
-                    
-                    entrance_patient_cards.append(
-                        f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px;">'
-                        f'<strong>{p}</strong><br>'
-                        f'🚨 {priority_display}<br>'
-                        f'📋 {status}'
-                        f'</div>'
-                    )
-            
-            if entrance_patient_cards:
-                st.markdown(f"""
-                <div style="background: #e3f2fd; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #2196f3; min-height: 120px;">
-                    <h5 style="color: #1976d2; margin: 0 0 8px 0;">🚪 Entrance/Triage</h5>
-                    <div style="max-height: 200px; overflow-y: auto;">
-                        {''.join(entrance_patient_cards)}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
-                    <div style="text-align: center;">
-                        <h5 style="color: #666; margin: 0;">🚪 Entrance/Triage</h5>
-                        <p style="color: #999; font-size: 12px; margin: 5px 0;">✅ No patients</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("#### 🤖 Routing Agent")
-        
-        # Check if current event is a routing decision
-        if current_event and current_event.get('event_type') == 'ROUTING_DECISION':
-            details = current_event.get('details', {})
-            assign_doctor = details.get('assign_doctor', False)
-            assign_bed = details.get('assign_bed', False)
-            patient_name = current_event.get('patient_name', 'Unknown')
-            priority = current_event.get('priority', 'unknown')
-            
-            st.markdown(f"""
-            <div style="background: #fff3e0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #ff9800; min-height: 120px;">
-                <h5 style="color: #f57c00; margin: 0 0 8px 0;">🤖 Processing Decision</h5>
-                <p style="margin: 5px 0; font-size: 12px;"><strong>👤 Patient:</strong> {patient_name}</p>
-                <p style="margin: 5px 0; font-size: 12px;"><strong>🚨 Priority:</strong> {priority.upper()}</p>
-                <div style="background: #f5f5f5; padding: 8px; border-radius: 4px; margin: 8px 0;">
-                    <p style="margin: 3px 0; font-size: 11px;">👨‍⚕️ <strong>Doctor:</strong> <span style="color: {'green' if assign_doctor else 'red'}; font-weight: bold;">{'✅ YES' if assign_doctor else '❌ NO'}</span></p>
-                    <p style="margin: 3px 0; font-size: 11px;">🛏️ <strong>Urgent Bed:</strong> <span style="color: {'green' if assign_bed else 'red'}; font-weight: bold;">{'✅ YES' if assign_bed else '❌ NO'}</span></p>
+LAYOUT_COLUMNS = 6  # Triage, Routing Agent, Doctors, Equipment, Beds, Processed
+
+# Equipment kind -> (label, icon, background, border, title colour) of its layout panel
+EQUIPMENT_PANELS: Dict[str, Tuple[str, str, str, str, str]] = {
+    "mri": ("MRI Machines", "🔬", "#f3e5f5", "#9c27b0", "#7b1fa2"),
+    "ultrasonic": ("Ultrasonic Machines", "🔊", "#e8f5e8", "#4caf50", "#2e7d32")
+}
+
+def _empty_panel(title: str, message: str) -> str:
+    return f"""
+    <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
+        <div style="text-align: center;">
+            <h5 style="color: #666; margin: 0;">{title}</h5>
+            <p style="color: #999; font-size: 12px; margin: 5px 0;">{message}</p>
+        </div>
+    </div>
+    """
+
+def _routing_panel(title: str, decision: Dict[str, Any]) -> str:
+    details = decision.get('details', {})
+    assign_doctor = details.get('assign_doctor', False)
+    assign_bed = details.get('assign_bed', False)
+    patient_name = decision.get('patient_name', 'Unknown')
+    priority = decision.get('priority', 'unknown')
+    return f"""
+    <div style="background: #fff3e0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #ff9800; min-height: 120px;">
+        <h5 style="color: #f57c00; margin: 0 0 8px 0;">{title}</h5>
+        <p style="margin: 5px 0; font-size: 12px;"><strong>👤 Patient:</strong> {patient_name}</p>
+        <p style="margin: 5px 0; font-size: 12px;"><strong>🚨 Priority:</strong> {priority.upper()}</p>
+        <div style="background: #f5f5f5; padding: 8px; border-radius: 4px; margin: 8px 0;">
+            <p style="margin: 3px 0; font-size: 11px;">👨‍⚕️ <strong>Doctor:</strong> <span style="color: {'green' if assign_doctor else 'red'}; font-weight: bold;">{'✅ YES' if assign_doctor else '❌ NO'}</span></p>
+            <p style="margin: 3px 0; font-size: 11px;">🛏️ <strong>Urgent Bed:</strong> <span style="color: {'green' if assign_bed else 'red'}; font-weight: bold;">{'✅ YES' if assign_bed else '❌ NO'}</span></p>
+        </div>
+        <p style="margin: 5px 0; font-size: 10px; color: #666; font-style: italic;">💡 {('High priority: Both doctor and bed' if assign_bed else 'Standard: Doctor only')}</p>
+    </div>
+    """
+
+def _equipment_blocks(label: str, icon: str, machines: List[str], background: str, border: str, title_color: str, active_patients: Dict[str, Any], resource_status: Dict[str, List[str]]) -> List[str]:
+    blocks = [f"**{icon} {label}**"]
+    for machine in machines:
+        machine_cards: List[str] = []
+        for p in resource_status.get(machine, []):
+            if p in active_patients:
+                patient_info = active_patients[p]
+                priority = patient_info.get('priority', 'green')
+                status = patient_info.get('status', 'Unknown')
+                machine_cards.append(
+                    f'<div style="background: {get_priority_color_hex(priority)}; color: white; padding: 4px 6px; margin: 2px 0; border-radius: 3px; font-size: 10px;">'
+                    f'<strong>{p}</strong><br>📋 {status}'
+                    f'</div>'
+                )
+
+        if machine_cards:
+            blocks.append(f"""
+            <div style="background: {background}; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid {border}; min-height: 60px;">
+                <h6 style="color: {title_color}; margin: 0 0 4px 0; font-size: 12px;">{icon} {machine}</h6>
+                <div style="max-height: 100px; overflow-y: auto;">
+                    {''.join(machine_cards)}
                 </div>
-                <p style="margin: 5px 0; font-size: 10px; color: #666; font-style: italic;">💡 {('High priority: Both doctor and bed' if assign_bed else 'Standard: Doctor only')}</p>
             </div>
-            """, unsafe_allow_html=True)
-        elif current_event and current_event.get('event_type') == 'TRIAGE_COMPLETE':
-            patient_name = current_event.get('patient_name', 'Unknown')
-            priority = current_event.get('priority', 'unknown')
-            
-            st.markdown(f"""
-            <div style="background: #e3f2fd; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #2196f3; min-height: 120px;">
-                <h5 style="color: #1976d2; margin: 0 0 8px 0;">🤖 Awaiting Patient</h5>
-                <p style="margin: 5px 0; font-size: 12px;"><strong>👤 From Triage:</strong> {patient_name}</p>
-                <p style="margin: 5px 0; font-size: 12px;"><strong>🚨 Priority:</strong> {priority.upper()}</p>
-                <div style="background: #f5f5f5; padding: 8px; border-radius: 4px; margin: 8px 0;">
-                    <p style="margin: 3px 0; font-size: 11px; color: #666;">⏳ Analyzing patient priority...</p>
-                    <p style="margin: 3px 0; font-size: 11px; color: #666;">🔄 Determining routing decision...</p>
+            """)
+        else:
+            blocks.append(f"""
+            <div style="background: #f5f5f5; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid #cccccc; min-height: 60px; display: flex; align-items: center; justify-content: center;">
+                <div style="text-align: center;">
+                    <h6 style="color: #666; margin: 0; font-size: 12px;">{icon} {machine}</h6>
+                    <p style="color: #999; font-size: 10px; margin: 2px 0;">Available</p>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """)
+    return blocks
+
+def build_hospital_layout(active_patients: Dict[str, Any], resource_status: Dict[str, List[str]], processed_patients: Optional[List[Dict[str, Any]]] = None, event_index: Optional[EventIndex] = None, current_event: Optional[Dict[str, Any]] = None, event_position: Optional[int] = None, doctors: Sequence[str] = (), beds: Sequence[str] = (), start_time: Optional[str] = None, equipment: Optional[Dict[str, Sequence[str]]] = None) -> List[List[str]]:
+    """Markdown blocks of each layout column, so a column can be compared with what is already on screen"""
+    columns: List[List[str]] = [[] for _ in range(LAYOUT_COLUMNS)]
+    entrance_column, routing_column, doctors_column, equipment_column, beds_column, processed_column = columns
+
+    # Entrance & Triage
+    entrance_column.append("#### 🚪 Entrance & Triage")
+    entrance_patient_cards: List[str] = []
+    for p, patient_info in active_patients.items():
+        if patient_info.get('location') not in ['Entrance', 'Triage']:
+            continue
+        priority = patient_info.get('priority', 'pending')
+        status = patient_info.get('status', 'Unknown')
+
+        # Handle pending priority with gray color
+        if priority == 'pending':
+            priority_color = '#9e9e9e'  # Gray for pending
+            priority_display = 'PENDING'
         else:
-            # Find routing decision for current patient if available
-            current_patient_routing = None
+            priority_color = get_priority_color_hex(priority)
+            priority_display = priority.upper()
+
+        entrance_patient_cards.append(
+            f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px;">'
+            f'<strong>{p}</strong><br>'
+            f'🚨 {priority_display}<br>'
+            f'📋 {status}'
+            f'</div>'
+        )
+
+    if entrance_patient_cards:
+        entrance_column.append(f"""
+        <div style="background: #e3f2fd; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #2196f3; min-height: 120px;">
+            <h5 style="color: #1976d2; margin: 0 0 8px 0;">🚪 Entrance/Triage</h5>
+            <div style="max-height: 200px; overflow-y: auto;">
+                {''.join(entrance_patient_cards)}
+            </div>
+        </div>
+        """)
+    else:
+        entrance_column.append(_empty_panel("🚪 Entrance/Triage", "✅ No patients"))
+
+    # Routing Agent
+    routing_column.append("#### 🤖 Routing Agent")
+    if current_event and current_event.get('event_type') == 'ROUTING_DECISION':
+        routing_column.append(_routing_panel("🤖 Processing Decision", current_event))
+    elif current_event and current_event.get('event_type') == 'TRIAGE_COMPLETE':
+        patient_name = current_event.get('patient_name', 'Unknown')
+        priority = current_event.get('priority', 'unknown')
+        routing_column.append(f"""
+        <div style="background: #e3f2fd; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #2196f3; min-height: 120px;">
+            <h5 style="color: #1976d2; margin: 0 0 8px 0;">🤖 Awaiting Patient</h5>
+            <p style="margin: 5px 0; font-size: 12px;"><strong>👤 From Triage:</strong> {patient_name}</p>
+            <p style="margin: 5px 0; font-size: 12px;"><strong>🚨 Priority:</strong> {priority.upper()}</p>
+            <div style="background: #f5f5f5; padding: 8px; border-radius: 4px; margin: 8px 0;">
+                <p style="margin: 3px 0; font-size: 11px; color: #666;">⏳ Analyzing patient priority...</p>
+                <p style="margin: 3px 0; font-size: 11px; color: #666;">🔄 Determining routing decision...</p>
+            </div>
+        </div>
+        """)
+    else:
+        # Routing decision for the current patient if made yet, otherwise the most recent one (O(1) index lookups)
+        latest_routing_decision = None
+        if event_index is not None and event_position is not None:
             current_patient_name = current_event.get('patient_name') if current_event else None
-            
-            if current_patient_name and simulation_data and 'events' in simulation_data:
-                # Look for routing decision for the current patient
-                for event in simulation_data['events']:
-                    if (event.get('event_type') == 'ROUTING_DECISION' and 
-                        event.get('patient_name') == current_patient_name):
-                        current_patient_routing = event
-                        break
-            
-            # If no current patient routing found, get the most recent routing decision
-            if not current_patient_routing and simulation_data and 'events' in simulation_data:
-                for event in reversed(simulation_data['events']):
-                    if event.get('event_type') == 'ROUTING_DECISION':
-                        current_patient_routing = event
-                        break
-            
-            latest_routing_decision = current_patient_routing
-            
-            if latest_routing_decision:
-                details = latest_routing_decision.get('details', {})
-                assign_doctor = details.get('assign_doctor', False)
-                assign_bed = details.get('assign_bed', False)
-                patient_name = latest_routing_decision.get('patient_name', 'Unknown')
-                priority = latest_routing_decision.get('priority', 'unknown')
-                
-                st.markdown(f"""
-                <div style="background: #fff3e0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #ff9800; min-height: 120px;">
-                    <h5 style="color: #f57c00; margin: 0 0 8px 0;">🤖 Current Decision</h5>
-                    <p style="margin: 5px 0; font-size: 12px;"><strong>👤 Patient:</strong> {patient_name}</p>
-                    <p style="margin: 5px 0; font-size: 12px;"><strong>🚨 Priority:</strong> {priority.upper()}</p>
-                    <div style="background: #f5f5f5; padding: 8px; border-radius: 4px; margin: 8px 0;">
-                        <p style="margin: 3px 0; font-size: 11px;">👨‍⚕️ <strong>Doctor:</strong> <span style="color: {'green' if assign_doctor else 'red'}; font-weight: bold;">{'✅ YES' if assign_doctor else '❌ NO'}</span></p>
-                        <p style="margin: 3px 0; font-size: 11px;">🛏️ <strong>Urgent Bed:</strong> <span style="color: {'green' if assign_bed else 'red'}; font-weight: bold;">{'✅ YES' if assign_bed else '❌ NO'}</span></p>
-                    </div>
-                    <p style="margin: 5px 0; font-size: 10px; color: #666; font-style: italic;">💡 {('High priority: Both doctor and bed' if assign_bed else 'Standard: Doctor only')}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
-                    <div style="text-align: center;">
-                        <h5 style="color: #666; margin: 0;">🤖 Routing Agent</h5>
-                        <p style="color: #999; font-size: 12px; margin: 5px 0;">⏳ Waiting for patients</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            latest_routing_decision = event_index.routing_decision_at(event_position, current_patient_name)
 
-    with col3:
-        st.markdown("#### 👨‍⚕️ Doctors")
-        doctors = ["Dr. Emergency", "Dr. Heart", "Dr. General"]
-        
-        for doctor in doctors:
-            # Get patients in this doctor's queue or with this doctor
-            doctor_patients = resource_status.get(doctor, [])
-            queue_patients = [name for name, info in active_patients.items() 
-                            if doctor in info.get('location', '') and 'Queue' in info.get('location', '')]
-            
-            # Combine queue and active patients
-            all_patients = list(set(doctor_patients + queue_patients))
-            
-            with st.container():
-                # Group patients by priority for this doctor
-                 priority_queues: Dict[str, List[Tuple[str, str]]] = {"red": [], "orange": [], "yellow": [], "green": [], "blue": []}
-                 for p in all_patients:
-                     if p in active_patients:
-                         patient_info = active_patients[p]
-                         priority = patient_info.get('priority', 'green')
-                         status = patient_info.get('status', 'Unknown')
-                         if priority in priority_queues:
-                             priority_queues[priority].append((p, status))
-                 
-                 # Check if doctor has any patients
-                 has_patients = any(len(queue) > 0 for queue in priority_queues.values())
-                 
-                 if has_patients:
-                     priority_sections: List[str] = []
-                     for priority, patients in priority_queues.items():
-                          if patients:
-                              priority_color = get_priority_color_hex(priority)
-                              patient_cards: List[str] = []
-                              for patient_name, status in patients:
-                                  patient_cards.append(
-                                      f'<div style="background: {priority_color}; color: white; padding: 4px 6px; margin: 2px 0; border-radius: 3px; font-size: 10px;">'
-                                      f'<strong>{patient_name}</strong><br>📋 {status}'
-                                      f'</div>'
-                                  )
-                              priority_sections.append(
-                                  f'<div style="margin: 4px 0;">'
-                                  f'<div style="background: {priority_color}; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: bold; margin-bottom: 2px;">'
-                                  f'{priority.upper()} PRIORITY ({len(patients)})'
-                                  f'</div>'
-                                  f'{"".join(patient_cards)}'
-                                  f'</div>'
-                              )
-                     
-                     st.markdown(f"""
-                     <div style="background: #e8f5e8; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #4caf50; min-height: 120px;">
-                         <h5 style="color: #2e7d32; margin: 0 0 8px 0;">👨‍⚕️ {doctor}</h5>
-                         <div style="max-height: 200px; overflow-y: auto;">
-                             {''.join(priority_sections)}
-                         </div>
-                     </div>
-                     """, unsafe_allow_html=True)
-                 else:
-                     st.markdown(f"""
-                     <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
-                         <div style="text-align: center;">
-                             <h5 style="color: #666; margin: 0;">👨‍⚕️ {doctor}</h5>
-                             <p style="color: #999; font-size: 12px; margin: 5px 0;">✅ Available</p>
-                         </div>
-                     </div>
-                     """, unsafe_allow_html=True)
-    
-    with col4:
-         st.markdown("#### 🔬 Equipment")
-         
-         # MRI Machines
-         st.markdown("**🔬 MRI Machines**")
-         mri_machines = ["MRI-1", "MRI-2"]
-         
-         for mri in mri_machines:
-            # Get patients using this MRI
-            mri_patients = resource_status.get(mri, [])
-            
-            with st.container():
-                # Get patient details for this MRI
-                mri_patient_cards: List[str] = []
-                for p in mri_patients:
-                    if p in active_patients:
-                        patient_info = active_patients[p]
-                        priority = patient_info.get('priority', 'green')
-                        status = patient_info.get('status', 'Unknown')
-                        priority_color = get_priority_color_hex(priority)
-                        mri_patient_cards.append(
+        if latest_routing_decision:
+            routing_column.append(_routing_panel("🤖 Current Decision", latest_routing_decision))
+        else:
+            routing_column.append(_empty_panel("🤖 Routing Agent", "⏳ Waiting for patients"))
+
+    # Doctors, with their queues grouped by priority
+    doctors_column.append("#### 👨‍⚕️ Doctors")
+    queued_patients: Dict[str, List[str]] = {}
+    for name, info in active_patients.items():
+        location = info.get('location', '')
+        if location.endswith(' Queue'):
+            queued_patients.setdefault(location[:-len(' Queue')], []).append(name)
+
+    for doctor in doctors:
+        # Patients in this doctor's queue or with this doctor
+        all_patients = list(dict.fromkeys(resource_status.get(doctor, []) + queued_patients.get(doctor, [])))
+
+        priority_queues: Dict[str, List[Tuple[str, str]]] = {"red": [], "orange": [], "yellow": [], "green": [], "blue": []}
+        for p in all_patients:
+            if p in active_patients:
+                patient_info = active_patients[p]
+                priority = patient_info.get('priority', 'green')
+                status = patient_info.get('status', 'Unknown')
+                if priority in priority_queues:
+                    priority_queues[priority].append((p, status))
+
+        if any(len(queue) > 0 for queue in priority_queues.values()):
+            priority_sections: List[str] = []
+            for priority, patients in priority_queues.items():
+                if patients:
+                    priority_color = get_priority_color_hex(priority)
+                    patient_cards: List[str] = []
+                    for patient_name, status in patients:
+                        patient_cards.append(
                             f'<div style="background: {priority_color}; color: white; padding: 4px 6px; margin: 2px 0; border-radius: 3px; font-size: 10px;">'
-                            f'<strong>{p}</strong><br>📋 {status}'
-                            f'</div>'
-                        )
-                
-                if mri_patient_cards:
-                    st.markdown(f"""
-                    <div style="background: #f3e5f5; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid #9c27b0; min-height: 60px;">
-                        <h6 style="color: #7b1fa2; margin: 0 0 4px 0; font-size: 12px;">🔬 {mri}</h6>
-                        <div style="max-height: 100px; overflow-y: auto;">
-                            {''.join(mri_patient_cards)}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background: #f5f5f5; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid #cccccc; min-height: 60px; display: flex; align-items: center; justify-content: center;">
-                        <div style="text-align: center;">
-                            <h6 style="color: #666; margin: 0; font-size: 12px;">🔬 {mri}</h6>
-                            <p style="color: #999; font-size: 10px; margin: 2px 0;">Available</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-         # Ultrasonic Machines
-         st.markdown("**🔊 Ultrasonic Machines**")
-         ultrasonic_machines = ["Ultrasonic-1", "Ultrasonic-2"]
-         
-         for ultrasonic in ultrasonic_machines:
-             # Get patients using this Ultrasonic
-             ultrasonic_patients = resource_status.get(ultrasonic, [])
-             
-             with st.container():
-                 # Get patient details for this Ultrasonic
-                 ultrasonic_patient_cards: List[str] = []
-                 for p in ultrasonic_patients:
-                     if p in active_patients:
-                         patient_info = active_patients[p]
-                         priority = patient_info.get('priority', 'green')
-                         status = patient_info.get('status', 'Unknown')
-                         priority_color = get_priority_color_hex(priority)
-                         ultrasonic_patient_cards.append(
-                             f'<div style="background: {priority_color}; color: white; padding: 4px 6px; margin: 2px 0; border-radius: 3px; font-size: 10px;">'
-                             f'<strong>{p}</strong><br>📋 {status}'
-                             f'</div>'
-                         )
-                 
-                 if ultrasonic_patient_cards:
-                     st.markdown(f"""
-                     <div style="background: #e8f5e8; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid #4caf50; min-height: 60px;">
-                         <h6 style="color: #2e7d32; margin: 0 0 4px 0; font-size: 12px;">🔊 {ultrasonic}</h6>
-                         <div style="max-height: 100px; overflow-y: auto;">
-                             {''.join(ultrasonic_patient_cards)}
-                         </div>
-                     </div>
-                     """, unsafe_allow_html=True)
-                 else:
-                     st.markdown(f"""
-                     <div style="background: #f5f5f5; padding: 8px; border-radius: 6px; margin: 3px 0; border: 1px solid #cccccc; min-height: 60px; display: flex; align-items: center; justify-content: center;">
-                         <div style="text-align: center;">
-                             <h6 style="color: #666; margin: 0; font-size: 12px;">🔊 {ultrasonic}</h6>
-                             <p style="color: #999; font-size: 10px; margin: 2px 0;">Available</p>
-                         </div>
-                     </div>
-                     """, unsafe_allow_html=True)
-    
-    with col5:
-         st.markdown("#### 🛏️ Beds")
-         beds = ["ICU-1", "Ward-A1", "Ward-A2"]
-         
-         for bed in beds:
-            # Get patients in this bed
-            bed_patients = resource_status.get(bed, [])
-            
-            with st.container():
-                # Get patient details for this bed
-                bed_patient_cards: List[str] = []
-                for p in bed_patients:
-                    if p in active_patients:
-                        patient_info = active_patients[p]
-                        priority = patient_info.get('priority', 'green')
-                        status = patient_info.get('status', 'Unknown')
-                        priority_color = get_priority_color_hex(priority)
-                        bed_patient_cards.append(
-                            f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px;">'
-                            f'<strong>{p}</strong><br>'
-                            f'🚨 {priority.upper() if priority else "UNKNOWN"}<br>'
-                            f'📋 {status}'
+                            f'<strong>{patient_name}</strong><br>📋 {status}'
                             f'</div>'
                         )
-                
-                if bed_patient_cards:
-                    st.markdown(f"""
-                    <div style="background: #fff3e0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #ff9800; min-height: 120px;">
-                        <h5 style="color: #f57c00; margin: 0 0 8px 0;">🛏️ {bed}</h5>
-                        <div style="max-height: 200px; overflow-y: auto;">
-                            {''.join(bed_patient_cards)}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
-                        <div style="text-align: center;">
-                            <h5 style="color: #666; margin: 0;">🛏️ {bed}</h5>
-                            <p style="color: #999; font-size: 12px; margin: 5px 0;">✅ Available</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    with col6:
-          st.markdown("#### ✅ Processed Patients")
-          
-          with st.container():
-             if processed_patients and len(processed_patients) > 0:
-                 # Show most recent processed patients (limit to last 10)
-                 recent_processed: List[Dict[str, Any]] = processed_patients[-10:] if len(processed_patients) > 10 else processed_patients
-                 
-                 processed_cards: List[str] = []
-                 for patient in reversed(recent_processed):  # Show most recent first
-                     priority_color = get_priority_color_hex(patient.get('priority', 'green'))
-                     priority_str = patient.get('priority', 'unknown')
-                     processed_cards.append(
-                         f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px; opacity: 0.8;">'
-                         f'<strong>{patient.get("name", "Unknown")}</strong><br>'
-                         f'🚨 {priority_str.upper() if priority_str else "UNKNOWN"}<br>'
-                         f'✅ {patient.get("final_status", "Unknown")}<br>'
-                         f'⏱️ {patient.get("discharge_time", "Unknown")}<br>'
-                         f'📊 Total: {patient.get("total_time", "Unknown")} min'
-                         f'</div>'
-                     )
-                 
-                 st.markdown(f"""
-                 <div style="background: #f0f0f0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #757575; min-height: 120px;">
-                     <h5 style="color: #424242; margin: 0 0 8px 0;">✅ Processed Patients ({len(processed_patients)})</h5>
-                     <div style="max-height: 200px; overflow-y: auto;">
-                         {''.join(processed_cards)}
-                     </div>
-                 </div>
-                 """, unsafe_allow_html=True)
-             else:
-                 st.markdown("""
-                 <div style="background: #f5f5f5; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #cccccc; min-height: 120px; display: flex; align-items: center; justify-content: center;">
-                     <div style="text-align: center;">
-                         <h5 style="color: #666; margin: 0;">✅ Processed Patients</h5>
-                         <p style="color: #999; font-size: 12px; margin: 5px 0;">No patients processed yet</p>
-                     </div>
-                 </div>
-                 """, unsafe_allow_html=True)
- 
+                    priority_sections.append(
+                        f'<div style="margin: 4px 0;">'
+                        f'<div style="background: {priority_color}; color: white; padding: 2px 6px; border-radius: 3px; font-size: 9px; font-weight: bold; margin-bottom: 2px;">'
+                        f'{priority.upper()} PRIORITY ({len(patients)})'
+                        f'</div>'
+                        f'{"".join(patient_cards)}'
+                        f'</div>'
+                    )
+
+            doctors_column.append(f"""
+            <div style="background: #e8f5e8; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #4caf50; min-height: 120px;">
+                <h5 style="color: #2e7d32; margin: 0 0 8px 0;">👨‍⚕️ {doctor}</h5>
+                <div style="max-height: 200px; overflow-y: auto;">
+                    {''.join(priority_sections)}
+                </div>
+            </div>
+            """)
+        else:
+            doctors_column.append(_empty_panel(f"👨‍⚕️ {doctor}", "✅ Available"))
+
+    # Equipment
+    equipment_column.append("#### 🔬 Equipment")
+    for kind, machines in (equipment or {}).items():
+        if machines and kind in EQUIPMENT_PANELS:
+            equipment_column.extend(_equipment_blocks(*EQUIPMENT_PANELS[kind][:2], list(machines), *EQUIPMENT_PANELS[kind][2:],
+                                                      active_patients, resource_status))
+
+    # Beds
+    beds_column.append("#### 🛏️ Beds")
+    for bed in beds:
+        bed_patient_cards: List[str] = []
+        for p in resource_status.get(bed, []):
+            if p in active_patients:
+                patient_info = active_patients[p]
+                priority = patient_info.get('priority', 'green')
+                status = patient_info.get('status', 'Unknown')
+                priority_color = get_priority_color_hex(priority)
+                bed_patient_cards.append(
+                    f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px;">'
+                    f'<strong>{p}</strong><br>'
+                    f'🚨 {priority.upper() if priority else "UNKNOWN"}<br>'
+                    f'📋 {status}'
+                    f'</div>'
+                )
+
+        if bed_patient_cards:
+            beds_column.append(f"""
+            <div style="background: #fff3e0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #ff9800; min-height: 120px;">
+                <h5 style="color: #f57c00; margin: 0 0 8px 0;">🛏️ {bed}</h5>
+                <div style="max-height: 200px; overflow-y: auto;">
+                    {''.join(bed_patient_cards)}
+                </div>
+            </div>
+            """)
+        else:
+            beds_column.append(_empty_panel(f"🛏️ {bed}", "✅ Available"))
+
+    # Processed patients, most recent first (limit to last 10)
+    processed_column.append("#### ✅ Processed Patients")
+    if processed_patients:
+        processed_cards: List[str] = []
+        for patient in reversed(processed_patients[-10:]):
+            priority_color = get_priority_color_hex(patient.get('priority', 'green'))
+            priority_str = patient.get('priority', 'unknown')
+            discharge_time = format_event_time(patient['discharge_timestamp'], start_time) if start_time else f"Minute {patient['discharge_timestamp']:.1f}"
+            processed_cards.append(
+                f'<div style="background: {priority_color}; color: white; padding: 6px; margin: 3px 0; border-radius: 4px; font-size: 11px; opacity: 0.8;">'
+                f'<strong>{patient.get("name", "Unknown")}</strong><br>'
+                f'🚨 {priority_str.upper() if priority_str else "UNKNOWN"}<br>'
+                f'✅ {patient.get("final_status", "Unknown")}<br>'
+                f'⏱️ {discharge_time}<br>'
+                f'📊 Total: {patient.get("total_time", "Unknown")} min'
+                f'</div>'
+            )
+
+        processed_column.append(f"""
+        <div style="background: #f0f0f0; padding: 12px; border-radius: 8px; margin: 5px 0; border: 2px solid #757575; min-height: 120px;">
+            <h5 style="color: #424242; margin: 0 0 8px 0;">✅ Processed Patients ({len(processed_patients)})</h5>
+            <div style="max-height: 200px; overflow-y: auto;">
+                {''.join(processed_cards)}
+            </div>
+        </div>
+        """)
+    else:
+        processed_column.append(_empty_panel("✅ Processed Patients", "No patients processed yet"))
+
+    return columns
+
+def display_hospital_layout(active_patients: Dict[str, Any], resource_status: Dict[str, List[str]], processed_patients: Optional[List[Dict[str, Any]]] = None, event_index: Optional[EventIndex] = None, current_event: Optional[Dict[str, Any]] = None, event_position: Optional[int] = None, doctors: Sequence[str] = (), beds: Sequence[str] = (), start_time: Optional[str] = None, equipment: Optional[Dict[str, Sequence[str]]] = None):
+    """Display visual hospital layout with resources and patient queues"""
+    st.markdown("### 🏥 Hospital Layout with Live Patient Queues")
+    layout = build_hospital_layout(active_patients, resource_status, processed_patients, event_index,
+                                   current_event, event_position, doctors, beds, start_time, equipment)
+    for column, blocks in zip(st.columns(LAYOUT_COLUMNS), layout):
+        with column:
+            for block in blocks:
+                st.markdown(block, unsafe_allow_html=True)
+
+class LiveHospitalLayout:
+    """Hospital layout drawn into persistent column slots; an update only redraws columns whose content changed"""
+
+    def __init__(self):
+        st.markdown("### 🏥 Hospital Layout with Live Patient Queues")
+        self.slots = [column.empty() for column in st.columns(LAYOUT_COLUMNS)]
+        self.rendered: List[Optional[List[str]]] = [None] * LAYOUT_COLUMNS
+
+    def update(self, layout: List[List[str]]) -> int:
+        """Redraw changed columns and return how many were redrawn"""
+        redrawn = 0
+        for i, blocks in enumerate(layout):
+            if blocks != self.rendered[i]:
+                with self.slots[i].container():
+                    for block in blocks:
+                        st.markdown(block, unsafe_allow_html=True)
+                self.rendered[i] = blocks
+                redrawn += 1
+        return redrawn
+
 def get_priority_color_hex(priority: str) -> str:
     """Get hex color for priority"""
     colors = {
@@ -526,12 +527,65 @@ def get_priority_color_hex(priority: str) -> str:
     }
     return colors.get(priority, "#4caf50")
 
-def display_live_events(events: List[Dict[str, Any]], start_time: str, speed_multiplier: float = 1.0, simulation_data: Optional[Dict[str, Any]] = None):
-    """Display events in real-time simulation with visual hospital layout"""
+def build_replay_layout(replay_engine: StateReplayEngine, state: ReplayState, event_index: EventIndex, start_time: str) -> List[List[str]]:
+    """Layout columns for a reconstructed state, with resources taken from the event log"""
+    current_event = replay_engine.event_at(state.position - 1)
+    return build_hospital_layout(state.active_patients, state.resource_status, state.processed_patients, event_index,
+                                 current_event, state.position - 1 if current_event else None,
+                                 replay_engine.resources.get('doctor', []), replay_engine.resources.get('bed', []), start_time,
+                                 {kind: replay_engine.resources.get(kind, []) for kind in EQUIPMENT_PANELS})
+
+def display_replay_layout(replay_engine: StateReplayEngine, state: ReplayState, event_index: EventIndex, start_time: str):
+    """Display the hospital layout for a reconstructed state"""
+    LiveHospitalLayout().update(build_replay_layout(replay_engine, state, event_index, start_time))
+
+def build_event_card(event: Dict[str, Any], start_time: str) -> str:
+    """Event card markdown, with the agent's decisions spelled out for routing events"""
+    event_time = format_event_time(event['timestamp'], start_time)
+    patient_name = event['patient_name']
+    event_type = event['event_type']
+    priority = event.get('priority', 'green')
+    resource_name = event.get('resource_name')
+    
+    if event_type == 'ROUTING_DECISION':
+        details = event.get('details', {})
+        assign_doctor = details.get('assign_doctor', False)
+        assign_bed = details.get('assign_bed', False)
+        
+        return f"""
+        <div class="event-card" style="background: #fff3e0; border-left: 4px solid #ff9800;">
+            <h4>🕐 {event_time} - 🤖 Routing Agent Decision</h4>
+            <p><strong>👤 Patient:</strong> {patient_name}</p>
+            <p><strong>🚨 Priority:</strong> {priority.upper() if priority else 'Unknown'}</p>
+            <div style="background: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">
+                <h5 style="margin: 0 0 8px 0; color: #333;">🤖 Agent Decisions:</h5>
+                <p style="margin: 5px 0;">👨‍⚕️ <strong>Assign to Doctor:</strong> <span style="color: {'green' if assign_doctor else 'red'}; font-weight: bold;">{'✅ YES' if assign_doctor else '❌ NO'}</span></p>
+                <p style="margin: 5px 0;">🛏️ <strong>Assign Urgent Bed:</strong> <span style="color: {'green' if assign_bed else 'red'}; font-weight: bold;">{'✅ YES' if assign_bed else '❌ NO'}</span></p>
+                <p style="margin: 5px 0; font-size: 12px; color: #666;">💡 <em>Routing logic: {'High priority patients get both doctor and bed assignments' if assign_bed else 'Standard routing to available doctor'}</em></p>
+            </div>
+        </div>
+        """
+    return f"""
+    <div class="event-card {get_priority_color(priority)}">
+        <h4>🕐 {event_time} - {event_type.replace('_', ' ').title()}</h4>
+        <p><strong>👤 Patient:</strong> {patient_name}</p>
+        {f"<p><strong>📍 Resource:</strong> {resource_name}</p>" if resource_name else ""}
+        {f"<p><strong>🚨 Priority:</strong> {priority.upper()}</p>" if priority else ""}
+    </div>
+    """
+
+MAX_IDLE_SECONDS = 2.0  # Longer gaps between events are cut to this much wall time
+
+def display_live_events(event_index: EventIndex, replay_engine: StateReplayEngine, start_time: str, speed_multiplier: float = 1.0, start_minute: float = 0.0, frame_rate: float = 10.0):
+    """Play events back at ``speed_multiplier`` simulated minutes per second, starting from any minute
+    
+    Each frame applies every event up to the playback clock and redraws only the parts
+    that changed, so fast playback coalesces events instead of falling behind.
+    """
     st.subheader("🔴 Live Hospital Simulation")
     
-    # Display hospital layout (will be updated in the loop)
-    layout_container = st.empty()
+    # Hospital layout, redrawn column by column as the state changes
+    layout = LiveHospitalLayout()
     
     # Create placeholders for dynamic content
     st.subheader("📋 Current Events")
@@ -540,134 +594,57 @@ def display_live_events(events: List[Dict[str, Any]], start_time: str, speed_mul
     progress_bar = st.progress(0)
     time_display = st.empty()
     
-    if not events:
+    sorted_events = replay_engine.events
+    if not sorted_events:
         st.warning("No events to display")
         return
     
-    # Sort events by timestamp
-    sorted_events = sorted(events, key=lambda x: x['timestamp'])
-    total_duration = sorted_events[-1]['timestamp']
-    
-    # Track active patients, resources, and processed patients
-    active_patients: Dict[str, Any] = {}
-    processed_patients: List[Dict[str, Any]] = []
-    resource_status: Dict[str, List[str]] = {
-        "Dr. Emergency": [],
-        "Dr. Heart": [],
-        "Dr. General": [],
-        "ICU-1": [],
-        "Ward-A1": [],
-        "Ward-A2": [],
-        "MRI-1": [],
-        "MRI-2": [],
-        "Ultrasonic-1": [],
-        "Ultrasonic-2": []
-    }
+    total_duration = replay_engine.duration
     
-    # Display events with timing
-    for i, event in enumerate(sorted_events):
-        # Update progress
-        progress = (event['timestamp'] / total_duration) if total_duration > 0 else 0
-        progress_bar.progress(progress)
-        
-        # Update time display
-        event_time = format_event_time(event['timestamp'], start_time)
-        time_display.markdown(f"**🕐 Simulation Time: {event_time} (Minute {event['timestamp']:.1f})**")
-        
-        # Update patient and resource tracking
-        patient_name = event['patient_name']
-        event_type = event['event_type']
-        priority = event.get('priority', 'green')
-        resource_name = event.get('resource_name')
-        
-        # Update active patients based on event
-        if event_type == 'PATIENT_ARRIVAL':
-            active_patients[patient_name] = {
-                'priority': 'pending',  # Set to pending until triage is complete
-                'status': 'Arrived',
-                'location': 'Entrance',
-                'symptoms': event.get('details', {}).get('symptoms', [])
-            }
-        elif event_type == 'TRIAGE_COMPLETE':
-            if patient_name in active_patients:
-                active_patients[patient_name]['status'] = 'Triaged'
-                active_patients[patient_name]['priority'] = priority  # This should now properly set the triage priority
-        elif event_type == 'QUEUE_JOIN' and resource_name:
-            if patient_name in active_patients:
-                active_patients[patient_name]['status'] = f'Waiting for {resource_name}'
-                active_patients[patient_name]['location'] = f'{resource_name} Queue'
-        elif event_type == 'CONSULTATION_START' and resource_name:
-            if patient_name in active_patients:
-                active_patients[patient_name]['status'] = f'With {resource_name}'
-                active_patients[patient_name]['location'] = resource_name
-                if resource_name in resource_status:
-                    resource_status[resource_name].append(patient_name)
-        elif event_type == 'CONSULTATION_END' and resource_name:
-            if resource_name in resource_status and patient_name in resource_status[resource_name]:
-                resource_status[resource_name].remove(patient_name)
-        elif event_type == 'BED_ASSIGNMENT' and resource_name:
-            if patient_name in active_patients:
-                active_patients[patient_name]['status'] = f'In {resource_name}'
-                active_patients[patient_name]['location'] = resource_name
-                if resource_name in resource_status:
-                    resource_status[resource_name].append(patient_name)
-        elif event_type == 'PATIENT_DISCHARGE':
-            if patient_name in active_patients:
-                # Move to processed patients before removing from active
-                patient_info = active_patients[patient_name]
-                processed_patients.append({
-                    'name': patient_name,
-                    'priority': patient_info.get('priority', 'green'),
-                    'final_status': 'Discharged',
-                    'total_time': event.get('details', {}).get('total_time_in_hospital', 'Unknown'),
-                    'discharge_time': format_event_time(event['timestamp'], start_time)
-                })
-                del active_patients[patient_name]
-            # Remove from all resources
-            for resource in resource_status:
-                if patient_name in resource_status[resource]:
-                    resource_status[resource].remove(patient_name)
+    # Jump straight to the requested minute: nearest keyframe plus a short replay
+    state = replay_engine.state_at(start_minute)
+    layout.update(build_replay_layout(replay_engine, state, event_index, start_time))
+    
+    clock = start_minute
+    frame_interval = 1.0 / frame_rate
+    last_frame = time.perf_counter()
+    while state.position < len(sorted_events):
+        # Skip long quiet periods instead of waiting them out
+        next_timestamp = sorted_events[state.position]['timestamp']
+        if (next_timestamp - clock) / speed_multiplier > MAX_IDLE_SECONDS:
+            clock = next_timestamp - MAX_IDLE_SECONDS * speed_multiplier
         
-        # Display current event
-        with event_container.container():
-            # Special handling for routing decisions
-            if event_type == 'ROUTING_DECISION':
-                details = event.get('details', {})
-                assign_doctor = details.get('assign_doctor', False)
-                assign_bed = details.get('assign_bed', False)
-                
-                st.markdown(f"""
-                <div class="event-card" style="background: #fff3e0; border-left: 4px solid #ff9800;">
-                    <h4>🕐 {event_time} - 🤖 Routing Agent Decision</h4>
-                    <p><strong>👤 Patient:</strong> {patient_name}</p>
-                    <p><strong>🚨 Priority:</strong> {priority.upper() if priority else 'Unknown'}</p>
-                    <div style="background: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">
-                        <h5 style="margin: 0 0 8px 0; color: #333;">🤖 Agent Decisions:</h5>
-                        <p style="margin: 5px 0;">👨‍⚕️ <strong>Assign to Doctor:</strong> <span style="color: {'green' if assign_doctor else 'red'}; font-weight: bold;">{'✅ YES' if assign_doctor else '❌ NO'}</span></p>
-                        <p style="margin: 5px 0;">🛏️ <strong>Assign Urgent Bed:</strong> <span style="color: {'green' if assign_bed else 'red'}; font-weight: bold;">{'✅ YES' if assign_bed else '❌ NO'}</span></p>
-                        <p style="margin: 5px 0; font-size: 12px; color: #666;">💡 <em>Routing logic: {'High priority patients get both doctor and bed assignments' if assign_bed else 'Standard routing to available doctor'}</em></p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="event-card {get_priority_color(priority)}">
-                    <h4>🕐 {event_time} - {event_type.replace('_', ' ').title()}</h4>
-                    <p><strong>👤 Patient:</strong> {patient_name}</p>
-                    {f"<p><strong>📍 Resource:</strong> {resource_name}</p>" if resource_name else ""}
-                    {f"<p><strong>🚨 Priority:</strong> {priority.upper()}</p>" if priority else ""}
-                </div>
-                """, unsafe_allow_html=True)
+        # Apply every event up to the playback clock, then draw them as one frame
+        frame_events = 0
+        while state.position < len(sorted_events) and sorted_events[state.position]['timestamp'] <= clock:
+            state.apply(sorted_events[state.position])
+            frame_events += 1
         
-        # Update hospital layout with current patient positions
-        with layout_container.container():
-            display_hospital_layout(active_patients, resource_status, processed_patients, simulation_data, event)
+        progress_bar.progress(min(clock / total_duration, 1.0) if total_duration > 0 else 0)
+        time_display.markdown(f"**🕐 Simulation Time: {format_event_time(clock, start_time)} (Minute {clock:.1f})**")
+        if frame_events:
+            with event_container.container():
+                st.markdown(build_event_card(sorted_events[state.position - 1], start_time), unsafe_allow_html=True)
+                if frame_events > 1:
+                    st.caption(f"+ {frame_events - 1} earlier events in this frame")
+            layout.update(build_replay_layout(replay_engine, state, event_index, start_time))
         
-        # Wait based on speed multiplier
-        if i < len(sorted_events) - 1:
-            next_event_time = sorted_events[i + 1]['timestamp']
-            wait_time = (next_event_time - event['timestamp']) / speed_multiplier
-            time.sleep(min(wait_time, 2.0))  # Cap wait time at 2 seconds
+        # Wait for the next frame, then advance the clock by the wall time that actually passed
+        time.sleep(max(0.0, last_frame + frame_interval - time.perf_counter()))
+        now = time.perf_counter()
+        clock += (now - last_frame) * speed_multiplier
+        last_frame = now
+
+CATALOG_SYNC_INTERVAL = 60.0  # Seconds before the run directory is rescanned on a rerun
+
+# Run list orderings: label -> (catalog column, descending)
+RUN_SORT_OPTIONS: Dict[str, Tuple[str, bool]] = {
+    "Newest first": ("created_at", True),
+    "Most events": ("total_events", True),
+    "Longest duration": ("duration_minutes", True),
+    "Shortest mean stay": ("mean_time_in_hospital", False),
+    "Fewest 4-hour breaches": ("four_hour_breach_rate", False)
+}
 
 def main():
     st.title("🏥 Hospital Simulation Viewer")
@@ -682,45 +659,68 @@ def main():
         st.error("Backend directory not found")
         return
     
-    json_files = [f for f in os.listdir(backend_dir) if f.endswith('.json') and 'hospital_simulation' in f]
-    
-    if not json_files:
+    # List runs from the run catalog; the directory is rescanned on request or once it is stale
+    rescan = st.sidebar.button("🔄 Rescan Runs")
+    with RunCatalog(backend_dir) as run_catalog:
+        if rescan or time.time() - st.session_state.get('catalog_synced_at', 0.0) > CATALOG_SYNC_INTERVAL:
+            run_catalog.sync()
+            st.session_state['catalog_synced_at'] = time.time()
+        failed_files = run_catalog.failed_files()
+        if failed_files:
+            with st.sidebar.expander(f"⚠️ {len(failed_files)} unreadable run file(s)"):
+                for file_name, error in failed_files.items():
+                    st.caption(f"**{file_name}**: {error}")
+        hospitals = run_catalog.distinct_values('hospital_name')
+        hospital_filter = st.sidebar.selectbox("🏥 Hospital", ["All hospitals"] + hospitals) if len(hospitals) > 1 else None
+        sort_label = st.sidebar.selectbox("↕️ Sort Runs By", list(RUN_SORT_OPTIONS))
+        order_by, descending = RUN_SORT_OPTIONS[sort_label]
+        runs = {run.file_name: run for run in run_catalog.list_runs(
+            hospital_name=hospital_filter if hospital_filter in hospitals else None,
+            order_by=order_by, descending=descending
+        )}
+    
+    if not runs:
         st.error("No hospital simulation JSON files found in the current directory.")
         st.info("Please run the hospital simulation first to generate data files.")
         return
     
-    # Sort files by modification time to get the most recent first
-    json_files_with_time = [(f, os.path.getmtime(os.path.join(backend_dir, f))) for f in json_files]
-    json_files_sorted = [f[0] for f in sorted(json_files_with_time, key=lambda x: x[1], reverse=True)]
-    
     selected_file = st.sidebar.selectbox(
         "📁 Select Simulation File",
-        json_files_sorted,
-        index=0  # Default to most recent (first in sorted list)
+        list(runs),
+        index=0,  # Default to the first run in the chosen order
+        format_func=lambda file_name: f"{file_name} ({runs[file_name].total_events} events)"
     )
+    run = runs[selected_file]
     
     # Show file timestamp for user reference
-    if json_files_sorted:
-        file_time = datetime.fromtimestamp(os.path.getmtime(os.path.join(backend_dir, selected_file)))
-        st.sidebar.caption(f"📅 Created: {file_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        if selected_file == json_files_sorted[0]:
-            st.sidebar.success("✅ Latest simulation file selected")
+    file_time = datetime.fromtimestamp(run.created_at)
+    st.sidebar.caption(f"📅 Created: {file_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    if run.created_at == max(other.created_at for other in runs.values()):
+        st.sidebar.success("✅ Latest simulation file selected")
     
-    # Load simulation data
-    simulation_data = load_simulation_data(os.path.join(backend_dir, selected_file))
-    
-    if not simulation_data:
-        return
-    
-    # Display simulation info
+    # Display simulation info from the catalog, before the events are loaded
     st.sidebar.markdown("### 📊 Simulation Info")
+    run_details = [
+        f"- **Hospital:** {run.hospital_name}",
+        f"- **Duration:** {run.duration_minutes} minutes",
+        f"- **Total Events:** {run.total_events}",
+        f"- **Start Time:** {run.start_time[:19]}"
+    ]
+    if run.engine:
+        run_details.append(f"- **Engine:** {run.engine} (seed {run.seed})")
+    if run.kpis.get('mean_time_in_hospital') is not None:
+        run_details.append(f"- **Mean Time in Hospital:** {run.kpis['mean_time_in_hospital']:.1f} minutes")
+    if run.kpis.get('four_hour_breach_rate') is not None:
+        run_details.append(f"- **4-Hour Breaches:** {run.kpis['four_hour_breach_rate']:.1%}")
+    st.sidebar.markdown("\n".join(run_details))
+    
+    # Load simulation data (cached until the file changes)
+    loaded = load_simulation_data(os.path.join(backend_dir, selected_file))
+    
+    if not loaded:
+        return
+    simulation_data, event_index = loaded
     sim_info = simulation_data['simulation_info']
-    st.sidebar.markdown(f"""
-    - **Hospital:** {sim_info['hospital_name']}
-    - **Duration:** {sim_info['duration_minutes']} minutes
-    - **Total Events:** {sim_info['total_events']}
-    - **Start Time:** {sim_info['start_time'][:19]}
-    """)
     
     # View mode selection
     view_mode = st.sidebar.radio(
@@ -728,44 +728,54 @@ def main():
         ["Live Simulation", "Patient Journey", "Hospital Status", "Event Timeline"]
     )
     
-    events = simulation_data['events']
-    
     if view_mode == "Live Simulation":
-        speed = st.sidebar.slider("⚡ Playback Speed", 0.1, 5.0, 1.0, 0.1)
+        replay_engine = _load_replay_engine(os.path.join(backend_dir, selected_file),
+                                            os.path.getmtime(os.path.join(backend_dir, selected_file)))
+        speed = st.sidebar.slider("⚡ Playback Speed (minutes per second)", 0.1, 60.0, 1.0, 0.1)
+        frame_rate = st.sidebar.slider("🎞️ Frame Rate", 1, 30, 10)
+        start_minute = st.sidebar.slider("⏩ Jump to Minute", 0.0, max(float(replay_engine.duration), 1.0), 0.0, 1.0)
         
         if st.sidebar.button("▶️ Start Live Simulation"):
-            display_live_events(events, sim_info['start_time'], speed, simulation_data)
+            display_live_events(event_index, replay_engine, sim_info['start_time'], speed, start_minute, frame_rate)
+        else:
+            # Show the state at the selected minute without replaying from the start
+            state = replay_engine.state_at(start_minute)
+            st.subheader(f"⏸️ Hospital at {format_event_time(start_minute, sim_info['start_time'])} (Minute {start_minute:.0f})")
+            display_replay_layout(replay_engine, state, event_index, sim_info['start_time'])
     
     elif view_mode == "Patient Journey":
-        # Get unique patient names
-        patient_names = list(set([e['patient_name'] for e in events if e['patient_name'] != 'SYSTEM']))
-        
         selected_patient = st.sidebar.selectbox(
             "👤 Select Patient",
-            patient_names
+            event_index.patient_names
         )
         
         if selected_patient:
-            display_patient_journey(events, selected_patient)
+            display_patient_journey(event_index, selected_patient)
     
     elif view_mode == "Hospital Status":
-        display_hospital_status(events)
+        display_hospital_status(event_index)
+        display_level_chart(_load_level_series(os.path.join(backend_dir, selected_file),
+                                               os.path.getmtime(os.path.join(backend_dir, selected_file))))
     
     elif view_mode == "Event Timeline":
         st.subheader("📅 Complete Event Timeline")
         
         # Filter options
-        event_types = list(set([e['event_type'] for e in events]))
+        event_types = event_index.event_types
         selected_types = st.multiselect(
             "Filter by Event Type",
             event_types,
             default=event_types
         )
         
-        # Display filtered events
-        filtered_events = [e for e in events if e['event_type'] in selected_types]
+        # Display filtered events, one page at a time so long runs stay responsive
+        filtered_events = event_index.events_of_types(selected_types)
+        page_size = 200
+        page_count = max(1, (len(filtered_events) + page_size - 1) // page_size)
+        page = st.number_input(f"Page (of {page_count}, {len(filtered_events)} events)",
+                               min_value=1, max_value=page_count, value=1) if page_count > 1 else 1
         
-        for event in filtered_events:
+        for event in filtered_events[(page - 1) * page_size:page * page_size]:
             event_time = format_event_time(event['timestamp'], sim_info['start_time'])
             
             with st.expander(f"{event_time} - {event['event_type']} - {event['patient_name']}"):